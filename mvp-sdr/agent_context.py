@@ -0,0 +1,78 @@
+"""
+Agent Context
+
+Clients, caches and providers shared by all agents. Built once per worker
+(PipelineExecutor owns one) and injected into the agents, so no stage pays
+client / cache / provider setup per lead.
+
+Agents constructed without a context share the process-wide default from
+get_agent_context().
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from agents.hook_engine import HookEngine
+from llm_adapter import LLMAdapter
+from llm_client import LLMClient
+from mock_llm_provider import MockLLMProvider
+from tools.brightdata_client import BrightDataClient
+from tools.enrichment_memo import EnrichmentMemo, get_enrichment_memo
+from tools.run_metrics import RunMetrics
+
+
+class AgentContext:
+    """Shared dependencies; any of them can be injected (e.g. in tests)"""
+
+    def __init__(self, mock_provider: MockLLMProvider = None, llm_client: LLMClient = None,
+                 llm_adapter: LLMAdapter = None, enrichment_memo: EnrichmentMemo = None,
+                 brightdata_client: BrightDataClient = None, hook_engine: HookEngine = None,
+                 metrics: RunMetrics = None):
+        start = time.perf_counter()
+
+        self.mock_provider = mock_provider or MockLLMProvider()
+        self.llm_client = llm_client or LLMClient()
+        self.enrichment_memo = enrichment_memo or get_enrichment_memo()
+        self.llm_adapter = llm_adapter or LLMAdapter(
+            client=self.llm_client, mock_provider=self.mock_provider, enrichment_memo=self.enrichment_memo
+        )
+        self.brightdata_client = brightdata_client or BrightDataClient()
+        self.hook_engine = hook_engine or HookEngine()
+        # Run metrics (stage latencies, fallbacks); the executor resets them per run
+        self.metrics = metrics or RunMetrics()
+
+        # Measured once; agents pay nothing per lead
+        self.startup_ms = (time.perf_counter() - start) * 1000
+
+    @classmethod
+    def in_directory(cls, workdir: str, **overrides) -> "AgentContext":
+        """
+        Context whose LLM cache, enrichment memo, BrightData cache and LLM log
+        live in `workdir` (tests, benchmarks); other dependencies as given.
+        """
+        cache_db = os.path.join(workdir, "cache.db")
+        overrides.setdefault("llm_client", LLMClient(cache_db=cache_db,
+                                                     log_file=os.path.join(workdir, "llm_logs.jsonl")))
+        overrides.setdefault("enrichment_memo", get_enrichment_memo(cache_db))
+        overrides.setdefault("brightdata_client",
+                             BrightDataClient(cache_db=os.path.join(workdir, "brightdata_cache.db")))
+        return cls(**overrides)
+
+    async def aclose(self):
+        """Release the adapter's async HTTP session (call before the event loop ends)."""
+        await self.llm_adapter.aclose()
+
+
+_default_context: Optional[AgentContext] = None
+_default_lock = threading.Lock()
+
+
+def get_agent_context() -> AgentContext:
+    """Process-wide context, built on first use"""
+    global _default_context
+    with _default_lock:
+        if _default_context is None:
+            _default_context = AgentContext()
+        return _default_context
@@ -1,3 +1,8 @@
+from tools.logger import get_logger
+
+log = get_logger("angle")
+
+
 class AngleRouter:
     """
     Angle Router (CSE Phase 7 - "Dumb" Mode)
@@ -32,7 +37,8 @@ class AngleRouter:
         rejected_angles = [a for a in all_angles if a != selected_angle]
         
         # Debug print (SRD-01 Phase 5)
-        print(f"ANGLE SELECTED for {normalized_lead.first_name}: {selected_angle} (from pain: {primary_pain})")
+        log.debug("ANGLE SELECTED for %s: %s (from pain: %s)", normalized_lead.first_name, selected_angle, primary_pain,
+                  sample_key=f"{normalized_lead.first_name} {normalized_lead.last_name}".strip())
         
         # Return raw data for CSE
         return {
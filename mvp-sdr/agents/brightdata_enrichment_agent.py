@@ -7,8 +7,8 @@ class BrightDataEnrichmentAgent:
     This agent ONLY fetches and returns raw data from BrightData.
     ALL intelligence (stress signals, complexity, org health) is now handled by the CSE.
     """
-    def __init__(self):
-        self.client = BrightDataClient()
+    def __init__(self, client=None):
+        self.client = client or BrightDataClient()
 
     def run(self, lead_row):
         """
@@ -17,7 +17,8 @@ class BrightDataEnrichmentAgent:
         Input: lead_row (dict) - Raw CSV row
         Output: raw_data (dict) - Raw fields ONLY, no interpretation
         """
-        company_name = lead_row.get("company", "")
+        # Resolved spelling from LeadDeduplicator when dedup ran
+        company_name = lead_row.get("canonical_company") or lead_row.get("company", "")
         
         # 1. Fetch Data
         company_data = self.client.search_company(company_name)
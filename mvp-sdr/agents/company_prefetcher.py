@@ -0,0 +1,112 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tools.brightdata_client import BrightDataClient
+from tools.rate_limiter import TokenBucket
+from tools.logger import get_logger
+from config.settings import PREFETCH_CONCURRENCY, BRIGHTDATA_RATE_LIMIT, BRIGHTDATA_RATE_BURST
+
+log = get_logger("prefetch")
+
+class CompanyPrefetcher:
+    """
+    Company Pre-fetch Stage
+
+    Scans the input once, dedupes by company (then by domain) and batch-fetches
+    BrightData company + jobs data into the cache before per-lead processing.
+    Per-lead BrightDataEnrichmentAgent calls then become cache hits.
+    """
+    def __init__(self, client=None, concurrency=PREFETCH_CONCURRENCY,
+                 rate_limit=BRIGHTDATA_RATE_LIMIT, burst=BRIGHTDATA_RATE_BURST):
+        self.client = client or BrightDataClient()
+        self.concurrency = max(1, concurrency)
+        self.limiter = TokenBucket(rate_limit, burst)
+
+    def run(self, leads, dry_run=False):
+        """
+        Input: iterable of lead rows (dict)
+        Output: report dict (unique counts, cache-hit ratio, fetch throughput)
+
+        dry_run=True only reports what would be fetched (for quota sizing).
+        Domains of uncached companies are unknown until their company data is
+        fetched, so a dry run counts one jobs lookup per uncached company
+        (`jobs_unknown`, an upper bound) on top of the known uncached domains.
+        """
+        # 1. Unique companies (input order kept for deterministic fetch order)
+        leads_scanned = 0
+        companies = {}
+        for lead in leads:
+            leads_scanned += 1
+            name = (lead.get("canonical_company") or lead.get("company") or "").strip()
+            if name:
+                companies.setdefault(name, None)
+
+        company_keys = {name: self.client.company_cache_key(name) for name in companies}
+        cached = self.client.get_cached_many(company_keys.values())
+        companies_to_fetch = [name for name, key in company_keys.items() if key not in cached]
+
+        start = time.time()
+        fetched, failed = 0, 0
+        if not dry_run:
+            fetched, failed = self._fetch_all(self.client.search_company, companies_to_fetch)
+
+        # 2. Unique domains from the (now warm) company data
+        company_data = self.client.get_cached_many(company_keys.values())
+        domains = list(dict.fromkeys(d.get("domain") for d in company_data.values() if d.get("domain")))
+        jobs_keys = {domain: self.client.jobs_cache_key(domain) for domain in domains}
+        jobs_cached = self.client.get_cached_many(jobs_keys.values())
+        domains_to_fetch = [d for d, key in jobs_keys.items() if key not in jobs_cached]
+
+        jobs_unknown = 0
+        if dry_run:
+            jobs_unknown = len(companies_to_fetch)
+        else:
+            jobs_fetched, jobs_failed = self._fetch_all(self.client.get_job_postings, domains_to_fetch)
+            fetched += jobs_fetched
+            failed += jobs_failed
+        elapsed = time.time() - start
+
+        lookups = len(company_keys) + len(jobs_keys)
+        hits = len(cached) + len(jobs_cached)
+        report = {
+            "leads_scanned": leads_scanned,
+            "unique_companies": len(companies),
+            "unique_domains": len(domains),
+            "company_cache_hits": len(cached),
+            "jobs_cache_hits": len(jobs_cached),
+            "cache_hit_ratio": hits / lookups if lookups else 0.0,
+            "jobs_unknown": jobs_unknown,
+            "to_fetch": len(companies_to_fetch) + len(domains_to_fetch) + jobs_unknown,
+            "fetched": fetched,
+            "failed": failed,
+            "elapsed_s": round(elapsed, 3),
+            "fetch_throughput_per_s": round(fetched / elapsed, 2) if fetched and elapsed > 0 else 0.0,
+            "dry_run": dry_run,
+        }
+        self._print_report(report)
+        return report
+
+    def _fetch_all(self, fetch, keys):
+        """Fetch keys with bounded concurrency under the rate limiter."""
+        def fetch_one(key):
+            self.limiter.acquire()
+            try:
+                fetch(key)
+                return True
+            except Exception as e:
+                log.warn("[Prefetch] Failed for %s: %s", key, e)
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            outcomes = list(pool.map(fetch_one, keys))
+        return sum(outcomes), len(outcomes) - sum(outcomes)
+
+    def _print_report(self, report):
+        mode = " (dry run)" if report["dry_run"] else ""
+        log.info("[Prefetch]%s %d leads -> %d unique companies, %d unique domains",
+                 mode, report["leads_scanned"], report["unique_companies"], report["unique_domains"])
+        unknown = f" (incl. up to {report['jobs_unknown']} jobs lookups for uncached companies)" \
+            if report["jobs_unknown"] else ""
+        log.info("[Prefetch] Cache hit ratio: %.0f%% | To fetch: %d%s | Fetched: %d | Failed: %d",
+                 report["cache_hit_ratio"] * 100, report["to_fetch"], unknown, report["fetched"], report["failed"])
+        if not report["dry_run"]:
+            log.info("[Prefetch] %ss, %s fetches/s", report["elapsed_s"], report["fetch_throughput_per_s"])
@@ -1,21 +1,159 @@
-from agents.hook_engine import HookEngine
+import asyncio
+import json
+from agent_context import get_agent_context
 from contracts import EmailOutput
+from tools.logger import get_logger
+
+log = get_logger("email")
+
+# Marks a multi-lead prompt (the mock provider keys on this too)
+BATCH_MARKER = "Write cold emails in batch"
 
 
 class EmailWriter:
+    def __init__(self, context=None):
+        # Adapter and hook engine come from the worker's AgentContext (no per-lead setup);
+        # the adapter's pooled async session is shared by all leads
+        context = context or get_agent_context()
+        self.hook_engine = context.hook_engine
+        self.adapter = context.llm_adapter
+        self.metrics = context.metrics
+
     def run(self, normalized_lead, primary_pain, angle):
         """
         Input: NormalizedLead, primary_pain (str), angle (str)
         Output: EmailOutput object
         """
-        hook_engine = HookEngine()
-        hook = hook_engine.run(normalized_lead, angle)
-        
+        hook = self.hook_engine.run(normalized_lead, angle)
+
         # Phase 4: LLM Generation (Tier 1)
-        from llm_adapter import LLMAdapter
-        adapter = LLMAdapter()
-        
-        prompt = f"""
+        prompt = self._build_prompt(normalized_lead, primary_pain, angle, hook)
+
+        try:
+            # Tier 1 = Pro Model
+            email_body = self.adapter.call(prompt, tier="tier1", schema=False)
+
+            # Mock Subject for now (since LLM returns string)
+            subject = f"Regarding {angle}"
+
+        except Exception as e:
+            log.warn("LLM Writing Failed: %s. Falling back to templates.", e)
+            subject, email_body = self._fallback(angle, hook)
+
+        return self._to_output(subject, email_body, angle)
+
+    async def arun(self, normalized_lead, primary_pain, angle):
+        """
+        Async variant of run(): awaits LLMAdapter.acall so email generation
+        for many leads overlaps. Same prompt, fallback and output as run().
+        """
+        hook = self.hook_engine.run(normalized_lead, angle)
+        prompt = self._build_prompt(normalized_lead, primary_pain, angle, hook)
+
+        try:
+            # Tier 1 = Pro Model
+            email_body = await self.adapter.acall(prompt, tier="tier1", schema=False)
+            subject = f"Regarding {angle}"
+        except Exception as e:
+            log.warn("LLM Writing Failed: %s. Falling back to templates.", e)
+            subject, email_body = self._fallback(angle, hook)
+
+        return self._to_output(subject, email_body, angle)
+
+    # ===== BATCHED GENERATION =====
+
+    def run_batch(self, items):
+        """
+        Input: list of (NormalizedLead, primary_pain, angle)
+        Output: list of EmailOutput (same order)
+
+        Packs all prompts into one structured request. Items missing from
+        the batch response fall back to individual calls.
+        """
+        prepared = self._prepare_batch(items)
+
+        try:
+            response = self.adapter.call(self._build_batch_prompt([p for p, _, _ in prepared]),
+                                    tier="tier1", schema={"type": "email_batch"})
+            bodies = self._parse_batch(response, len(prepared))
+        except Exception as e:
+            log.warn("LLM Batch Writing Failed: %s. Falling back to individual calls.", e)
+            bodies = {}
+
+        outputs = []
+        for i, (prompt, hook, angle) in enumerate(prepared):
+            if i in bodies:
+                outputs.append(self._to_output(f"Regarding {angle}", bodies[i], angle))
+                continue
+            try:
+                email_body = self.adapter.call(prompt, tier="tier1", schema=False)
+                subject = f"Regarding {angle}"
+            except Exception as e:
+                log.warn("LLM Writing Failed: %s. Falling back to templates.", e)
+                subject, email_body = self._fallback(angle, hook)
+            outputs.append(self._to_output(subject, email_body, angle))
+        return outputs
+
+    async def arun_batch(self, items):
+        """Async variant of run_batch() over the shared async adapter."""
+        prepared = self._prepare_batch(items)
+
+        try:
+            response = await self.adapter.acall(self._build_batch_prompt([p for p, _, _ in prepared]),
+                                                      tier="tier1", schema={"type": "email_batch"})
+            bodies = self._parse_batch(response, len(prepared))
+        except Exception as e:
+            log.warn("LLM Batch Writing Failed: %s. Falling back to individual calls.", e)
+            bodies = {}
+
+        async def one(i, prompt, hook, angle):
+            if i in bodies:
+                return self._to_output(f"Regarding {angle}", bodies[i], angle)
+            try:
+                email_body = await self.adapter.acall(prompt, tier="tier1", schema=False)
+                subject = f"Regarding {angle}"
+            except Exception as e:
+                log.warn("LLM Writing Failed: %s. Falling back to templates.", e)
+                subject, email_body = self._fallback(angle, hook)
+            return self._to_output(subject, email_body, angle)
+
+        return await asyncio.gather(*(one(i, *entry) for i, entry in enumerate(prepared)))
+
+    def _prepare_batch(self, items):
+        prepared = []
+        for normalized_lead, primary_pain, angle in items:
+            hook = self.hook_engine.run(normalized_lead, angle)
+            prepared.append((self._build_prompt(normalized_lead, primary_pain, angle, hook), hook, angle))
+        return prepared
+
+    def _build_batch_prompt(self, prompts):
+        sections = "\n".join(f"### LEAD {i}\n{prompt.strip()}" for i, prompt in enumerate(prompts))
+        return (
+            f"{BATCH_MARKER}. Follow each lead's instructions independently.\n"
+            'Return JSON only: {"emails": [{"id": <lead number>, "body": "<email body>"}]}\n\n'
+            f"{sections}"
+        )
+
+    def _parse_batch(self, response, count):
+        """Map lead index -> body for every well-formed item in the response."""
+        if isinstance(response, str):
+            response = json.loads(response)
+        bodies = {}
+        for item in (response or {}).get("emails", []):
+            if not isinstance(item, dict):
+                continue
+            index, body = item.get("id"), item.get("body")
+            if isinstance(index, int) and 0 <= index < count and isinstance(body, str) and body.strip():
+                bodies[index] = body
+        return bodies
+
+    async def aclose(self):
+        """Release the async adapter's HTTP session."""
+        await self.adapter.aclose()
+
+    def _build_prompt(self, normalized_lead, primary_pain, angle, hook):
+        # Exact text matters: it is part of the LLM cache key
+        return f"""
         Write a cold email to {normalized_lead.first_name} ({normalized_lead.role_title} at {normalized_lead.company}).
         Angle: {angle}
         Hook: {hook}
@@ -23,39 +161,100 @@ class EmailWriter:
         
         Constraint: Under 120 words. Direct, senior tone. No fluff.
         """
-        
-        try:
-            # Tier 1 = Pro Model
-            email_body = adapter.call(prompt, tier="tier1", schema=False)
-            
-            # Mock Subject for now (since LLM returns string)
-            subject = f"Regarding {angle}" 
-            
-        except Exception as e:
-            print(f"LLM Writing Failed: {e}. Falling back to templates.")
-            # Fallback to Templates (Phase 3 Logic)
-            templates = {
-                "Predictability": {
-                    "subject": "Predictability > Speed",
-                    "body": f"{hook}\n\nMost leaders trade speed for predictability. You don't have to.\n\nOur system aligns engineering signals automatically.\n\nWorth a chat?"
-                },
-                # ... (Keep other templates or simplify fallback)
-                "Execution Velocity": {
-                    "subject": "Speed without breaking things",
-                    "body": f"{hook}\n\nFriction kills velocity. We remove the friction.\n\nOur Execution OS connects the dots.\n\nOpen to seeing how?"
-                }
-            }
-            default_template = {
-                "subject": "Engineering Efficiency",
-                "body": f"{hook}\n\nWe help teams move faster.\n\nWorth a look?"
+
+    def template(self, normalized_lead, angle):
+        """
+        Template email without an LLM call (e.g. for leads gated out of LLM
+        generation by their provisional score).
+        Output: EmailOutput object
+        """
+        hook = self.hook_engine.run(normalized_lead, angle)
+        subject, email_body = self._template(angle, hook)
+        return self._to_output(subject, email_body, angle)
+
+    def _fallback(self, angle, hook):
+        # Fallback to Templates (Phase 3 Logic)
+        self.metrics.increment("fallbacks", stage="email")
+        return self._template(angle, hook)
+
+    def _template(self, angle, hook):
+        templates = {
+            "Predictability": {
+                "subject": "Predictability > Speed",
+                "body": f"{hook}\n\nMost leaders trade speed for predictability. You don't have to.\n\nOur system aligns engineering signals automatically.\n\nWorth a chat?"
+            },
+            # ... (Keep other templates or simplify fallback)
+            "Execution Velocity": {
+                "subject": "Speed without breaking things",
+                "body": f"{hook}\n\nFriction kills velocity. We remove the friction.\n\nOur Execution OS connects the dots.\n\nOpen to seeing how?"
             }
-            content = templates.get(angle, default_template)
-            subject = content["subject"]
-            email_body = content["body"]
-        
+        }
+        default_template = {
+            "subject": "Engineering Efficiency",
+            "body": f"{hook}\n\nWe help teams move faster.\n\nWorth a look?"
+        }
+        content = templates.get(angle, default_template)
+        return content["subject"], content["body"]
+
+    def _to_output(self, subject, email_body, angle):
         return EmailOutput(
             subject=subject,
             body=email_body,
             angle_used=angle,
             tokens=len(email_body.split())
         )
+
+
+class EmailBatcher:
+    """
+    Collects concurrent email requests from in-flight leads into
+    EmailWriter.arun_batch() calls of up to `batch_size` leads.
+    A partial batch is sent after `max_wait` seconds.
+    """
+    def __init__(self, writer, batch_size, max_wait=0.05):
+        self.writer = writer
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self._pending = []
+        self._timer = None
+        self._sending = set()
+
+    async def submit(self, normalized_lead, primary_pain, angle):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((normalized_lead, primary_pain, angle), future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch):
+        try:
+            outputs = await self.writer.arun_batch([item for item, _ in batch])
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def aclose(self):
+        """Send any partial batch and wait for in-flight batches."""
+        self._flush()
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
@@ -1,19 +1,34 @@
-from contracts import NormalizedLead, AngleSignals
+from contracts import NormalizedLead
+from compact_contracts import CompactAngleSignals, CompactLead
 import json
 import traceback
-from mock_llm_provider import MockLLMProvider
+from agent_context import get_agent_context
+from tools.enrichment_memo import MOCK_SOURCE
+from tools.logger import get_logger
+
+log = get_logger("enrichment")
 
 class EnrichmentAgent:
-    def __init__(self):
+    def __init__(self, context=None, memo=None):
+        context = context or get_agent_context()
         # SRD-01 Phase 1: Use MockLLMProvider exclusively
-        self.provider = MockLLMProvider()
+        self.provider = context.mock_provider
+        # Identical title/company/bio -> reuse the parsed enrichment (persists across runs)
+        self.memo = memo or context.enrichment_memo
+        self.metrics = context.metrics
+
+    def run(self, row) -> NormalizedLead:
+        """Pydantic NormalizedLead (I/O boundary); see run_compact"""
+        return self.run_compact(row).to_model()
 
-    def run(self, row):
+    def run_compact(self, row) -> CompactLead:
         """
         SRD-01 Compliant Enrichment:
         - Direct call to MockLLMProvider._mock_enrichment()
         - No LLMAdapter
         - Deterministic signal extraction
+        - Memoized on normalized title + company + bio
+        - Returns the slot-based CompactLead (no pydantic validation)
         """
 
         # ----------------------------------------------------
@@ -33,23 +48,16 @@ class EnrichmentAgent:
         # 2. CALL MOCK LLM ENRICHMENT (DIRECT)
         # ----------------------------------------------------
         try:
-            # Direct call to mock provider
-            # SRD-01 Fix: Pass title + company + bio to ensure keywords (e.g. "CTO") are detected
-            # even if bio is just a URL.
-            enrichment_prompt = f"{title} at {company}. {bio}"
-            raw_response = self.provider._mock_enrichment(enrichment_prompt)
-
-            # Parse JSON response
-            if isinstance(raw_response, str):
-                data = json.loads(raw_response)
-            else:
-                data = raw_response
+            data = self.memo.get_or_compute(
+                title, company, bio, MOCK_SOURCE,
+                lambda: self._enrich(title, company, bio)
+            )
 
             # Extract angle signals
             signals_data = data.get("angle_signals", {})
             
             # SRD-01: Map fields exactly, apply safe defaults if missing
-            angle_signals = AngleSignals(
+            angle_signals = CompactAngleSignals(
                 delivery_pressure=signals_data.get("delivery_pressure", "medium"),
                 product_complexity=signals_data.get("product_complexity", "medium"),
                 team_structure=signals_data.get("team_structure", "functional"),
@@ -92,7 +100,7 @@ class EnrichmentAgent:
             # ----------------------------------------------------
             # 5. BUILD NORMALIZED LEAD
             # ----------------------------------------------------
-            lead = NormalizedLead(
+            lead = CompactLead(
                 first_name=first_name,
                 last_name=last_name,
                 role_title=title,
@@ -110,23 +118,24 @@ class EnrichmentAgent:
             )
             
             # Debug print (SRD-01 Phase 5)
-            print(f"ENRICHMENT SIGNALS for {name}: {angle_signals}")
+            log.debug("ENRICHMENT SIGNALS for %s: %s", name, angle_signals, sample_key=name)
 
             return lead
 
         except Exception as e:
-            print(f"CRITICAL ENRICHMENT FAILURE for {name}: {e}")
-            traceback.print_exc()
+            log.error("CRITICAL ENRICHMENT FAILURE for %s: %s", name, e,
+                      context={"lead": name, "traceback": traceback.format_exc()})
+            self.metrics.increment("fallbacks", stage="enrichment")
             # SRD-01: Eliminate fallback paths unless actual exception
             # If we are here, something is truly broken.
             # We return a safe default but log heavily.
-            return NormalizedLead(
+            return CompactLead(
                 first_name=first_name,
                 last_name=last_name,
                 role_title=title,
                 company=company,
                 company_size=employees,
-                angle_signals=AngleSignals(
+                angle_signals=CompactAngleSignals(
                     delivery_pressure="medium",
                     product_complexity="medium",
                     team_structure="functional",
@@ -137,3 +146,15 @@ class EnrichmentAgent:
                     organizational_stage_signal="growing"
                 )
             )
+
+    def _enrich(self, title, company, bio):
+        # Direct call to mock provider
+        # SRD-01 Fix: Pass title + company + bio to ensure keywords (e.g. "CTO") are detected
+        # even if bio is just a URL.
+        enrichment_prompt = f"{title} at {company}. {bio}"
+        raw_response = self.provider._mock_enrichment(enrichment_prompt)
+
+        # Parse JSON response
+        if isinstance(raw_response, str):
+            return json.loads(raw_response)
+        return raw_response
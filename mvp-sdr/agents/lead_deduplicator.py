@@ -0,0 +1,324 @@
+import json
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import (
+    DEDUP_COMPANY_THRESHOLD, DEDUP_COMPANY_FUZZY_MIN_LENGTH, DEDUP_NAME_TYPO_MIN_LENGTH, DEDUP_MAX_BLOCK_SIZE
+)
+
+# Dropped before matching ("Scaleup, Inc." == "ScaleUp Inc")
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "gmbh", "ag", "sa", "bv", "plc", "pty", "srl", "oy", "ab", "the",
+}
+# Input columns a company domain can be read from (email: the part after @)
+DOMAIN_FIELDS = ("domain", "website", "company_domain", "email")
+# Personal mailbox / ISP domains: shared by unrelated people, never a company domain
+FREE_MAIL_DOMAINS = {
+    "gmail.com", "googlemail.com", "outlook.com", "hotmail.com", "hotmail.co.uk", "live.com", "msn.com",
+    "yahoo.com", "yahoo.co.uk", "ymail.com", "icloud.com", "me.com", "mac.com", "aol.com",
+    "proton.me", "protonmail.com", "gmx.com", "gmx.de", "gmx.net", "web.de", "mail.com", "mail.ru",
+    "yandex.com", "yandex.ru", "zoho.com", "qq.com", "163.com", "comcast.net", "verizon.net",
+    "att.net", "sbcglobal.net", "btinternet.com", "orange.fr", "free.fr", "t-online.de",
+}
+
+# Prefix/suffix length of the compact-name blocking keys
+BLOCK_AFFIX = 6
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _ascii_tokens(value: str) -> List[str]:
+    value = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode().lower()
+    return [token for token in _NON_ALNUM.split(value) if token]
+
+
+def normalize_company(name: str) -> str:
+    """Lowercase ASCII tokens without punctuation or legal suffixes, space separated"""
+    tokens = _ascii_tokens(name)
+    kept = [token for token in tokens if token not in LEGAL_SUFFIXES]
+    return " ".join(kept or tokens)
+
+
+def normalize_person(name: str) -> str:
+    return " ".join(_ascii_tokens(name))
+
+
+def extract_domain(lead: Dict[str, str]) -> str:
+    """Bare company domain from the first populated DOMAIN_FIELDS column ("" if none)"""
+    for field in DOMAIN_FIELDS:
+        value = (lead.get(field) or "").strip().lower()
+        if not value:
+            continue
+        if field == "email":
+            if "@" not in value:
+                continue
+            value = value.rsplit("@", 1)[1]
+            if value in FREE_MAIL_DOMAINS:
+                continue
+        value = re.sub(r"^[a-z]+://", "", value).split("/", 1)[0].split(":", 1)[0]
+        if value.startswith("www."):
+            value = value[4:]
+        if value:
+            return value
+    return ""
+
+
+def similarity(a: str, b: str, threshold: float) -> float:
+    """SequenceMatcher ratio, skipping the full comparison when a cheap upper bound is already too low"""
+    if a == b:
+        return 1.0
+    if 2.0 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (a transposition is one edit); anything above limit returns limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def allowed_typos(length: int, min_length: int = DEDUP_NAME_TYPO_MIN_LENGTH) -> int:
+    """Edits tolerated in a name token of this length (none for short tokens)"""
+    if length < min_length:
+        return 0
+    return 1 if length < 2 * min_length else 2
+
+
+def names_match(a: List[str], b: List[str], min_length: int = DEDUP_NAME_TYPO_MIN_LENGTH) -> bool:
+    """
+    Same number of tokens, each pair within its length-scaled typo budget.
+    Short first or last names must match exactly, so "Maria Garcia" and
+    "Mario Garcia" stay two people.
+    """
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if x != y:
+            limit = allowed_typos(min(len(x), len(y)), min_length)
+            if limit == 0 or edit_distance(x, y, limit) > limit:
+                return False
+    return True
+
+
+class BlockingIndex:
+    """
+    Blocking key -> entity ids. Only entities sharing a key are compared, so
+    matching cost grows with block sizes instead of with the whole input.
+    Blocks above max_block_size (very common tokens) stop taking part in
+    candidate generation.
+    """
+    def __init__(self, max_block_size: int = DEDUP_MAX_BLOCK_SIZE):
+        self.max_block_size = max(1, max_block_size)
+        self.blocks: Dict[Any, List[int]] = {}
+
+    def candidates(self, keys: Iterable[Any]) -> List[int]:
+        found = {}
+        for key in keys:
+            block = self.blocks.get(key)
+            if block and len(block) <= self.max_block_size:
+                for entity_id in block:
+                    found.setdefault(entity_id, None)
+        return list(found)
+
+    def add(self, keys: Iterable[Any], entity_id: int):
+        for key in keys:
+            self.blocks.setdefault(key, []).append(entity_id)
+
+
+class LeadDeduplicator:
+    """
+    Lead Dedup / Entity Resolution Stage
+
+    Runs before enrichment. Company names are normalized and blocked on their
+    tokens, compact-name prefix/suffix and domain; near-duplicates within a
+    block are merged by fuzzy matching (names shorter than
+    company_fuzzy_min_length only merge when identical or on a shared domain,
+    so "Stripe" and "Stripes" stay apart). People are then matched within
+    their resolved company token by token, with a typo budget that grows with
+    token length. Duplicate leads are dropped (the first occurrence is kept)
+    and every kept lead carries `canonical_company`, which
+    BrightDataEnrichmentAgent looks up instead of the raw spelling.
+    """
+    def __init__(self, company_threshold: float = DEDUP_COMPANY_THRESHOLD,
+                 company_fuzzy_min_length: int = DEDUP_COMPANY_FUZZY_MIN_LENGTH,
+                 name_typo_min_length: int = DEDUP_NAME_TYPO_MIN_LENGTH,
+                 max_block_size: int = DEDUP_MAX_BLOCK_SIZE):
+        self.company_threshold = company_threshold
+        self.company_fuzzy_min_length = company_fuzzy_min_length
+        self.name_typo_min_length = name_typo_min_length
+        self.companies: List[Dict[str, Any]] = []
+        self.company_index = BlockingIndex(max_block_size)
+        self._company_by_key: Dict[str, int] = {}
+        self.people: List[Dict[str, Any]] = []
+        self.person_index = BlockingIndex(max_block_size)
+        self._person_by_key: Dict[Tuple[int, str], int] = {}
+        self.leads_scanned = 0
+        self.comparisons = 0
+
+    # ===== COMPANIES =====
+
+    def resolve_company(self, name: str, domain: str = "") -> int:
+        """Company entity id for a spelling (creates the entity when nothing matches)"""
+        normalized = normalize_company(name)
+        compact = normalized.replace(" ", "")
+
+        # 1. Same domain (unless the names clearly differ), then exact match after normalization
+        entity_id = self._company_by_key.get("@" + domain) if domain else None
+        if entity_id is not None and not self._names_compatible(normalized, entity_id):
+            entity_id = None
+        if entity_id is None and compact:
+            entity_id = self._company_by_key.get(compact)
+            if entity_id is not None and domain and self.companies[entity_id]["domain"] not in ("", domain):
+                entity_id = None  # Same name, different website
+
+        # 2. Fuzzy match inside the blocks (long names only: one letter is a different short name)
+        keys = self._company_keys(normalized, compact, domain)
+        if entity_id is None and len(compact) >= self.company_fuzzy_min_length:
+            best = 0.0
+            for candidate in self.company_index.candidates(keys):
+                other_domain = self.companies[candidate]["domain"]
+                if domain and other_domain and domain != other_domain:
+                    continue  # Different websites: different companies
+                other = self.companies[candidate]["key"]
+                if len(other) < self.company_fuzzy_min_length:
+                    continue
+                self.comparisons += 1
+                score = similarity(compact, other, self.company_threshold)
+                if score >= self.company_threshold and score > best:
+                    best, entity_id = score, candidate
+
+        if entity_id is None:
+            entity_id = len(self.companies)
+            self.companies.append({"canonical": name, "key": compact, "domain": domain, "rows": 0, "spellings": {}})
+            self.company_index.add(keys, entity_id)
+        company = self.companies[entity_id]
+        if domain and not company["domain"]:
+            company["domain"] = domain
+        for key in ((compact,) if compact else ()) + (("@" + domain,) if domain else ()):
+            self._company_by_key.setdefault(key, entity_id)
+        company["rows"] += 1
+        company["spellings"][name] = company["spellings"].get(name, 0) + 1
+        return entity_id
+
+    def _names_compatible(self, normalized: str, entity_id: int) -> bool:
+        """A domain only merges names that plausibly spell the same company ("Globex" / "Globex Corp Intl")"""
+        compact = normalized.replace(" ", "")
+        other = self.companies[entity_id]["key"]
+        if not compact or not other or compact.startswith(other) or other.startswith(compact):
+            return True
+        tokens = set(normalized.split())
+        other_tokens = set(normalize_company(self.companies[entity_id]["canonical"]).split())
+        if tokens <= other_tokens or other_tokens <= tokens:
+            return True
+        return similarity(compact, other, self.company_threshold) >= self.company_threshold
+
+    @staticmethod
+    def _company_keys(normalized: str, compact: str, domain: str) -> List[str]:
+        keys = [f"t:{token}" for token in normalized.split() if len(token) > 1]
+        if compact:
+            # A typo leaves either the start or the end of the name intact
+            keys += [f"p:{compact[:BLOCK_AFFIX]}", f"s:{compact[-BLOCK_AFFIX:]}"]
+        if domain:
+            keys.append(f"d:{domain}")
+        return keys
+
+    # ===== PEOPLE =====
+
+    def _resolve_person(self, company_id: int, name: str, row: int, lead: Dict[str, str]) -> Optional[int]:
+        """Id of the person this lead duplicates, or None for a new person"""
+        normalized = normalize_person(name)
+        compact = normalized.replace(" ", "")
+        if not compact:
+            return None  # Nameless rows are never merged
+
+        person_id = self._person_by_key.get((company_id, compact))
+        tokens = normalized.split()
+        keys = [(company_id, token) for token in tokens] + [(company_id, compact[:3])]
+        if person_id is None:
+            for candidate in self.person_index.candidates(keys):
+                self.comparisons += 1
+                if names_match(tokens, self.people[candidate]["tokens"], self.name_typo_min_length):
+                    person_id = candidate
+                    break  # Candidates come in creation order: the earliest match is canonical
+
+        if person_id is not None:
+            self.people[person_id]["duplicates"].append({"row": row, "name": name, "company": lead.get("company", "")})
+            return person_id
+
+        person_id = len(self.people)
+        self.people.append({"key": compact, "tokens": tokens, "row": row, "name": name, "company": lead.get("company", ""),
+                            "duplicates": []})
+        self._person_by_key[(company_id, compact)] = person_id
+        self.person_index.add(keys, person_id)
+        return None
+
+    # ===== STAGE =====
+
+    def iter_unique(self, leads: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """
+        Yield the first occurrence of every person, in input order, with
+        `canonical_company` set. Streams: duplicates are dropped as they
+        arrive, memory grows with unique entities only.
+        """
+        for lead in leads:
+            row = self.leads_scanned
+            self.leads_scanned += 1
+            company_id = self.resolve_company(lead.get("company", ""), extract_domain(lead))
+            if self._resolve_person(company_id, lead.get("name", ""), row, lead) is not None:
+                continue
+            unique = dict(lead)
+            unique["canonical_company"] = self.companies[company_id]["canonical"]
+            yield unique
+
+    def run(self, leads: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        return list(self.iter_unique(leads))
+
+    def report(self) -> Dict[str, Any]:
+        """Merge groups and counts for the leads seen so far"""
+        company_groups = [
+            {key: company[key] for key in ("canonical", "domain", "rows", "spellings")}
+            for company in self.companies if len(company["spellings"]) > 1
+        ]
+        person_groups = [
+            {
+                "canonical": {key: person[key] for key in ("row", "name", "company")},
+                "duplicates": person["duplicates"],
+            }
+            for person in self.people if person["duplicates"]
+        ]
+        duplicates = sum(len(group["duplicates"]) for group in person_groups)
+        return {
+            "leads_scanned": self.leads_scanned,
+            "unique_leads": self.leads_scanned - duplicates,
+            "duplicate_leads": duplicates,
+            "unique_companies": len(self.companies),
+            "merged_company_spellings": sum(len(group["spellings"]) - 1 for group in company_groups),
+            "comparisons": self.comparisons,
+            "company_groups": company_groups,
+            "person_groups": person_groups,
+        }
+
+    def write_report(self, path: str) -> Dict[str, Any]:
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return report
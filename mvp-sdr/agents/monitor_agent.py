@@ -5,7 +5,7 @@ PURPOSE:
 Monitors pipeline health and data quality before final export.
 
 INPUT CONTRACT:
-- list of LeadResults (NormalizedLead + pain + angle)
+- RunMetrics of the finished run (PipelineExecutor.metrics)
 
 OUTPUT CONTRACT:
 - MonitoringReport object:
@@ -14,14 +14,77 @@ OUTPUT CONTRACT:
     - reasons: list of failure reasons
 
 RESPONSIBILITIES:
-- Check Enrichment Consistency: Are signals populated?
-- Check Pain Diversity: Are we seeing > X unique pains?
-- Check Angle Distribution: Is any angle > 50% of total?
-- Alert on high fallback rates.
+- Alert on high fallback rates: any stage above FALLBACK_THRESHOLD -> FAIL
+- Check Pain Diversity: fewer than MINIMUM_UNIQUE_PAINS distinct pains -> WARN
+- Check Angle Distribution: any angle above MAX_ANGLE_SHARE of leads -> WARN
+- Check Latency: stage p95 above its STAGE_P95_BUDGET_MS entry -> WARN
 
 INTEGRATION:
-- Called by PipelineManager after processing all leads, before writing CSV.
+- Called by main.py after each run; the report is stored in metrics.json.
 """
 
+from typing import Dict, Optional
+
+from contracts import MonitoringReport
+from tools.run_metrics import RunMetrics
+from config.settings import FALLBACK_THRESHOLD, MINIMUM_UNIQUE_PAINS, MAX_ANGLE_SHARE, STAGE_P95_BUDGET_MS
+
+
 class MonitorAgent:
-    pass
+    def __init__(self, fallback_threshold: float = FALLBACK_THRESHOLD,
+                 minimum_unique_pains: int = MINIMUM_UNIQUE_PAINS,
+                 max_angle_share: float = MAX_ANGLE_SHARE,
+                 stage_p95_budget_ms: Optional[Dict[str, float]] = None):
+        self.fallback_threshold = fallback_threshold
+        self.minimum_unique_pains = minimum_unique_pains
+        self.max_angle_share = max_angle_share
+        self.stage_p95_budget_ms = STAGE_P95_BUDGET_MS if stage_p95_budget_ms is None else stage_p95_budget_ms
+
+    def run(self, metrics: RunMetrics) -> MonitoringReport:
+        failures, warnings = [], []
+
+        processed = metrics.counter("leads_processed")
+        leads = processed + metrics.counter("leads_resumed")
+        if not leads:
+            return MonitoringReport(status="WARN", metrics={"leads": 0}, reasons=["No leads processed"])
+
+        # 1. Fallback rate per stage (resumed leads ran their stages earlier)
+        fallback_rates = {
+            stage: round(count / processed, 4) if processed else 0.0
+            for stage, count in metrics.counters("fallbacks").items()
+        }
+        for stage, rate in sorted(fallback_rates.items()):
+            if rate > self.fallback_threshold:
+                failures.append(f"Fallback rate for {stage} is {rate:.1%} (threshold {self.fallback_threshold:.1%})")
+
+        # 2. Pain diversity (only meaningful once there are enough leads)
+        pains = metrics.counters("pains")
+        if leads >= self.minimum_unique_pains and len(pains) < self.minimum_unique_pains:
+            warnings.append(f"Only {len(pains)} unique pains (minimum {self.minimum_unique_pains})")
+
+        # 3. Angle distribution
+        angles = metrics.counters("angles")
+        top_angle, top_count = max(angles.items(), key=lambda item: item[1], default=(None, 0))
+        angle_share = round(top_count / leads, 4)
+        if angle_share > self.max_angle_share:
+            warnings.append(f"Angle '{top_angle}' used for {angle_share:.1%} of leads (max {self.max_angle_share:.1%})")
+
+        # 4. Stage latency budgets
+        stage_p95_ms = {stage: histogram.quantile(0.95) for stage, histogram in metrics.stages.items()}
+        for stage, budget in sorted(self.stage_p95_budget_ms.items()):
+            if stage_p95_ms.get(stage, 0.0) > budget:
+                warnings.append(f"Stage {stage} p95 is {stage_p95_ms[stage]:.1f} ms (budget {budget:.1f} ms)")
+
+        status = "FAIL" if failures else "WARN" if warnings else "PASS"
+        return MonitoringReport(
+            status=status,
+            metrics={
+                "leads": leads,
+                "fallback_rates": fallback_rates,
+                "unique_pains": len(pains),
+                "top_angle": top_angle,
+                "top_angle_share": angle_share,
+                "stage_p95_ms": {stage: round(ms, 3) for stage, ms in stage_p95_ms.items()},
+            },
+            reasons=failures + warnings
+        )
@@ -1,10 +1,57 @@
+from tools.rule_engine import RuleSet, columns_from_records
+
+# Pain patterns in priority order (first match = primary pain).
+# Each rule's condition fields are echoed in pattern_matches.
+PAIN_RULES = [
+    # Priority 1: Extreme Chaos Signals
+    {"name": "firefighting spiral", "match": "any", "conditions": [
+        ("execution_noise_level", "==", "extreme"),
+        ("organizational_stage_signal", "==", "chaos"),
+    ]},
+    # Priority 2: Organizational Maturity Signals
+    {"name": "silent attrition", "match": "all", "conditions": [
+        ("team_structure", "==", "matrix"),
+        ("execution_noise_level", "==", "high"),
+    ]},
+    # Priority 3: Coordination Complexity Signals
+    {"name": "cross-team flow collapse", "match": "any", "conditions": [
+        ("multi_team_coordination", "==", "high"),
+        ("team_structure", "==", "squads"),
+    ]},
+    # Priority 4: Breaking Point Signals
+    {"name": "too many initiatives", "match": "all", "conditions": [
+        ("organizational_stage_signal", "==", "breaking"),
+        ("execution_noise_level", "==", "high"),
+    ]},
+    # Priority 5: Strategic Alignment Signals
+    {"name": "architecture drift", "match": "any", "conditions": [
+        ("team_structure", "==", "cross-functional"),
+        ("organizational_stage_signal", "==", "scaleup"),
+    ]},
+    # Priority 6: Delegation Gap Signals
+    {"name": "no delegation layer", "match": "all", "conditions": [
+        ("team_structure", "==", "flat"),
+        ("engineering_maturity", "==", "low"),
+    ]},
+]
+
+DEFAULT_PAIN = "execution friction"
+
+# Compiled once per process
+PAIN_RULESET = RuleSet(PAIN_RULES)
+
+
 class PainProfiler:
     """
     Pain Profiler (CSE Phase 7 - "Dumb" Mode)
     
     Returns ALL pain candidates and pattern matches.
     The CSE will use this to compute pain strength and explain reasoning.
+    Pain patterns are declared in PAIN_RULES and evaluated by a compiled RuleSet.
     """
+    def __init__(self, ruleset=PAIN_RULESET):
+        self.rules = ruleset
+
     def run(self, nl):
         """
         Input: NormalizedLead object
@@ -13,88 +60,45 @@ class PainProfiler:
 
         # Safety: if enrichment failed
         if not nl.angle_signals:
-            return {
-                "pain_candidates": ["execution friction"],
-                "raw_fragments": [],
-                "pattern_matches": {},
-                "primary_pain": "execution friction"
-            }
-
-        s = nl.angle_signals  # shorthand
-        
-        # Collect all matched pains (not just first match)
-        pain_candidates = []
-        pattern_matches = {}
-
-        # Priority 1: Extreme Chaos Signals
-        if (
-            getattr(s, "execution_noise_level", "") == "extreme"
-            or getattr(s, "organizational_stage_signal", "") == "chaos"
-        ):
-            pain_candidates.append("firefighting spiral")
-            pattern_matches["firefighting spiral"] = {
-                "execution_noise_level": getattr(s, "execution_noise_level", ""),
-                "organizational_stage_signal": getattr(s, "organizational_stage_signal", "")
-            }
+            return self._fallback()
 
-        # Priority 2: Organizational Maturity Signals
-        if (
-            getattr(s, "team_structure", "") == "matrix"
-            and getattr(s, "execution_noise_level", "") == "high"
-        ):
-            pain_candidates.append("silent attrition")
-            pattern_matches["silent attrition"] = {
-                "team_structure": getattr(s, "team_structure", ""),
-                "execution_noise_level": getattr(s, "execution_noise_level", "")
-            }
-
-        # Priority 3: Coordination Complexity Signals
-        if (
-            getattr(s, "multi_team_coordination", "") == "high"
-            or getattr(s, "team_structure", "") == "squads"
-        ):
-            pain_candidates.append("cross-team flow collapse")
-            pattern_matches["cross-team flow collapse"] = {
-                "multi_team_coordination": getattr(s, "multi_team_coordination", ""),
-                "team_structure": getattr(s, "team_structure", "")
-            }
+        return self._build_output(nl.angle_signals, self.rules.match_one(nl.angle_signals))
 
-        # Priority 4: Breaking Point Signals
-        if (
-            getattr(s, "organizational_stage_signal", "") == "breaking"
-            and getattr(s, "execution_noise_level", "") == "high"
-        ):
-            pain_candidates.append("too many initiatives")
-            pattern_matches["too many initiatives"] = {
-                "organizational_stage_signal": getattr(s, "organizational_stage_signal", ""),
-                "execution_noise_level": getattr(s, "execution_noise_level", "")
-            }
+    def run_batch(self, normalized_leads):
+        """
+        Input: list of NormalizedLead
+        Output: list of run() dicts, with all rules evaluated over the batch at once
+        """
+        outputs = [None] * len(normalized_leads)
+        signals = []
+        positions = []
+        for i, nl in enumerate(normalized_leads):
+            if nl.angle_signals:
+                signals.append(nl.angle_signals)
+                positions.append(i)
+            else:
+                outputs[i] = self._fallback()
 
-        # Priority 5: Strategic Alignment Signals
-        if (
-            getattr(s, "team_structure", "") == "cross-functional"
-            or getattr(s, "organizational_stage_signal", "") == "scaleup"
-        ):
-            pain_candidates.append("architecture drift")
-            pattern_matches["architecture drift"] = {
-                "team_structure": getattr(s, "team_structure", ""),
-                "organizational_stage_signal": getattr(s, "organizational_stage_signal", "")
-            }
+        if signals:
+            matches = self.rules.match_batch(columns_from_records(signals, self.rules.fields))
+            for row, i in enumerate(positions):
+                matched = [self.rules.rules[j] for j in matches[row].nonzero()[0]]
+                outputs[i] = self._build_output(signals[row], matched)
+        return outputs
 
-        # Priority 6: Delegation Gap Signals
-        if (
-            getattr(s, "team_structure", "") == "flat"
-            and getattr(s, "engineering_maturity", "") == "low"
-        ):
-            pain_candidates.append("no delegation layer")
-            pattern_matches["no delegation layer"] = {
-                "team_structure": getattr(s, "team_structure", ""),
-                "engineering_maturity": getattr(s, "engineering_maturity", "")
+    def _build_output(self, s, matched_rules):
+        # Collect all matched pains (not just first match)
+        pain_candidates = []
+        pattern_matches = {}
+        for rule in matched_rules:
+            pain_candidates.append(rule["name"])
+            pattern_matches[rule["name"]] = {
+                field: getattr(s, field, "") for field, _, _ in rule["conditions"]
             }
 
         # Default Fallback
         if not pain_candidates:
-            pain_candidates.append("execution friction")
+            pain_candidates.append(DEFAULT_PAIN)
 
         # Primary pain is the first match (highest priority)
         primary_pain = pain_candidates[0]
@@ -105,3 +109,11 @@ class PainProfiler:
             "pattern_matches": pattern_matches,
             "primary_pain": primary_pain
         }
+
+    def _fallback(self):
+        return {
+            "pain_candidates": [DEFAULT_PAIN],
+            "raw_fragments": [],
+            "pattern_matches": {},
+            "primary_pain": DEFAULT_PAIN
+        }
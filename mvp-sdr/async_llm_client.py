@@ -0,0 +1,220 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+from llm_client import LLMClient
+from mock_llm_provider import MockLLMProvider
+from tools.rate_limiter import TokenBucket
+from tools.provider_simulator import SimulatedProviderError, SimulatedTimeout
+from config.settings import (
+    LLM_API_BASE, LLM_API_KEY, LLM_TIER_CONCURRENCY, LLM_MAX_CONNECTIONS,
+    LLM_RATE_LIMIT, LLM_RATE_BURST, LLM_MAX_RETRIES, LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX, LLM_REQUEST_TIMEOUT
+)
+
+# Transient provider failures worth retrying
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMProviderError(Exception):
+    """Non-retryable provider failure, or retries exhausted."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncLLMClient(LLMClient):
+    """
+    Async counterpart of LLMClient.
+    Same cache (memory LRU + cache.db) and log format; calls an
+    OpenAI-compatible /chat/completions endpoint over a pooled HTTP session.
+
+    - Bounded concurrency per model tier (asyncio.Semaphore)
+    - Token-bucket rate limiting across all tiers
+    - Exponential backoff with full jitter on 429/5xx/timeouts/malformed 200
+      bodies, i.e. unparsable JSON or missing choices (honours Retry-After)
+    """
+
+    def __init__(self, base_url=LLM_API_BASE, api_key=LLM_API_KEY, cache_db="cache.db",
+                 log_file="logs/llm_logs.jsonl", tier_concurrency=None,
+                 max_connections=LLM_MAX_CONNECTIONS, rate_limit=LLM_RATE_LIMIT,
+                 burst=LLM_RATE_BURST, max_retries=LLM_MAX_RETRIES,
+                 backoff_base=LLM_BACKOFF_BASE, backoff_max=LLM_BACKOFF_MAX,
+                 timeout=LLM_REQUEST_TIMEOUT):
+        super().__init__(cache_db=cache_db, log_file=log_file)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.tier_concurrency = dict(tier_concurrency or LLM_TIER_CONCURRENCY)
+        self.max_connections = max_connections
+        self.limiter = TokenBucket(rate_limit, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self._session = None
+        self._semaphores = {}
+        self.usage = {"prompt_tokens": 0, "completion_tokens": 0, "requests": 0, "retries": 0}
+
+    # ===== SESSION =====
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._semaphores = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _semaphore(self, tier):
+        if tier not in self._semaphores:
+            limit = self.tier_concurrency.get(tier, self.tier_concurrency.get("default", 4))
+            self._semaphores[tier] = asyncio.Semaphore(limit)
+        return self._semaphores[tier]
+
+    # ===== CALL =====
+
+    async def call(self, model, messages, schema=None, tier="tier2"):
+        """
+        Async LLM call with Caching, Logging, Concurrency Limits and Retries.
+        """
+        cache_key = self._get_cache_key(model, messages, schema)
+
+        # 1. Check Cache (memory, then disk)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self._log(model, messages, cached, True, 0, cache_key)
+            return cached
+
+        # 2. Call Provider (bounded per tier, rate limited, retried)
+        start_time = time.time()
+        async with self._semaphore(tier):
+            response = await self._request_with_retries(model, messages, schema, tier)
+        latency = time.time() - start_time
+
+        # 3. Save to Cache (written back to disk asynchronously)
+        self.cache.put(cache_key, response, columns={"model": model, "timestamp": time.time()})
+
+        self._log(model, messages, response, False, latency, cache_key)
+        return response
+
+    async def _request_with_retries(self, model, messages, schema, tier="tier2"):
+        payload = {"model": model, "messages": messages}
+        if schema:
+            payload["response_format"] = {"type": "json_object"}
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire_async()
+            retry_after = None
+            try:
+                status, retry_header, body = await self._send(payload, tier)
+                if status == 200:
+                    try:
+                        content = body["choices"][0]["message"]["content"]
+                    except (KeyError, IndexError, TypeError):
+                        # Truncated, non-JSON or half-written body (None from _send): retried like a 5xx
+                        error = LLMProviderError("LLM provider returned a malformed response", status)
+                    else:
+                        self._record_usage(body)
+                        return content
+                else:
+                    if status not in RETRYABLE_STATUSES:
+                        raise LLMProviderError(f"LLM provider returned {status}: {body[:200]}", status)
+                    retry_after = self._parse_retry_after(retry_header)
+                    error = LLMProviderError(f"LLM provider returned {status}", status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = LLMProviderError(f"LLM request failed: {e!r}")
+
+            if attempt == self.max_retries:
+                raise error
+
+            self.usage["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    async def _send(self, payload, tier):
+        """One attempt: (status, Retry-After header, JSON body on 200 (None if unparsable) else error text)"""
+        session = await self._get_session()
+        async with session.post(f"{self.base_url}/chat/completions", json=payload) as resp:
+            if resp.status == 200:
+                try:
+                    return resp.status, None, await resp.json()
+                except (ValueError, aiohttp.ContentTypeError):
+                    # Cut-off JSON (JSONDecodeError is a ValueError) or a non-JSON content type
+                    return resp.status, None, None
+            return resp.status, resp.headers.get("Retry-After"), await resp.text()
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff; Retry-After is a floor."""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(0, cap)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value):
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def _record_usage(self, body):
+        usage = body.get("usage") or {}
+        self.usage["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        self.usage["completion_tokens"] += usage.get("completion_tokens", 0)
+        self.usage["requests"] += 1
+
+
+class SimulatedLLMClient(AsyncLLMClient):
+    """
+    AsyncLLMClient for offline load tests: each HTTP attempt is replaced by
+    a ProviderSimulator draw on endpoint "llm_<tier>" (latency from the
+    prompt and completion token counts, 5xx, timeouts, 429 + Retry-After)
+    and the content comes from MockLLMProvider. Caching, tier limits, rate
+    limiting, retries and backoff run unchanged.
+    """
+
+    def __init__(self, simulator, mock_provider=None, **kwargs):
+        kwargs.setdefault("api_key", None)
+        super().__init__(**kwargs)
+        self.simulator = simulator
+        self.mock_provider = mock_provider or MockLLMProvider()
+
+    async def _send(self, payload, tier):
+        messages = payload["messages"]
+        content = self.mock_provider.call(messages[-1]["content"], payload.get("response_format"))
+        # ~4 characters per token
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        completion_tokens = max(1, len(content) // 4)
+        key = self._get_cache_key(payload["model"], messages, payload.get("response_format"))
+        try:
+            await self.simulator.acall(f"llm_{tier}", key, tokens=completion_tokens, prompt_tokens=prompt_tokens)
+        except SimulatedTimeout as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except SimulatedProviderError as e:
+            retry_after = None if e.retry_after is None else str(e.retry_after)
+            return e.status, retry_after, str(e)
+        return 200, None, {
+            "choices": [{"message": {"content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+        }
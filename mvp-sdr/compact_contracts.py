@@ -0,0 +1,194 @@
+"""
+Compact internal representation of the lead contracts.
+
+AngleSignals values are enum-encoded as small ints (one vocabulary per
+field) and NormalizedLead fields live in __slots__, so the per-lead hot
+path never constructs or validates pydantic models. Conversion to and
+from the pydantic contracts in contracts.py happens only at I/O
+boundaries (to_model / from_model / from_dict).
+
+Attribute access returns the decoded strings, so agents written against
+the pydantic contracts (PainProfiler, AngleRouter, HookEngine,
+EmailWriter) work unchanged.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from contracts import AngleSignals, NormalizedLead
+
+SIGNAL_FIELDS = (
+    "delivery_pressure",
+    "product_complexity",
+    "team_structure",
+    "engineering_maturity",
+    "decision_maker_level",
+    "execution_noise_level",
+    "multi_team_coordination",
+    "organizational_stage_signal",
+)
+
+LEAD_FIELDS = (
+    "first_name",
+    "last_name",
+    "role_title",
+    "role_seniority",
+    "role_category",
+    "company",
+    "company_size",
+    "company_stage",
+    "industry",
+    "company_category",
+    "linkedin_url",
+    "website_url",
+    "country",
+    "region",
+    "product_type",
+    "business_model",
+    "signal_count",
+    "angle_signals",
+)
+
+# Known values get stable codes; anything else is interned on first sight
+LEVELS = ["low", "medium", "high", "extreme"]
+SIGNAL_SEEDS = {
+    "delivery_pressure": LEVELS,
+    "product_complexity": LEVELS,
+    "team_structure": ["functional", "squads", "pods", "matrix", "cross-functional", "flat"],
+    "engineering_maturity": LEVELS,
+    "decision_maker_level": LEVELS,
+    "execution_noise_level": LEVELS,
+    "multi_team_coordination": LEVELS,
+    "organizational_stage_signal": ["growing", "scaleup", "breaking", "chaos", "stable"],
+}
+
+
+class SignalVocabulary:
+    """value <-> small int code for one signal field (code 0 = missing)"""
+
+    def __init__(self, seeds=()):
+        self.values = [None]
+        self.codes = {None: 0}
+        self._lock = threading.Lock()
+        for value in seeds:
+            self.encode(value)
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = code
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code]
+
+
+VOCABULARIES = {field: SignalVocabulary(SIGNAL_SEEDS.get(field, ())) for field in SIGNAL_FIELDS}
+
+
+class CompactAngleSignals:
+    """AngleSignals as a tuple of enum codes"""
+
+    __slots__ = ("codes",)
+
+    def __init__(self, **values: Optional[str]):
+        self.codes = tuple(VOCABULARIES[field].encode(values.get(field)) for field in SIGNAL_FIELDS)
+
+    @classmethod
+    def from_codes(cls, codes: Tuple[int, ...]) -> "CompactAngleSignals":
+        signals = cls.__new__(cls)
+        signals.codes = tuple(codes)
+        return signals
+
+    @classmethod
+    def from_model(cls, model: AngleSignals) -> "CompactAngleSignals":
+        return cls(**{field: getattr(model, field) for field in SIGNAL_FIELDS})
+
+    def to_model(self) -> AngleSignals:
+        return AngleSignals(**self.dict())
+
+    def dict(self) -> Dict[str, Optional[str]]:
+        return {field: getattr(self, field) for field in SIGNAL_FIELDS}
+
+    def missing(self):
+        """Fields with no value (code 0)"""
+        return [field for field, code in zip(SIGNAL_FIELDS, self.codes) if code == 0]
+
+    def __eq__(self, other):
+        return isinstance(other, CompactAngleSignals) and self.codes == other.codes
+
+    def __hash__(self):
+        return hash(self.codes)
+
+    def __str__(self):
+        # Same text as the pydantic model's str()
+        return " ".join(f"{field}={getattr(self, field)!r}" for field in SIGNAL_FIELDS)
+
+    def __repr__(self):
+        return f"CompactAngleSignals({self})"
+
+
+def _signal_property(index: int, field: str):
+    vocabulary = VOCABULARIES[field]
+
+    def get(self):
+        return vocabulary.values[self.codes[index]]
+
+    def set(self, value):
+        codes = list(self.codes)
+        codes[index] = vocabulary.encode(value)
+        self.codes = tuple(codes)
+
+    return property(get, set)
+
+
+for _index, _field in enumerate(SIGNAL_FIELDS):
+    setattr(CompactAngleSignals, _field, _signal_property(_index, _field))
+
+
+class CompactLead:
+    """NormalizedLead without pydantic: plain slots, compact signals"""
+
+    __slots__ = LEAD_FIELDS
+
+    def __init__(self, first_name: str, last_name: str, company: str,
+                 angle_signals: CompactAngleSignals, signal_count: Optional[int] = 0, **fields: Any):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.company = company
+        self.angle_signals = angle_signals
+        self.signal_count = signal_count
+        for field in LEAD_FIELDS:
+            if field not in ("first_name", "last_name", "company", "angle_signals", "signal_count"):
+                setattr(self, field, fields.pop(field, None))
+        if fields:
+            raise TypeError(f"Unknown NormalizedLead fields: {sorted(fields)}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactLead":
+        """From NormalizedLead.dict() output (e.g. a journal checkpoint)"""
+        data = dict(data)
+        signals = data.pop("angle_signals") or {}
+        return cls(angle_signals=CompactAngleSignals(**signals), **data)
+
+    @classmethod
+    def from_model(cls, model: NormalizedLead) -> "CompactLead":
+        data = {field: getattr(model, field) for field in LEAD_FIELDS if field != "angle_signals"}
+        return cls(angle_signals=CompactAngleSignals.from_model(model.angle_signals), **data)
+
+    def to_model(self) -> NormalizedLead:
+        return NormalizedLead(**self.dict())
+
+    def dict(self) -> Dict[str, Any]:
+        """Same shape and field order as NormalizedLead.dict()"""
+        data = {field: getattr(self, field) for field in LEAD_FIELDS}
+        data["angle_signals"] = self.angle_signals.dict() if self.angle_signals is not None else None
+        return data
+
+    def __repr__(self):
+        return f"CompactLead(first_name={self.first_name!r}, company={self.company!r})"
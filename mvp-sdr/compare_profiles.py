@@ -0,0 +1,62 @@
+"""
+Compare CSE weight profiles over stored pipeline traces (no agent reruns).
+
+    python compare_profiles.py pipeline_trace.json --output profile_scores.csv
+    python compare_profiles.py pipeline_trace.jsonl --profiles v1 v2 --baseline v1
+"""
+
+import argparse
+import json
+import time
+
+from cse.config import WEIGHT_PROFILES, ACTIVE_WEIGHT_PROFILE, TIERS
+from cse.profile_comparison import ProfileComparison, load_traces
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score stored leads under every CSE weight profile")
+    parser.add_argument("traces", nargs="?", default="pipeline_trace.json",
+                        help="Pipeline trace file (.json or .jsonl; trace level summary or full)")
+    parser.add_argument("--profiles", nargs="+", choices=list(WEIGHT_PROFILES), default=None,
+                        help="Profiles to score (default: all configured)")
+    parser.add_argument("--baseline", choices=list(WEIGHT_PROFILES), default=ACTIVE_WEIGHT_PROFILE,
+                        help="Profile tier migrations are measured against")
+    parser.add_argument("--output", metavar="PATH", default=None,
+                        help="Write per-lead score_<profile> / tier_<profile> columns to this CSV")
+    parser.add_argument("--summary-json", metavar="PATH", default=None,
+                        help="Write tier counts and migrations to this JSON file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    start = time.perf_counter()
+    # Traces are streamed into the scorer: loading and scoring are one pass
+    comparison = ProfileComparison.from_traces(load_traces(args.traces), profiles=args.profiles,
+                                               baseline=args.baseline)
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {len(comparison)} leads under {len(comparison.scores)} profile(s) in {elapsed:.2f}s")
+
+    summary = comparison.summary()
+    print("\nTier counts:")
+    for profile, counts in summary["tier_counts"].items():
+        marker = " (baseline)" if profile == comparison.baseline else ""
+        print(f"  {profile:15} " + "  ".join(f"{tier}: {counts[tier]:6}" for tier in TIERS) + marker)
+
+    print(f"\nTier migration vs {comparison.baseline}:")
+    for profile, moves in summary["migration"].items():
+        changed = {move: count for move, count in moves.items() if move[0] != move[-1]}
+        print(f"  {profile:15} " + (", ".join(f"{move}: {count}" for move, count in changed.items()) or "no changes"))
+
+    if args.output:
+        comparison.write_csv(args.output)
+        print(f"\nPer-lead scores written to {args.output}")
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
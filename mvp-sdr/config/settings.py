@@ -19,12 +19,144 @@ SETTINGS:
   - log_file (str): Path to pipeline.log
 """
 
+import os
+
 # Placeholders
 FALLBACK_THRESHOLD = 0.1
 MINIMUM_UNIQUE_PAINS = 3
 INPUT_CSV_PATH = "leads.csv"
 OUTPUT_CSV_PATH = "generated_emails.csv"
+METRICS_STORE_PATH = "metrics.json"
 LOG_LEVEL = "INFO"
 
 # BrightData Configuration
 BRIGHTDATA_API_KEY = "5938e75fce6787703fcdeb1797f3a1d68fca1a3f1bc654773960c118f54e976c"
+
+# Pipeline Concurrency
+PIPELINE_WORKERS = 1  # Leads in flight at once (I/O stages run on a thread pool)
+CSE_PROCESSES = 0     # CSE scoring process pool size (0 = score inline)
+
+# Checkpoint / Resume
+RUN_JOURNAL_ENABLED = False          # Journal every run (--journal); --resume always journals
+RUN_JOURNAL_PATH = "run_journal.db"  # SQLite journal of completed stages per lead
+RUN_JOURNAL_BATCH_SIZE = 200         # Buffered stage records per commit
+RUN_JOURNAL_FLUSH_INTERVAL = 2.0     # ...or commit once this many seconds passed since the last commit
+RUN_JOURNAL_KEEP_RUNS = 5            # Finished runs kept (older ones are pruned); unfinished runs are kept
+
+# Signal Store (offline rescoring, see rescore.py)
+SIGNAL_STORE_ENABLED = False              # Record every run (--signal-store); the store grows with every run
+SIGNAL_STORE_PATH = "signal_store.db"     # Raw agent fields + normalized signals per scored lead
+SIGNAL_STORE_BATCH_SIZE = 500             # Buffered leads per insert transaction
+RESCORE_BATCH_SIZE = 50000                # Stored leads scored per vectorized batch
+
+# Lead Dedup / Entity Resolution (before enrichment)
+DEDUP_ENABLED = False                     # Merge duplicate people/companies before BrightData + LLM
+DEDUP_COMPANY_THRESHOLD = 0.9             # Fuzzy ratio for two company spellings to merge
+DEDUP_COMPANY_FUZZY_MIN_LENGTH = 8        # Shorter names merge only when identical (normalized) or on a shared domain
+DEDUP_NAME_TYPO_MIN_LENGTH = 6            # Name tokens shorter than this must match exactly; 1 typo allowed
+                                          # from this length, 2 from twice it ("Maria" != "Mario")
+DEDUP_MAX_BLOCK_SIZE = 100                # Blocking keys shared by more entities are ignored
+DEDUP_REPORT_PATH = "dedup_report.json"   # Merge groups of the last deduplicated run
+
+# BrightData Cache
+BRIGHTDATA_COMPANY_TTL = 30 * 24 * 3600   # Company profiles change slowly
+BRIGHTDATA_JOBS_TTL = 7 * 24 * 3600       # Job postings go stale faster
+BRIGHTDATA_CACHE_MAX_ENTRIES = 200000     # Oldest entries evicted beyond this
+BRIGHTDATA_CACHE_BATCH_SIZE = 100         # Buffered writes per upsert transaction
+BRIGHTDATA_MEMORY_CACHE_SIZE = 10000      # In-process LRU entries in front of SQLite
+
+# BrightData Pre-fetch
+PREFETCH_CONCURRENCY = 8                  # Parallel BrightData fetches during pre-fetch
+BRIGHTDATA_RATE_LIMIT = 5.0               # Sustained BrightData requests per second
+BRIGHTDATA_RATE_BURST = 10                # Requests allowed in a burst
+
+# LLM Cache
+LLM_MEMORY_CACHE_SIZE = 5000              # In-process LRU entries in front of cache.db
+
+# Cache write-back (memory tier -> SQLite, background thread)
+CACHE_WRITE_BACK_MAX_PENDING = 10000      # Keys awaiting write-back; writers block beyond this
+
+# Async LLM Client (OpenAI-compatible endpoint)
+LLM_API_BASE = os.getenv("LLM_API_BASE", "https://api.openai.com/v1")
+LLM_API_KEY = os.getenv("OPENAI_API_KEY")
+LLM_TIER_CONCURRENCY = {"tier1": 8, "tier2": 16, "default": 4}  # In-flight requests per model tier
+LLM_MAX_CONNECTIONS = 32       # Pooled HTTP connections
+LLM_RATE_LIMIT = 10.0          # Sustained requests per second
+LLM_RATE_BURST = 20            # Requests allowed in a burst
+LLM_MAX_RETRIES = 5            # Retries on 429 / 5xx / timeouts
+LLM_BACKOFF_BASE = 0.5         # Seconds; doubles per attempt (full jitter)
+LLM_BACKOFF_MAX = 30.0         # Backoff cap in seconds
+LLM_REQUEST_TIMEOUT = 60.0     # Per-request timeout in seconds
+
+# Email Prompt Batching
+EMAIL_BATCH_SIZE = 0           # Leads packed into one email-generation request (0/1 = off)
+EMAIL_BATCH_MAX_WAIT = 0.05    # Seconds a partial batch waits for more leads
+
+# Enrichment Memo
+ENRICHMENT_MEMO_VERSION = "v1"      # Bump when the enrichment prompt or model changes
+ENRICHMENT_MEMO_DB = "cache.db"     # Stored in table "enrichment_memo"
+ENRICHMENT_MEMO_MEMORY_SIZE = 10000 # In-process LRU entries in front of SQLite
+
+# Hook Catalog
+HOOK_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hooks.json")
+HOOK_CATALOG_RELOAD_INTERVAL = 5.0  # Seconds between file change checks (None = never hot reload)
+HOOK_CAMPAIGN = "default"           # Campaign used when none is given
+
+# Logging (LOG_LEVEL above: DEBUG, INFO, WARN, ERROR or OFF)
+LOG_DEBUG_SAMPLE_RATE = 1.0  # Fraction of leads whose per-lead DEBUG lines are kept
+LOG_JSONL_PATH = None        # Structured JSONL sink (None = console only)
+LOG_CONSOLE = True           # Plain-text console sink
+
+# LLM Call Log (logs/llm_logs.jsonl, written by a background thread)
+LLM_LOG_CACHE_HITS = "hash"          # "full" bodies, "hash" (prompt/response hashes) or "off"
+LLM_LOG_QUEUE_SIZE = 10000           # Bounded queue; callers block when the writer falls behind
+LLM_LOG_FLUSH_INTERVAL = 0.5         # Seconds a batch may wait to fill before it is written
+LLM_LOG_MAX_BYTES = 50 * 1024 * 1024 # Rotate past this size (None = no size rotation)
+LLM_LOG_ROTATE_INTERVAL = None       # Rotate after this many seconds (None = no time rotation)
+LLM_LOG_COMPRESS = True              # gzip rotated files
+LLM_LOG_BACKUP_COUNT = 10            # Rotated files kept (None = keep all)
+
+# Run Metrics / MonitorAgent (see also FALLBACK_THRESHOLD, MINIMUM_UNIQUE_PAINS)
+METRICS_PROMETHEUS_PATH = None       # Prometheus text dump written after each run (None = off)
+MAX_ANGLE_SHARE = 0.5                # WARN if one angle takes more than this share of leads
+STAGE_P95_BUDGET_MS = {}             # {stage: ms}; WARN if a stage's p95 latency exceeds it
+
+# Score-Before-Write Gating (provisional CSE tier decides who gets an LLM email)
+EMAIL_GATE_MIN_TIER = None           # "A" or "B": lower provisional tiers skip the LLM (None = off)
+EMAIL_GATE_FALLBACK = "template"     # Gated-out leads get a "template" email or "none"
+
+# Provider Simulation (offline load testing, see loadtest.py)
+SIM_SEED = 42                        # Same seed + same leads = same latencies and faults
+SIM_TIME_SCALE = 1.0                 # Multiplier on simulated sleeps (0 = record latency without sleeping)
+SIM_ENDPOINTS = {
+    # latency: constant {ms} | uniform {min_ms, max_ms} | normal {mean_ms, std_ms}
+    #          | lognormal {median_ms, sigma} | pareto {scale_ms, alpha}
+    "llm_tier1": {
+        "latency": {"dist": "lognormal", "median_ms": 400, "sigma": 0.5},
+        "ms_per_token": 15.0,        # Generation time per completion token
+        "ms_per_prompt_token": 0.2,
+        "error_rate": 0.02, "error_statuses": [500, 502, 503],
+        "timeout_rate": 0.005, "timeout_s": 60.0,
+        "rate_limit_rate": 0.03, "retry_after_s": 1.0,
+    },
+    "llm_tier2": {
+        "latency": {"dist": "lognormal", "median_ms": 200, "sigma": 0.4},
+        "ms_per_token": 5.0,
+        "ms_per_prompt_token": 0.1,
+        "error_rate": 0.01, "error_statuses": [500, 503],
+        "timeout_rate": 0.002, "timeout_s": 60.0,
+        "rate_limit_rate": 0.02, "retry_after_s": 1.0,
+    },
+    "brightdata_company": {
+        "latency": {"dist": "pareto", "scale_ms": 600, "alpha": 2.5},
+        "error_rate": 0.01, "error_statuses": [500, 502],
+        "timeout_rate": 0.005, "timeout_s": 30.0,
+        "rate_limit_rate": 0.02, "retry_after_s": 2.0,
+    },
+    "brightdata_jobs": {
+        "latency": {"dist": "pareto", "scale_ms": 400, "alpha": 2.5},
+        "error_rate": 0.01, "error_statuses": [500, 502],
+        "timeout_rate": 0.005, "timeout_s": 30.0,
+        "rate_limit_rate": 0.02, "retry_after_s": 2.0,
+    },
+}
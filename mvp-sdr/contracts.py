@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class AngleSignals(BaseModel):
     delivery_pressure: str
@@ -47,8 +47,16 @@ class EmailOutput(BaseModel):
             "body": self.body,
             "angle_used": self.angle_used,
             "tokens": self.tokens,
-            "email": f"Subject: {self.subject}\n\n{self.body}"
+            "email": f"Subject: {self.subject}\n\n{self.body}" if self.body else ""
         }
 
     def dict(self, *args, **kwargs):
         return self.to_dict()
+
+class MonitoringReport(BaseModel):
+    status: str                      # "PASS" | "WARN" | "FAIL"
+    metrics: Dict[str, Any] = {}
+    reasons: List[str] = []
+
+    def to_dict(self):
+        return {"status": self.status, "metrics": self.metrics, "reasons": self.reasons}
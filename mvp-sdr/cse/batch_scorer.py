@@ -0,0 +1,398 @@
+"""
+CSE Batch Scorer Module
+Vectorized scoring for many leads at once.
+Normalized signals form a (leads x signals) NumPy matrix; weighted scores,
+penalties, conflicts, confidence and tiers are computed with array operations.
+Accumulation order matches the per-lead path, so results are identical.
+score_profiles() scores the same matrix under several weight profiles
+(A/B experiments) without re-normalizing. raw_fields()/apply_fallbacks()
+let stored agent outputs be rescored without building RawContexts.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cse.config import (
+    WEIGHT_PROFILES, ACTIVE_WEIGHT_PROFILE, PENALTY_RULES, NORMALIZATION_RULES,
+    CONFLICT_DEFINITIONS, CONFIDENCE_WEIGHTS, TIER_THRESHOLDS, TIERS, FALLBACK_RULES
+)
+from cse.conflict_resolver import CONFLICT_RULESET
+from cse.schema import RawContext
+
+# Same key order as CSEEngine._normalize_signals
+SIGNAL_COLUMNS = [
+    "headcount",
+    "stress_signals",
+    "enrichment_quality",
+    "pain_strength",
+    "angle_relevance",
+    "personalization_depth",
+    "email_quality",
+    "domain_complexity",
+    "org_health",
+]
+COLUMN_INDEX = {name: i for i, name in enumerate(SIGNAL_COLUMNS)}
+
+
+class SignalMatrix:
+    """Normalized signals for a batch of leads (after fallbacks)"""
+
+    def __init__(self, values: np.ndarray, present: np.ndarray, headcount: np.ndarray,
+                 churn_rate: np.ndarray, primary_pains: List[str]):
+        self.values = values                # float64 (n x signals), 0.0 where absent
+        self.present = present              # bool (n x signals)
+        self.headcount = headcount          # raw inputs read by conflict rules (NaN = missing)
+        self.churn_rate = churn_rate
+        self.primary_pains = primary_pains
+
+    def conflict_columns(self) -> Dict[str, object]:
+        """Columns for ConflictResolver.resolve_batch (see conflict_inputs)"""
+        return {
+            "headcount": self.headcount,
+            "churn_rate": self.churn_rate,
+            "primary_pain": self.primary_pains,
+            "domain_complexity": self.column("domain_complexity"),
+            "personalization_depth": self.column("personalization_depth"),
+            "org_health": self.column("org_health"),
+        }
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, COLUMN_INDEX[name]]
+
+    def row_dict(self, i: int) -> Dict[str, float]:
+        """Signals of one lead as the dict the per-lead path builds"""
+        return {
+            name: float(self.values[i, j])
+            for j, name in enumerate(SIGNAL_COLUMNS) if self.present[i, j]
+        }
+
+    @classmethod
+    def from_signal_dicts(cls, signal_dicts: List[Dict[str, float]]) -> "SignalMatrix":
+        """
+        Matrix from stored normalized signals (e.g. trace "normalized_signals").
+        Raw conflict inputs are not stored there: pass the stored conflict
+        penalties to BatchScorer.score_profiles instead of re-evaluating rules.
+        """
+        n = len(signal_dicts)
+        values = np.zeros((n, len(SIGNAL_COLUMNS)))
+        present = np.zeros((n, len(SIGNAL_COLUMNS)), dtype=bool)
+        for i, signals in enumerate(signal_dicts):
+            for name, value in signals.items():
+                j = COLUMN_INDEX[name]
+                values[i, j] = value
+                present[i, j] = True
+        return cls(values, present, np.full(n, np.nan), np.full(n, np.nan), [""] * n)
+
+    @classmethod
+    def from_contexts(cls, contexts: List[RawContext]) -> "SignalMatrix":
+        """Build the matrix from RawContexts that already have fallbacks applied"""
+        return cls.from_raw(raw_arrays([raw_fields(ctx) for ctx in contexts]))
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "SignalMatrix":
+        """Build the matrix from raw agent fields (see raw_arrays) after apply_fallbacks"""
+        headcount = raw["headcount"]
+        open_roles = raw["open_roles"]
+        has_brightdata = raw["has_brightdata"]
+        has_enrichment = raw["has_enrichment"]
+        pain_count = np.nan_to_num(raw["pain_count"], nan=0.0)
+        has_angle = raw["has_angle"]
+        has_email = raw["has_email"]
+        # personalization_depth or 0.5, as in the per-lead path
+        personalization = raw["personalization"]
+        personalization = np.where(np.isnan(personalization) | (personalization == 0), 0.5, personalization)
+        n = len(headcount)
+
+        values = np.zeros((n, len(SIGNAL_COLUMNS)))
+        present = np.ones((n, len(SIGNAL_COLUMNS)), dtype=bool)
+
+        # Normalize (same rules as SignalNormalizer)
+        col = COLUMN_INDEX
+        values[:, col["headcount"]] = _normalize(np.nan_to_num(headcount, nan=0.0), "headcount", np.isnan(headcount))
+        ratio_missing = np.isnan(open_roles) | np.isnan(headcount) | (headcount == 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(ratio_missing, 0.0, open_roles / np.where(ratio_missing, 1.0, headcount))
+        values[:, col["stress_signals"]] = _normalize(ratio, "open_roles_ratio", ratio_missing)
+        present[:, col["headcount"]] = has_brightdata
+        present[:, col["stress_signals"]] = has_brightdata
+
+        values[:, col["enrichment_quality"]] = np.where(has_enrichment, 0.7, 0.0)  # Placeholder
+        present[:, col["enrichment_quality"]] = has_enrichment
+
+        values[:, col["pain_strength"]] = np.minimum(1.0, pain_count / 5.0)
+        values[:, col["angle_relevance"]] = np.where(has_angle, 0.8, 0.0)  # Placeholder
+        values[:, col["personalization_depth"]] = np.where(has_email, personalization, 0.0)
+        values[:, col["email_quality"]] = np.where(has_email, 0.7, 0.0)  # Placeholder
+        values[:, col["domain_complexity"]] = 0.5
+        values[:, col["org_health"]] = 0.7
+
+        values[~present] = 0.0
+
+        return cls(values, present, headcount, raw["churn_rate"], raw["primary_pains"])
+
+
+# ===== RAW AGENT FIELDS =====
+
+# What the CSE reads from a RawContext, one value per field (None = missing)
+RAW_FIELDS = (
+    "has_brightdata",
+    "raw_headcount",
+    "raw_open_roles",
+    "raw_churn_rate",
+    "has_enrichment",
+    "pain_candidates",        # count; None when PainProfiler returned nothing
+    "primary_pain",
+    "selected_angle",
+    "has_email",
+    "personalization_depth",
+)
+
+
+def raw_fields(ctx: RawContext) -> Tuple:
+    """RAW_FIELDS values of one context (taken before fallbacks to store, after them to score)"""
+    bd, pain, email = ctx.brightdata, ctx.pain, ctx.email
+    return (
+        bd is not None,
+        bd.raw_headcount if bd else None,
+        bd.raw_open_roles if bd else None,
+        bd.raw_churn_rate if bd else None,
+        ctx.enrichment is not None,
+        len(pain.pain_candidates) if pain else None,
+        pain.primary_pain if pain else None,
+        ctx.angle.selected_angle if ctx.angle else None,
+        email is not None,
+        email.personalization_depth if email else None,
+    )
+
+
+def raw_arrays(rows: List[Tuple]) -> Dict[str, Any]:
+    """Column arrays from RAW_FIELDS tuples (or rows of the same columns read from storage)"""
+    columns = list(zip(*rows)) if rows else [()] * len(RAW_FIELDS)
+    return {
+        "has_brightdata": np.array(columns[0], dtype=bool),
+        "headcount": np.array(columns[1], dtype=float),     # None -> NaN
+        "open_roles": np.array(columns[2], dtype=float),
+        "churn_rate": np.array(columns[3], dtype=float),
+        "has_enrichment": np.array(columns[4], dtype=bool),
+        "pain_count": np.array(columns[5], dtype=float),
+        "primary_pains": list(columns[6]),
+        "has_angle": np.array([bool(angle) for angle in columns[7]], dtype=bool),
+        "has_email": np.array(columns[8], dtype=bool),
+        "personalization": np.array(columns[9], dtype=float),
+    }
+
+
+def apply_fallbacks(raw: Dict[str, Any]) -> np.ndarray:
+    """
+    Vectorized CSEEngine._apply_fallbacks: fills defaults into the raw
+    arrays in place and returns each lead's total fallback penalty.
+    """
+    n = len(raw["headcount"])
+    fallback_penalty = np.zeros(n)
+
+    missing = ~raw["has_brightdata"]
+    rule = FALLBACK_RULES["missing_brightdata"]
+    fallback_penalty = fallback_penalty + np.where(missing, rule["penalty"], 0.0)
+    raw["has_brightdata"] = raw["has_brightdata"] | missing
+    raw["headcount"] = np.where(missing, rule["default_headcount"], raw["headcount"])
+    raw["open_roles"] = np.where(missing, rule["default_open_roles"], raw["open_roles"])
+    raw["churn_rate"] = np.where(missing, np.nan, raw["churn_rate"])
+
+    pain_count = raw["pain_count"]
+    missing = np.isnan(pain_count) | (pain_count == 0)
+    rule = FALLBACK_RULES["missing_pain"]
+    fallback_penalty = fallback_penalty + np.where(missing, rule["penalty"], 0.0)
+    raw["pain_count"] = np.where(missing, len(rule["default_candidates"]), pain_count)
+    raw["primary_pains"] = [
+        rule["default_pain"] if is_missing else pain
+        for is_missing, pain in zip(missing.tolist(), raw["primary_pains"])
+    ]
+
+    missing = ~raw["has_angle"]
+    rule = FALLBACK_RULES["missing_angle"]
+    fallback_penalty = fallback_penalty + np.where(missing, rule["penalty"], 0.0)
+    raw["has_angle"] = raw["has_angle"] | missing
+
+    return fallback_penalty
+
+
+def _normalize(raw: np.ndarray, rule_name: str, missing: np.ndarray) -> np.ndarray:
+    rules = NORMALIZATION_RULES.get(rule_name, {})
+    min_val = rules.get("min", 0)
+    max_val = rules.get("max", 1)
+    if max_val == min_val:
+        normalized = np.full(raw.shape, 0.5)
+    else:
+        normalized = (np.clip(raw, min_val, max_val) - min_val) / (max_val - min_val)
+    return np.where(missing, 0.0, normalized)
+
+
+class BatchScorer:
+    """Computes scores, penalties, conflicts, confidence and tiers for a SignalMatrix"""
+
+    def __init__(self, weight_profile: str = None):
+        self.weight_profile = weight_profile or ACTIVE_WEIGHT_PROFILE
+        self.weights = WEIGHT_PROFILES[self.weight_profile]
+
+    def score(self, signals: SignalMatrix, fallback_penalty: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Returns a dict of per-lead arrays:
+        weighted (n x weights), raw_score, penalties (name -> array), total_penalty,
+        conflicts (name -> bool array), conflict_penalty, final_score, confidence
+        components, avg_confidence, min_confidence, confidence_variance, tier.
+        """
+        n = len(signals)
+        if fallback_penalty is None:
+            fallback_penalty = np.zeros(n)
+
+        # 1. Weighted score (accumulated in weight order, like LeadScorer)
+        weighted, raw_score = _weighted_score(signals, self.weights)
+
+        # 2. Penalties for missing or weak signals
+        penalties, total_penalty = _penalties(signals)
+        scored = np.maximum(0, raw_score - (total_penalty * 100))
+
+        # 3. Conflicts (compiled rules, evaluated over the whole batch)
+        conflicts, conflict_penalty = _conflicts(signals)
+
+        # 4. Final score
+        final_score = _final_score(scored, conflict_penalty, fallback_penalty)
+
+        # 5. Confidence (same composition as ConfidenceCalculator)
+        total_signals = signals.present.sum(axis=1)
+        present_signals = ((signals.values > 0.1) & signals.present).sum(axis=1)
+        availability = np.where(total_signals > 0, present_signals / np.maximum(total_signals, 1), 0.0)
+        agreement = np.ones(n)
+        consistency = np.maximum(0.0, 1.0 - conflict_penalty)
+        quality_sum = np.zeros(n)
+        for j in range(signals.values.shape[1]):
+            quality_sum = quality_sum + signals.values[:, j]
+        quality = np.where(total_signals > 0, quality_sum / np.maximum(total_signals, 1), 0.0)
+
+        w = CONFIDENCE_WEIGHTS
+        avg_confidence = (
+            availability * w["availability"] +
+            agreement * w["agreement"] +
+            consistency * w["consistency"] +
+            quality * w["quality"] -
+            conflict_penalty * w["conflict_penalty"]
+        )
+        avg_confidence = np.clip(avg_confidence, 0.0, 1.0)
+        has_fallback = fallback_penalty > 0
+        avg_confidence = np.where(has_fallback, np.maximum(0, avg_confidence * (1 - fallback_penalty)), avg_confidence)
+
+        min_confidence = np.minimum(np.minimum(availability, agreement), np.minimum(consistency, quality))
+        mean = (availability + agreement + consistency + quality) / 4
+        variance = (
+            (availability - mean) ** 2 + (agreement - mean) ** 2 +
+            (consistency - mean) ** 2 + (quality - mean) ** 2
+        ) / 4
+
+        # 6. Tier
+        tier = assign_tiers(final_score)
+
+        return {
+            "weighted": weighted,
+            "raw_score": raw_score,
+            "penalties": penalties,
+            "total_penalty": total_penalty,
+            "scored": scored,
+            "conflicts": conflicts,
+            "conflict_penalty": conflict_penalty,
+            "final_score": final_score,
+            "availability": availability,
+            "agreement": agreement,
+            "consistency": consistency,
+            "quality": quality,
+            "avg_confidence": avg_confidence,
+            "min_confidence": min_confidence,
+            "confidence_variance": variance,
+            "tier": tier,
+        }
+
+    def score_profiles(self, signals: SignalMatrix, fallback_penalty: Optional[np.ndarray] = None,
+                       conflict_penalty: Optional[np.ndarray] = None,
+                       profiles: Optional[List[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Final score and tier of every lead under several weight profiles
+        (default: all of WEIGHT_PROFILES). Penalties, conflicts and fallbacks
+        do not depend on the weights and are computed once; only the weighted
+        sum is repeated per profile.
+        conflict_penalty: stored per-lead conflict penalties (evaluated from
+        the signals when None).
+        Returns {profile: {"final_score": array, "tier": array}}.
+        """
+        n = len(signals)
+        if fallback_penalty is None:
+            fallback_penalty = np.zeros(n)
+        if conflict_penalty is None:
+            _, conflict_penalty = _conflicts(signals)
+        _, total_penalty = _penalties(signals)
+
+        results = {}
+        for profile in profiles or WEIGHT_PROFILES:
+            if profile not in WEIGHT_PROFILES:
+                raise ValueError(f"Unknown weight profile: {profile}")
+            _, raw_score = _weighted_score(signals, WEIGHT_PROFILES[profile])
+            scored = np.maximum(0, raw_score - (total_penalty * 100))
+            final_score = _final_score(scored, conflict_penalty, fallback_penalty)
+            results[profile] = {"final_score": final_score, "tier": assign_tiers(final_score)}
+        return results
+
+
+# ===== SHARED STEPS (same order of operations as the per-lead path) =====
+
+def _weighted_score(signals: SignalMatrix, weights: Dict[str, float]):
+    n = len(signals)
+    weighted = np.empty((n, len(weights)))
+    raw_score = np.zeros(n)
+    for j, (signal_name, weight) in enumerate(weights.items()):
+        weighted[:, j] = signals.column(signal_name) * weight
+        raw_score = raw_score + weighted[:, j]
+    return weighted, raw_score * 100
+
+
+def _penalties(signals: SignalMatrix):
+    penalties = {
+        "missing_enrichment": signals.column("enrichment_quality") < 0.3,
+        "missing_pain": signals.column("pain_strength") < 0.2,
+        "missing_angle": signals.column("angle_relevance") < 0.2,
+    }
+    total_penalty = np.zeros(len(signals))
+    for name, applied in penalties.items():
+        total_penalty = total_penalty + np.where(applied, PENALTY_RULES[name], 0.0)
+    return penalties, total_penalty
+
+
+def _conflicts(signals: SignalMatrix):
+    matches = CONFLICT_RULESET.match_batch(signals.conflict_columns())
+    conflicts = {name: matches[:, j] for j, name in enumerate(CONFLICT_RULESET.names)}
+    conflict_penalty = np.zeros(len(signals))
+    for name, detected in conflicts.items():
+        conflict_penalty = conflict_penalty + np.where(detected, CONFLICT_DEFINITIONS[name]["penalty"], 0.0)
+    return conflicts, conflict_penalty
+
+
+def _final_score(scored: np.ndarray, conflict_penalty: np.ndarray, fallback_penalty: np.ndarray) -> np.ndarray:
+    final_score = scored - (conflict_penalty * 100)
+    final_score = final_score - (fallback_penalty * 100)
+    return np.clip(final_score, 0, 100)
+
+
+def assign_tiers(final_score: np.ndarray) -> np.ndarray:
+    # Lowest tier everywhere, then each higher threshold overrides
+    tiers = np.full(final_score.shape, TIERS[-1])
+    for tier in reversed(TIERS[:-1]):
+        tiers = np.where(final_score >= TIER_THRESHOLDS[tier], tier, tiers)
+    return tiers
+
+
+def tier_migration(from_tiers: np.ndarray, to_tiers: np.ndarray) -> Dict[str, int]:
+    """Leads per tier change, e.g. {"C->B": 12, "C->C": 80} (sorted)"""
+    pairs, counts = np.unique(np.char.add(np.char.add(from_tiers.astype(str), "->"), to_tiers.astype(str)),
+                              return_counts=True)
+    return {str(pair): int(count) for pair, count in zip(pairs, counts)}
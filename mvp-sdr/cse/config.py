@@ -57,24 +57,49 @@ NORMALIZATION_RULES = {
 }
 
 # ===== CONFLICT RULES =====
+# Declarative conflicts compiled by tools.rule_engine.RuleSet.
+# Condition fields: normalized signals plus raw inputs
+# (headcount, primary_pain, churn_rate from BrightData / PainProfiler).
+# Rules with "enabled": False are declared but never evaluated.
+CHURN_CONFLICT_MIN_RATE = 0.2  # Churn rate treated as "high" once churn_vs_org_health is enabled
 CONFLICT_DEFINITIONS = {
     "size_vs_pain": {
         "description": "Startup size but Enterprise pain",
         "severity": "moderate",
         "penalty": 0.15,
+        "match": "all",
+        "conditions": [
+            ("headcount", "<", 50),
+            ("primary_pain", "contains", ["enterprise", "scale"]),
+        ],
     },
     "complexity_vs_personalization": {
         "description": "High complexity but weak personalization",
         "severity": "minor",
         "penalty": 0.10,
+        "match": "all",
+        "conditions": [
+            ("domain_complexity", ">", 0.7),
+            ("personalization_depth", "<", 0.4),
+        ],
     },
     "churn_vs_org_health": {
         "description": "High churn but healthy org signal",
         "severity": "severe",
         "penalty": 0.25,
+        # Inert until org_health is a real signal (it is a constant 0.7 today,
+        # so this would fire on churn alone)
+        "enabled": False,
+        "match": "all",
+        "conditions": [
+            ("churn_rate", ">=", CHURN_CONFLICT_MIN_RATE),
+            ("org_health", ">", 0.6),
+        ],
     },
 }
 
+SEVERITY_ORDER = ["none", "minor", "moderate", "severe"]
+
 # ===== PENALTY RULES =====
 PENALTY_RULES = {
     "missing_enrichment": 0.10,
@@ -89,6 +114,8 @@ TIER_THRESHOLDS = {
     "B": 55,  # Good leads, queue
     "C": 0,   # Optional or deprioritized
 }
+# Tier names, best first
+TIERS = tuple(sorted(TIER_THRESHOLDS, key=TIER_THRESHOLDS.get, reverse=True))
 
 # ===== CONFIDENCE COMPOSITION WEIGHTS =====
 CONFIDENCE_WEIGHTS = {
@@ -102,6 +129,14 @@ CONFIDENCE_WEIGHTS = {
 # ===== PERFORMANCE CONSTRAINTS =====
 MAX_CSE_LATENCY_MS = 20  # CSE must add < 20ms per lead
 
+# ===== PROVENANCE =====
+# Lineage detail kept per lead: "off" | "summary" (agents + final score) | "full"
+PROVENANCE_VERBOSITY = "full"
+
+# ===== TRACE =====
+# Trace kept on each CSEResult: "off" | "summary" (no explanations) | "full"
+CSE_TRACE_LEVEL = "full"
+
 # ===== FALLBACK RULES =====
 # Define behavior when agents fail or return incomplete data
 FALLBACK_RULES = {
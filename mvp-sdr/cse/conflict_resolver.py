@@ -1,89 +1,91 @@
 """
 CSE Conflict Resolver Module
 Detects contradictions and assigns penalties.
+Conflicts are declared in CONFLICT_DEFINITIONS and compiled into a RuleSet.
 """
 
-from typing import Dict, List, Tuple
-from cse.config import CONFLICT_DEFINITIONS
+from typing import Any, Dict, List
+
+import numpy as np
+
+from cse.config import CONFLICT_DEFINITIONS, SEVERITY_ORDER
 from cse.provenance import ProvenanceTracker
+from tools.rule_engine import RuleSet
+
+# Compiled once per process (enabled conflicts only)
+CONFLICT_RULESET = RuleSet([{"name": name, **definition} for name, definition in CONFLICT_DEFINITIONS.items()
+                            if definition.get("enabled", True)])
+
+
+def conflict_inputs(normalized_signals: Dict[str, float], raw_context: dict) -> Dict[str, Any]:
+    """Fields the conflict rules read, with the resolver's defaults"""
+    brightdata = raw_context.get("brightdata") or {}
+    pain = raw_context.get("pain") or {}
+    return {
+        "headcount": brightdata.get("raw_headcount", 100),
+        "churn_rate": brightdata.get("raw_churn_rate"),
+        "primary_pain": pain.get("primary_pain", ""),
+        "domain_complexity": normalized_signals.get("domain_complexity", 0.5),
+        "personalization_depth": normalized_signals.get("personalization_depth", 0.5),
+        "org_health": normalized_signals.get("org_health", 0.0),
+    }
+
 
 class ConflictResolver:
     """Detects and resolves signal contradictions"""
-    
-    def __init__(self, provenance: ProvenanceTracker):
+
+    def __init__(self, provenance: ProvenanceTracker, ruleset: RuleSet = CONFLICT_RULESET):
         self.provenance = provenance
+        self.rules = ruleset
         self.conflicts = []
-        
-    def check_size_vs_pain(self, headcount: int, pain_type: str) -> Tuple[bool, float, str]:
-        """Check for contradiction between company size and pain type"""
-        is_startup = headcount < 50
-        is_enterprise_pain = "enterprise" in pain_type.lower() or "scale" in pain_type.lower()
-        
-        if is_startup and is_enterprise_pain:
-            conflict_def = CONFLICT_DEFINITIONS["size_vs_pain"]
-            return True, conflict_def["penalty"], conflict_def["description"]
-        return False, 0.0, ""
-        
-    def check_complexity_vs_personalization(self, complexity: float, personalization: float) -> Tuple[bool, float, str]:
-        """Check for contradiction between complexity and personalization depth"""
-        if complexity > 0.7 and personalization < 0.4:
-            conflict_def = CONFLICT_DEFINITIONS["complexity_vs_personalization"]
-            return True, conflict_def["penalty"], conflict_def["description"]
-        return False, 0.0, ""
-        
+
     def resolve_all(self, normalized_signals: Dict[str, float], raw_context: dict) -> Dict[str, any]:
         """
         Detect all conflicts and return conflict report.
         Returns: {
             "conflicts": [...],
             "total_penalty": float,
-            "severity": "minor" | "moderate" | "severe"
+            "severity": "none" | "minor" | "moderate" | "severe",
+            "count": int
         }
         """
+        matched = self.rules.match_one(conflict_inputs(normalized_signals, raw_context))
+        report = self.build_report(matched)
+        self.conflicts = report["conflicts"]
+        return report
+
+    def resolve_batch(self, columns: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate every conflict over a batch at once.
+        columns: {field: sequence} for the fields in conflict_inputs()
+        Returns a boolean (leads x conflicts) matrix in CONFLICT_DEFINITIONS order (enabled ones).
+        """
+        return self.rules.match_batch(columns)
+
+    def build_report(self, matched_rules: List[Dict[str, Any]]) -> Dict[str, any]:
+        """Conflict report for the matched rules (in definition order)"""
         conflicts_found = []
         total_penalty = 0.0
         max_severity = "none"
-        
-        # Check size vs pain
-        headcount = raw_context.get("brightdata", {}).get("raw_headcount", 100)
-        pain_type = raw_context.get("pain", {}).get("primary_pain", "")
-        
-        has_conflict, penalty, description = self.check_size_vs_pain(headcount, pain_type)
-        if has_conflict:
-            conflicts_found.append({
-                "type": "size_vs_pain",
-                "description": description,
-                "penalty": penalty,
-                "severity": "moderate"
-            })
-            total_penalty += penalty
-            max_severity = "moderate"
-            
-        # Check complexity vs personalization
-        complexity = normalized_signals.get("domain_complexity", 0.5)
-        personalization = normalized_signals.get("personalization_depth", 0.5)
-        
-        has_conflict, penalty, description = self.check_complexity_vs_personalization(complexity, personalization)
-        if has_conflict:
+
+        for rule in matched_rules:
             conflicts_found.append({
-                "type": "complexity_vs_personalization",
-                "description": description,
-                "penalty": penalty,
-                "severity": "minor"
+                "type": rule["name"],
+                "description": rule["description"],
+                "penalty": rule["penalty"],
+                "severity": rule["severity"]
             })
-            total_penalty += penalty
-            if max_severity == "none":
-                max_severity = "minor"
-                
-        self.conflicts = conflicts_found
-        
+            total_penalty += rule["penalty"]
+            if SEVERITY_ORDER.index(rule["severity"]) > SEVERITY_ORDER.index(max_severity):
+                max_severity = rule["severity"]
+
         return {
             "conflicts": conflicts_found,
             "total_penalty": total_penalty,
             "severity": max_severity,
             "count": len(conflicts_found)
         }
-        
+
     def get_conflicts(self) -> List[Dict]:
         """Get all detected conflicts"""
         return self.conflicts
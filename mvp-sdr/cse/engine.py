@@ -4,18 +4,20 @@ Main coordinator that orchestrates all CSE layers.
 """
 
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
+import numpy as np
 from cse.schema import RawContext
 from cse.config import (
-    SCORING_VERSION, EXPLAINABILITY_VERSION, CONFIG_VERSION, CSE_ENGINE_VERSION,
-    TIER_THRESHOLDS
+    TIER_THRESHOLDS, PENALTY_RULES, PROVENANCE_VERBOSITY, CSE_TRACE_LEVEL
 )
-from cse.provenance import ProvenanceTracker
+from cse.provenance import ProvenanceTracker, LineageStore
 from cse.normalizer import SignalNormalizer
 from cse.conflict_resolver import ConflictResolver
 from cse.scorer import LeadScorer
 from cse.confidence import ConfidenceCalculator
 from cse.explainer import Explainer
+from cse.batch_scorer import SignalMatrix, BatchScorer
+from cse.result import CSEResult, LazyTrace, TRACE_LEVELS
 
 class CSEEngine:
     """
@@ -24,26 +26,35 @@ class CSEEngine:
     scoring, confidence, and explainability.
     """
     
-    def __init__(self, weight_profile: str = None):
+    def __init__(self, weight_profile: str = None, provenance_verbosity: str = PROVENANCE_VERBOSITY,
+                 trace_level: str = CSE_TRACE_LEVEL):
+        if trace_level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level '{trace_level}' (expected one of {TRACE_LEVELS})")
         self.weight_profile = weight_profile
-        self.provenance = ProvenanceTracker()
+        self.trace_level = trace_level
+        self.provenance_verbosity = provenance_verbosity
+        # One tracker, scoped per lead (begin_lead() at the start of process())
+        self.provenance = ProvenanceTracker(provenance_verbosity)
         self.normalizer = SignalNormalizer(self.provenance)
         self.conflict_resolver = ConflictResolver(self.provenance)
         self.scorer = LeadScorer(self.provenance, weight_profile)
         self.confidence_calculator = ConfidenceCalculator()
         self.explainer = Explainer()
+        self.batch_scorer = BatchScorer(weight_profile)
         
-    def process(self, raw_context: RawContext) -> Dict[str, Any]:
+    def process(self, raw_context: RawContext) -> CSEResult:
         """
         Main processing pipeline.
-        Takes raw context, returns scored and explained result.
+        Takes raw context, returns a scored CSEResult; trace sections
+        (explanations included) are built when accessed.
         """
         start_time = time.time()
         
         # Track fallbacks applied
         fallbacks_applied = []
         
-        # 1. Record agent outputs in provenance
+        # 1. Record agent outputs in provenance (fresh lineage for this lead)
+        self.provenance.begin_lead()
         self._record_agent_outputs(raw_context)
         
         # 2. Apply fallbacks for missing data
@@ -86,7 +97,7 @@ class CSEEngine:
         # 7. Determine tier
         tier = self._determine_tier(final_score)
         
-        # 8. Generate explanations
+        # 8. Generate summary explanation (full explanation is built lazily)
         primary_pain = raw_context.pain.primary_pain if raw_context.pain else "Unknown"
         selected_angle = raw_context.angle.selected_angle if raw_context.angle else "Unknown"
         rejected_angles = raw_context.angle.rejected_angles if raw_context.angle else []
@@ -95,16 +106,6 @@ class CSEEngine:
             final_score, tier, primary_pain, selected_angle, confidence
         )
         
-        full_explanation = self.explainer.generate_full_explanation(
-            normalized_signals,
-            score_breakdown["weighted_signals"],
-            conflict_report,
-            confidence,
-            score_breakdown,
-            tier,
-            rejected_angles
-        )
-        
         # 9. Record final score in provenance
         self.provenance.record_final_score(final_score, tier, confidence["avg_confidence"])
         
@@ -112,44 +113,168 @@ class CSEEngine:
         processing_time_ms = (time.time() - start_time) * 1000
         
         # 11. Assemble result
-        result = {
-            "lead_score": final_score,
-            "priority_tier": tier,
-            "avg_confidence": confidence["avg_confidence"],
-            "min_confidence": confidence["min_confidence"],
-            "explanation_summary": summary_explanation,
-            "data_quality_flag": "OK" if confidence["avg_confidence"] > 0.6 else "LOW",
-            
-            # Full trace
-            "trace": {
-                "lineage": self.provenance.get_lineage(),
-                "normalized_signals": normalized_signals,
-                "weighted_signals": score_breakdown["weighted_signals"],
-                "conflicts": conflict_report,
-                "confidence": confidence,
-                "score_breakdown": score_breakdown,
-                "tier_justification": full_explanation["tier_justification"],
-                "full_explanation": full_explanation,
-                "fallbacks_applied": fallbacks_applied,
-                "metrics": {
-                    "processing_time_ms": processing_time_ms,
-                    "missing_signals": sum(1 for v in normalized_signals.values() if v < 0.1),
-                    "conflict_count": conflict_report["count"],
-                    "conflict_severity": conflict_report["severity"],
-                    "confidence_variance": confidence["confidence_variance"],
-                    "fallback_count": len(fallbacks_applied)
-                },
-                "versions": {
-                    "cse_engine": CSE_ENGINE_VERSION,
-                    "scoring": SCORING_VERSION,
-                    "explainability": EXPLAINABILITY_VERSION,
-                    "config": CONFIG_VERSION
-                }
-            }
-        }
+        result = self._assemble_result(
+            final_score, tier, confidence, summary_explanation, self.provenance.store,
+            normalized_signals, score_breakdown, conflict_report, rejected_angles,
+            fallbacks_applied, processing_time_ms
+        )
         
         return result
     
+    def process_batch(self, contexts: List[RawContext], include_trace: bool = False) -> List[CSEResult]:
+        """
+        Vectorized processing for many leads.
+        Same scores, tiers, confidence and summary as process(); the full
+        trace (lineage, explanations) is only built when include_trace=True.
+        """
+        start_time = time.time()
+        
+        # 1. Apply fallbacks per lead (agent outputs are recorded first, as in process())
+        fallbacks = []
+        provenances = []
+        for raw_context in contexts:
+            if include_trace:
+                provenance = ProvenanceTracker(self.provenance_verbosity)
+                self._record_agent_outputs(raw_context, provenance)
+                provenances.append(provenance)
+            fallbacks_applied = []
+            self._apply_fallbacks(raw_context, fallbacks_applied)
+            fallbacks.append(fallbacks_applied)
+        fallback_penalty = np.array([sum(f["penalty"] for f in applied) for applied in fallbacks], dtype=float)
+        
+        # 2. Normalize into a (leads x signals) matrix and score it
+        signals = SignalMatrix.from_contexts(contexts)
+        scores = self.batch_scorer.score(signals, fallback_penalty)
+        
+        final_scores = scores["final_score"].tolist()
+        tiers = scores["tier"].tolist()
+        avg_confidences = scores["avg_confidence"].tolist()
+        min_confidences = scores["min_confidence"].tolist()
+        
+        # 3. Compact results (summary only)
+        results = []
+        for i, raw_context in enumerate(contexts):
+            evidence_confidence = {"avg_confidence": avg_confidences[i]}
+            results.append(CSEResult(
+                lead_score=final_scores[i],
+                priority_tier=tiers[i],
+                avg_confidence=avg_confidences[i],
+                min_confidence=min_confidences[i],
+                explanation_summary=self.explainer.generate_summary(
+                    final_scores[i], tiers[i], raw_context.pain.primary_pain,
+                    raw_context.angle.selected_angle, evidence_confidence
+                ),
+                data_quality_flag="OK" if avg_confidences[i] > 0.6 else "LOW"
+            ))
+        
+        # 4. Trace on request (sections still materialize lazily)
+        if include_trace:
+            processing_time_ms = (time.time() - start_time) * 1000 / max(1, len(contexts))
+            for i, raw_context in enumerate(contexts):
+                results[i].trace = self._batch_trace(
+                    i, raw_context, signals, scores, fallbacks[i], provenances[i], processing_time_ms
+                )
+        
+        return results
+    
+    def score_profiles(self, contexts: List[RawContext], profiles: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Scores and tiers under several weight profiles (default: all of
+        WEIGHT_PROFILES) in one vectorized pass; signals are normalized once.
+        Returns {profile: {"final_score": array, "tier": array}}.
+        """
+        fallbacks = []
+        for raw_context in contexts:
+            fallbacks_applied = []
+            self._apply_fallbacks(raw_context, fallbacks_applied)
+            fallbacks.append(fallbacks_applied)
+        fallback_penalty = np.array([sum(f["penalty"] for f in applied) for applied in fallbacks], dtype=float)
+        return self.batch_scorer.score_profiles(SignalMatrix.from_contexts(contexts), fallback_penalty,
+                                                profiles=profiles)
+
+    def _batch_trace(self, i: int, raw_context: RawContext, signals: SignalMatrix,
+                     scores: Dict[str, Any], fallbacks_applied: list, provenance: ProvenanceTracker,
+                     processing_time_ms: float) -> LazyTrace:
+        """Rebuild the per-lead trace that process() produces from batch arrays"""
+        normalized_signals = signals.row_dict(i)
+        weighted_signals = {
+            name: float(scores["weighted"][i, j]) for j, name in enumerate(self.batch_scorer.weights)
+        }
+        penalties = {
+            name: PENALTY_RULES[name] for name, applied in scores["penalties"].items() if applied[i]
+        }
+        fallback_penalty = sum(f["penalty"] for f in fallbacks_applied)
+        final_score = float(scores["final_score"][i])
+        tier = str(scores["tier"][i])
+        
+        conflict_report = self.conflict_resolver.build_report([
+            rule for rule in self.conflict_resolver.rules.rules if scores["conflicts"][rule["name"]][i]
+        ])
+        
+        availability = float(scores["availability"][i])
+        consistency = float(scores["consistency"][i])
+        quality = float(scores["quality"][i])
+        confidence = {
+            "availability": availability,
+            "agreement": float(scores["agreement"][i]),
+            "consistency": consistency,
+            "quality": quality,
+            "conflict_penalty": conflict_report["total_penalty"],
+            "avg_confidence": float(scores["avg_confidence"][i]),
+            "min_confidence": float(scores["min_confidence"][i]),
+            "confidence_variance": float(scores["confidence_variance"][i]),
+            "justification": self.confidence_calculator._build_justification(
+                availability, consistency, quality, conflict_report
+            )
+        }
+        
+        score_breakdown = {
+            "weighted_signals": weighted_signals,
+            "raw_score": float(scores["raw_score"][i]),
+            "penalties": penalties,
+            "total_penalty": float(scores["total_penalty"][i]),
+            "final_score": final_score,
+            "fallback_penalty": fallback_penalty
+        }
+        
+        # Lineage for this lead only
+        bd = raw_context.brightdata
+        provenance.record_normalization("headcount", bd.raw_headcount, normalized_signals["headcount"])
+        if bd.raw_open_roles is None or bd.raw_headcount is None or bd.raw_headcount == 0:
+            provenance.record_normalization("open_roles_ratio", f"{bd.raw_open_roles}/{bd.raw_headcount}", 0.0)
+        else:
+            provenance.record_normalization("open_roles_ratio", bd.raw_open_roles / bd.raw_headcount,
+                                            normalized_signals["stress_signals"])
+        for signal_name, weight in self.batch_scorer.weights.items():
+            provenance.record_weighting(signal_name, normalized_signals.get(signal_name, 0.0),
+                                        weight, weighted_signals[signal_name])
+        provenance.record_final_score(final_score, tier, confidence["avg_confidence"])
+        
+        return LazyTrace(
+            "full", provenance.store, normalized_signals, score_breakdown, conflict_report,
+            confidence, tier, raw_context.angle.rejected_angles, fallbacks_applied, processing_time_ms
+        )
+    
+    def _assemble_result(self, final_score: float, tier: str, confidence: Dict, summary_explanation: str,
+                         lineage: LineageStore, normalized_signals: Dict[str, float], score_breakdown: Dict,
+                         conflict_report: Dict, rejected_angles: List[str], fallbacks_applied: list,
+                         processing_time_ms: float) -> CSEResult:
+        trace = None
+        if self.trace_level != "off":
+            trace = LazyTrace(
+                self.trace_level, lineage, normalized_signals, score_breakdown, conflict_report,
+                confidence, tier, rejected_angles, fallbacks_applied, processing_time_ms
+            )
+        return CSEResult(
+            lead_score=final_score,
+            priority_tier=tier,
+            avg_confidence=confidence["avg_confidence"],
+            min_confidence=confidence["min_confidence"],
+            explanation_summary=summary_explanation,
+            data_quality_flag="OK" if confidence["avg_confidence"] > 0.6 else "LOW",
+            trace=trace
+        )
+    
     def _apply_fallbacks(self, raw_context: RawContext, fallbacks_applied: list) -> RawContext:
         """Apply fallback logic for missing data"""
         from cse.config import FALLBACK_RULES
@@ -198,23 +323,19 @@ class CSEEngine:
         
         return raw_context
         
-    def _record_agent_outputs(self, raw_context: RawContext):
+    def _record_agent_outputs(self, raw_context: RawContext, provenance: ProvenanceTracker = None):
         """Record all agent outputs in provenance"""
+        provenance = provenance or self.provenance
         if raw_context.brightdata:
-            self.provenance.record_agent_output("BrightDataEnrichmentAgent", 
-                                               raw_context.brightdata.dict())
+            provenance.record_agent_output("BrightDataEnrichmentAgent", raw_context.brightdata)
         if raw_context.enrichment:
-            self.provenance.record_agent_output("EnrichmentAgent", 
-                                               raw_context.enrichment.dict())
+            provenance.record_agent_output("EnrichmentAgent", raw_context.enrichment)
         if raw_context.pain:
-            self.provenance.record_agent_output("PainProfiler", 
-                                               raw_context.pain.dict())
+            provenance.record_agent_output("PainProfiler", raw_context.pain)
         if raw_context.angle:
-            self.provenance.record_agent_output("AngleRouter", 
-                                               raw_context.angle.dict())
+            provenance.record_agent_output("AngleRouter", raw_context.angle)
         if raw_context.email:
-            self.provenance.record_agent_output("EmailWriter", 
-                                               raw_context.email.dict())
+            provenance.record_agent_output("EmailWriter", raw_context.email)
             
     def _normalize_signals(self, raw_context: RawContext) -> Dict[str, float]:
         """Normalize all raw signals to 0-1 scale"""
@@ -0,0 +1,122 @@
+"""
+CSE Profile Comparison Module
+Rescores stored leads under every weight profile without rerunning agents.
+Reads pipeline traces (pipeline_trace.json or pipeline_trace.jsonl, trace
+level summary or full): normalized signals, conflict penalties and fallbacks
+come from each trace, and one vectorized pass scores all profiles. JSONL
+traces are streamed; only the per-lead signals are kept.
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from cse.config import WEIGHT_PROFILES, ACTIVE_WEIGHT_PROFILE, TIERS
+from cse.batch_scorer import SignalMatrix, BatchScorer, tier_migration
+
+
+def load_traces(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Trace entries, one at a time: JSONL is read line by line; a JSON array
+    (pipeline_trace.json) has to be parsed whole first.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+class ProfileComparison:
+    """Per-lead scores and tiers under several profiles, compared to a baseline"""
+
+    def __init__(self, lead_names: List[str], lead_companies: List[str],
+                 scores: Dict[str, Dict[str, np.ndarray]], baseline: str):
+        self.lead_names = lead_names
+        self.lead_companies = lead_companies
+        self.scores = scores
+        self.baseline = baseline
+
+    @classmethod
+    def from_traces(cls, entries: Iterable[Dict[str, Any]], profiles: Optional[List[str]] = None,
+                    baseline: str = ACTIVE_WEIGHT_PROFILE) -> "ProfileComparison":
+        """Score trace entries (any iterable, e.g. load_traces) in one pass over them"""
+        profiles = list(profiles or WEIGHT_PROFILES)
+        if baseline not in profiles:
+            profiles.insert(0, baseline)
+
+        names, companies, signal_dicts = [], [], []
+        conflict_penalty, fallback_penalty = [], []
+        for entry in entries:
+            trace = entry.get("trace") or {}
+            if "normalized_signals" not in trace:
+                raise ValueError(
+                    f"Trace for {entry.get('lead_name')} has no normalized signals "
+                    "(rerun the pipeline with --trace-level summary or full)"
+                )
+            names.append(entry.get("lead_name", ""))
+            companies.append(entry.get("lead_company", ""))
+            signal_dicts.append(trace["normalized_signals"])
+            conflict_penalty.append(trace["conflicts"]["total_penalty"])
+            fallback_penalty.append(sum(f["penalty"] for f in trace["fallbacks_applied"]))
+
+        scores = BatchScorer().score_profiles(
+            SignalMatrix.from_signal_dicts(signal_dicts),
+            np.array(fallback_penalty, dtype=float), np.array(conflict_penalty, dtype=float), profiles
+        )
+        return cls(names, companies, scores, baseline)
+
+    def __len__(self):
+        return len(self.lead_names)
+
+    # ===== SUMMARY =====
+
+    def tier_counts(self) -> Dict[str, Dict[str, int]]:
+        return {
+            profile: {tier: int(np.count_nonzero(result["tier"] == tier)) for tier in TIERS}
+            for profile, result in self.scores.items()
+        }
+
+    def migration(self) -> Dict[str, Dict[str, int]]:
+        """Tier changes of every profile relative to the baseline"""
+        baseline_tiers = self.scores[self.baseline]["tier"]
+        return {
+            profile: tier_migration(baseline_tiers, result["tier"])
+            for profile, result in self.scores.items() if profile != self.baseline
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "leads": len(self),
+            "baseline": self.baseline,
+            "tier_counts": self.tier_counts(),
+            "migration": self.migration(),
+        }
+
+    # ===== EXPORT =====
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """One row per lead with score_<profile> and tier_<profile> columns"""
+        columns = {
+            profile: (result["final_score"].tolist(), result["tier"].tolist())
+            for profile, result in self.scores.items()
+        }
+        for i, (name, company) in enumerate(zip(self.lead_names, self.lead_companies)):
+            row = {"lead_name": name, "lead_company": company}
+            for profile, (scores, tiers) in columns.items():
+                row[f"score_{profile}"] = round(scores[i], 2)
+                row[f"tier_{profile}"] = tiers[i]
+            yield row
+
+    def write_csv(self, path: str):
+        fieldnames = ["lead_name", "lead_company"]
+        for profile in self.scores:
+            fieldnames += [f"score_{profile}", f"tier_{profile}"]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(self.rows())
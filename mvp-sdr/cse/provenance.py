@@ -1,74 +1,138 @@
 """
 CSE Provenance Module
 Tracks data lineage: Agent -> Raw -> Normalized -> Weighted -> Score
+
+Lineage is scoped per lead (begin_lead() starts a new store) and kept in a compact
+columnar store: interned stage/name ids, monotonic integer timestamps (ns)
+and one payload tuple per entry. Dicts are only built by get_lineage().
+
+Verbosity:
+- "off":     nothing is recorded
+- "summary": agent outputs (without data) and the final score
+- "full":    every transformation, including agent output data
 """
 
-from datetime import datetime
-from typing import Dict, Any, List
+import time
+from array import array
+from typing import Dict, Any, List, Optional
+
+from cse.config import PROVENANCE_VERBOSITY
+
+VERBOSITY_LEVELS = ("off", "summary", "full")
+
+# Payload field names per stage (the columns of each entry)
+STAGE_FIELDS = {
+    "agent_output": ("agent", ("version", "data")),
+    "normalization": ("signal", ("raw_value", "normalized_value")),
+    "weighting": ("signal", ("normalized_value", "weight", "weighted_value")),
+    "penalty": ("signal", ("original_value", "penalty", "adjusted_value", "reason")),
+    "final_score": (None, ("score", "tier", "confidence")),
+}
+
+# Process-wide intern table: stage, agent and signal names -> small ints
+_NAME_IDS: Dict[str, int] = {}
+_NAMES: List[Optional[str]] = []
+
+
+def _intern(name: Optional[str]) -> int:
+    name_id = _NAME_IDS.get(name)
+    if name_id is None:
+        name_id = len(_NAMES)
+        _NAME_IDS[name] = name_id
+        _NAMES.append(name)
+    return name_id
+
+
+class LineageStore:
+    """Columnar lineage entries for one lead"""
+
+    __slots__ = ("stage_ids", "name_ids", "timestamps", "payloads")
 
-class ProvenanceTracker:
-    """Tracks the complete lineage of signals through the CSE pipeline"""
-    
     def __init__(self):
-        self.lineage = []
-        
-    def record_agent_output(self, agent_name: str, raw_data: Dict[str, Any], version: str = "1.0.0"):
-        """Record raw output from an agent"""
-        self.lineage.append({
-            "stage": "agent_output",
-            "agent": agent_name,
-            "version": version,
-            "timestamp": datetime.now().isoformat(),
-            "data": raw_data
-        })
-        
+        self.stage_ids = array("H")
+        self.name_ids = array("H")
+        self.timestamps = array("q")
+        self.payloads = []
+
+    def append(self, stage: str, name: Optional[str], payload: tuple):
+        self.stage_ids.append(_intern(stage))
+        self.name_ids.append(_intern(name))
+        self.timestamps.append(time.monotonic_ns())
+        self.payloads.append(payload)
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def entry(self, i: int) -> Dict[str, Any]:
+        stage = _NAMES[self.stage_ids[i]]
+        name_field, payload_fields = STAGE_FIELDS[stage]
+        entry = {"stage": stage}
+        if name_field:
+            entry[name_field] = _NAMES[self.name_ids[i]]
+        for field, value in zip(payload_fields, self.payloads[i]):
+            # Agent output data is stored by reference and serialized here
+            if field == "data" and hasattr(value, "dict"):
+                value = value.dict()
+            entry[field] = value
+        entry["timestamp"] = self.timestamps[i]
+        return entry
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [self.entry(i) for i in range(len(self))]
+
+
+class ProvenanceTracker:
+    """Tracks the lineage of signals through the CSE pipeline, one lead at a time"""
+
+    def __init__(self, verbosity: str = PROVENANCE_VERBOSITY):
+        if verbosity not in VERBOSITY_LEVELS:
+            raise ValueError(f"Unknown provenance verbosity '{verbosity}' (expected one of {VERBOSITY_LEVELS})")
+        self.verbosity = verbosity
+        self._summary = verbosity in ("summary", "full")
+        self._full = verbosity == "full"
+        self.store = LineageStore()
+
+    def begin_lead(self):
+        """Start a new lead scope (the previous lead's store is left to its result)"""
+        self.store = LineageStore()
+
+    def record_agent_output(self, agent_name: str, raw_data: Any, version: str = "1.0.0"):
+        """Record raw output from an agent (a dict or a pydantic model)"""
+        if self._summary:
+            self.store.append("agent_output", agent_name, (version, raw_data if self._full else None))
+
     def record_normalization(self, signal_name: str, raw_value: Any, normalized_value: float):
         """Record a normalization transformation"""
-        self.lineage.append({
-            "stage": "normalization",
-            "signal": signal_name,
-            "raw_value": raw_value,
-            "normalized_value": normalized_value,
-            "timestamp": datetime.now().isoformat()
-        })
-        
+        if self._full:
+            self.store.append("normalization", signal_name, (raw_value, normalized_value))
+
     def record_weighting(self, signal_name: str, normalized_value: float, weight: float, weighted_value: float):
         """Record a weighting transformation"""
-        self.lineage.append({
-            "stage": "weighting",
-            "signal": signal_name,
-            "normalized_value": normalized_value,
-            "weight": weight,
-            "weighted_value": weighted_value,
-            "timestamp": datetime.now().isoformat()
-        })
-        
+        if self._full:
+            self.store.append("weighting", signal_name, (normalized_value, weight, weighted_value))
+
     def record_penalty(self, signal_name: str, original_value: float, penalty: float, adjusted_value: float, reason: str):
         """Record a penalty adjustment"""
-        self.lineage.append({
-            "stage": "penalty",
-            "signal": signal_name,
-            "original_value": original_value,
-            "penalty": penalty,
-            "adjusted_value": adjusted_value,
-            "reason": reason,
-            "timestamp": datetime.now().isoformat()
-        })
-        
+        if self._full:
+            self.store.append("penalty", signal_name, (original_value, penalty, adjusted_value, reason))
+
     def record_final_score(self, score: float, tier: str, confidence: float):
         """Record the final score and tier"""
-        self.lineage.append({
-            "stage": "final_score",
-            "score": score,
-            "tier": tier,
-            "confidence": confidence,
-            "timestamp": datetime.now().isoformat()
-        })
-        
+        if self._summary:
+            self.store.append("final_score", None, (score, tier, confidence))
+
     def get_lineage(self) -> List[Dict[str, Any]]:
-        """Get the complete lineage"""
-        return self.lineage
-        
+        """Get the current lead's lineage"""
+        return self.store.to_list()
+
     def get_derivation_chain(self, signal_name: str) -> List[Dict[str, Any]]:
         """Get the derivation chain for a specific signal"""
-        return [entry for entry in self.lineage if entry.get("signal") == signal_name]
+        name_id = _NAME_IDS.get(signal_name)
+        if name_id is None:
+            return []
+        signal_stages = {_NAME_IDS[stage] for stage, (name_field, _) in STAGE_FIELDS.items()
+                         if name_field == "signal" and stage in _NAME_IDS}
+        return [
+            self.store.entry(i) for i in range(len(self.store))
+            if self.store.name_ids[i] == name_id and self.store.stage_ids[i] in signal_stages
+        ]
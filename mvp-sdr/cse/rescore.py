@@ -0,0 +1,65 @@
+"""
+CSE Rescore Module
+Replays the CSE layers (fallbacks, normalization, penalties, conflicts,
+weights, tiers) over leads kept in a SignalStore, under the current
+cse/config.py. No agents are called; the store is read in one streaming pass.
+"""
+
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from cse.config import WEIGHT_PROFILES, ACTIVE_WEIGHT_PROFILE, SCORING_VERSION, CONFIG_VERSION, TIERS
+from cse.batch_scorer import BatchScorer, SignalMatrix, apply_fallbacks, tier_migration
+
+
+def rescore(store, run_id: Optional[str] = None, profiles: Optional[List[str]] = None,
+            batch_size: int = 50000, save: bool = True) -> Dict[str, Any]:
+    """
+    Rescore stored leads (all runs, or one run_id) under each profile
+    (default: the active one). With save=True results are written to the
+    store's rescores table, keyed by SCORING_VERSION and CONFIG_VERSION.
+    Returns tier counts, tier migration from the stored tiers and the
+    number of leads whose tier changed, per profile.
+    """
+    profiles = list(profiles or [ACTIVE_WEIGHT_PROFILE])
+    for profile in profiles:
+        if profile not in WEIGHT_PROFILES:
+            raise ValueError(f"Unknown weight profile: {profile}")
+
+    scorer = BatchScorer()
+    start = time.perf_counter()
+    leads = 0
+    tier_counts = {profile: Counter() for profile in profiles}
+    migration = {profile: Counter() for profile in profiles}
+    score_delta = {profile: 0.0 for profile in profiles}
+
+    for batch in store.iter_batches(run_id=run_id, batch_size=batch_size):
+        raw = batch["raw"]
+        fallback_penalty = apply_fallbacks(raw)
+        scores = scorer.score_profiles(SignalMatrix.from_raw(raw), fallback_penalty, profiles=profiles)
+        leads += len(batch["ids"])
+
+        for profile, result in scores.items():
+            tier_counts[profile].update(result["tier"].tolist())
+            migration[profile].update(tier_migration(batch["priority_tier"], result["tier"]))
+            score_delta[profile] += float(np.abs(result["final_score"] - batch["lead_score"]).sum())
+            if save:
+                store.save_rescores(batch["ids"], profile, result["final_score"], result["tier"])
+
+    return {
+        "leads": leads,
+        "run_id": run_id,
+        "scoring_version": SCORING_VERSION,
+        "config_version": CONFIG_VERSION,
+        "stored_versions": sorted({(r["scoring_version"], r["config_version"]) for r in store.runs()
+                                   if run_id is None or r["run_id"] == run_id}),
+        "tier_counts": {p: {tier: counts[tier] for tier in TIERS} for p, counts in tier_counts.items()},
+        "migration": {p: dict(sorted(moves.items())) for p, moves in migration.items()},
+        "tier_changes": {p: sum(n for move, n in moves.items() if move[0] != move[-1])
+                         for p, moves in migration.items()},
+        "mean_abs_score_delta": {p: round(total / leads, 4) if leads else 0.0 for p, total in score_delta.items()},
+        "seconds": round(time.perf_counter() - start, 3),
+    }
@@ -0,0 +1,189 @@
+"""
+CSE Result Module
+Lightweight result returned by CSEEngine.
+Summary fields (the CSV columns) are computed eagerly; trace sections are
+built on first access and cached, so runs that never read the trace skip
+explanation work entirely.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional
+
+from cse.config import (
+    SCORING_VERSION, EXPLAINABILITY_VERSION, CONFIG_VERSION, CSE_ENGINE_VERSION
+)
+from cse.explainer import Explainer
+from cse.provenance import LineageStore
+
+# "off": no trace | "summary": scores, signals, lineage (no explanations) | "full": everything
+TRACE_LEVELS = ("off", "summary", "full")
+
+TRACE_SECTIONS = (
+    "lineage",
+    "normalized_signals",
+    "weighted_signals",
+    "conflicts",
+    "confidence",
+    "score_breakdown",
+    "tier_justification",
+    "full_explanation",
+    "fallbacks_applied",
+    "metrics",
+    "versions",
+)
+EXPLANATION_SECTIONS = ("tier_justification", "full_explanation")
+
+
+class LazyTrace(Mapping):
+    """Read-only trace whose sections are materialized on access"""
+
+    def __init__(self, level: str, lineage: LineageStore, normalized_signals: Dict[str, float],
+                 score_breakdown: Dict, conflict_report: Dict, confidence: Dict, tier: str,
+                 rejected_angles: List[str], fallbacks_applied: list, processing_time_ms: float):
+        self.level = level
+        self._lineage = lineage
+        self._normalized_signals = normalized_signals
+        self._score_breakdown = score_breakdown
+        self._conflict_report = conflict_report
+        self._confidence = confidence
+        self._tier = tier
+        self._rejected_angles = rejected_angles
+        self._fallbacks_applied = fallbacks_applied
+        self._processing_time_ms = processing_time_ms
+        self._sections = {}
+
+    # ===== MAPPING =====
+
+    def _section_names(self):
+        if self.level == "full":
+            return TRACE_SECTIONS
+        return tuple(name for name in TRACE_SECTIONS if name not in EXPLANATION_SECTIONS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._sections:
+            if key not in self._section_names():
+                raise KeyError(key)
+            self._sections[key] = getattr(self, f"_build_{key}")()
+        return self._sections[key]
+
+    def __iter__(self):
+        return iter(self._section_names())
+
+    def __len__(self):
+        return len(self._section_names())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize every section (for JSON export)"""
+        return {name: self[name] for name in self}
+
+    # ===== SECTION BUILDERS =====
+
+    def _build_lineage(self):
+        return self._lineage.to_list()
+
+    def _build_normalized_signals(self):
+        return self._normalized_signals
+
+    def _build_weighted_signals(self):
+        return self._score_breakdown["weighted_signals"]
+
+    def _build_conflicts(self):
+        return self._conflict_report
+
+    def _build_confidence(self):
+        return self._confidence
+
+    def _build_score_breakdown(self):
+        return self._score_breakdown
+
+    def _build_tier_justification(self):
+        return self["full_explanation"]["tier_justification"]
+
+    def _build_full_explanation(self):
+        return Explainer().generate_full_explanation(
+            self._normalized_signals,
+            self._score_breakdown["weighted_signals"],
+            self._conflict_report,
+            self._confidence,
+            self._score_breakdown,
+            self._tier,
+            self._rejected_angles
+        )
+
+    def _build_fallbacks_applied(self):
+        return self._fallbacks_applied
+
+    def _build_metrics(self):
+        return {
+            "processing_time_ms": self._processing_time_ms,
+            "missing_signals": sum(1 for v in self._normalized_signals.values() if v < 0.1),
+            "conflict_count": self._conflict_report["count"],
+            "conflict_severity": self._conflict_report["severity"],
+            "confidence_variance": self._confidence["confidence_variance"],
+            "fallback_count": len(self._fallbacks_applied)
+        }
+
+    def _build_versions(self):
+        return {
+            "cse_engine": CSE_ENGINE_VERSION,
+            "scoring": SCORING_VERSION,
+            "explainability": EXPLAINABILITY_VERSION,
+            "config": CONFIG_VERSION
+        }
+
+
+class CSEResult(Mapping):
+    """
+    Scored lead. Reads like the former result dict:
+    result["lead_score"], result["trace"]["conflicts"], ...
+    The "trace" key is only present when a trace was kept.
+    """
+
+    SUMMARY_FIELDS = (
+        "lead_score",
+        "priority_tier",
+        "avg_confidence",
+        "min_confidence",
+        "explanation_summary",
+        "data_quality_flag",
+    )
+
+    __slots__ = SUMMARY_FIELDS + ("trace",)
+
+    def __init__(self, lead_score: float, priority_tier: str, avg_confidence: float,
+                 min_confidence: float, explanation_summary: str, data_quality_flag: str,
+                 trace: Optional[LazyTrace] = None):
+        self.lead_score = lead_score
+        self.priority_tier = priority_tier
+        self.avg_confidence = avg_confidence
+        self.min_confidence = min_confidence
+        self.explanation_summary = explanation_summary
+        self.data_quality_flag = data_quality_flag
+        self.trace = trace
+
+    def _keys(self):
+        return self.SUMMARY_FIELDS if self.trace is None else self.SUMMARY_FIELDS + ("trace",)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __repr__(self):
+        return f"CSEResult(lead_score={self.lead_score!r}, priority_tier={self.priority_tier!r})"
+
+    def trace_dict(self) -> Dict[str, Any]:
+        """Plain-dict trace for export ({} when no trace was kept)"""
+        return self.trace.to_dict() if self.trace is not None else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {field: getattr(self, field) for field in self.SUMMARY_FIELDS}
+        if self.trace is not None:
+            result["trace"] = self.trace.to_dict()
+        return result
@@ -18,6 +18,7 @@ class BrightDataOutput(BaseModel):
     raw_industry: Optional[str] = None
     raw_tech_stack: Optional[List[str]] = None
     raw_org_structure: Optional[Dict] = None
+    raw_churn_rate: Optional[float] = None
 
 class AngleRouterOutput(BaseModel):
     """Raw output from AngleRouter"""
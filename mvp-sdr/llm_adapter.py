@@ -2,13 +2,43 @@ import json
 import os
 from llm_client import LLMClient
 from mock_llm_provider import MockLLMProvider
+from tools.enrichment_memo import get_enrichment_memo, MOCK_SOURCE
+from tools.logger import get_logger
+
+log = get_logger("llm")
+
+ENRICHMENT_PROMPT = "Extract company_category, product_type, business_model and angle_signals as JSON.\n\n{profile}"
 
 class LLMAdapter:
-    def __init__(self):
-        self.client = LLMClient()
-        self.mock_provider = MockLLMProvider()
+    def __init__(self, client=None, mock_provider=None, enrichment_memo=None, async_client=None):
+        # Injected by AgentContext (built once per worker); standalone use builds its own
+        self.client = client or LLMClient()
+        self.mock_provider = mock_provider or MockLLMProvider()
         # Default to MOCK_MODE = True for Phase 5
         self.mock_mode = os.getenv("MOCK_MODE", "True").lower() == "true"
+        # Async client is built on first acall() (binds to the running loop);
+        # an injected one (e.g. SimulatedLLMClient) is used even in mock mode
+        self.async_client = async_client
+        # Enrichment memo shared with EnrichmentAgent
+        self.enrichment_memo = enrichment_memo or get_enrichment_memo()
+
+    def _select_model(self, tier):
+        if tier == "tier1":
+            return "gpt-4-turbo" # or claude-3-opus
+        return "gpt-3.5-turbo" # or claude-3-haiku
+
+    def _parse(self, response_str, schema):
+        """Parse Output (if schema expected)"""
+        if schema:
+            try:
+                # In a real implementation, we'd use structured output mode.
+                # Here we just try to parse the mock JSON.
+                return json.loads(response_str)
+            except json.JSONDecodeError:
+                # Fallback or Error
+                log.error("Error parsing JSON from LLM: %s", response_str)
+                return {}
+        return response_str
         
     def call(self, prompt, tier="tier2", schema=None, system_prompt="You are a helpful assistant."):
         """
@@ -29,10 +59,7 @@ class LLMAdapter:
             return response_str
 
         # 1. Select Model based on Tier
-        if tier == "tier1":
-            model = "gpt-4-turbo" # or claude-3-opus
-        else:
-            model = "gpt-3.5-turbo" # or claude-3-haiku
+        model = self._select_model(tier)
             
         # 2. Construct Messages
         messages = [
@@ -44,14 +71,43 @@ class LLMAdapter:
         response_str = self.client.call(model, messages, schema)
         
         # 4. Parse Output (if schema expected)
-        if schema:
-            try:
-                # In a real implementation, we'd use structured output mode.
-                # Here we just try to parse the mock JSON.
-                return json.loads(response_str)
-            except json.JSONDecodeError:
-                # Fallback or Error
-                print(f"Error parsing JSON from LLM: {response_str}")
-                return {}
-                
-        return response_str
+        return self._parse(response_str, schema)
+
+    def enrich(self, title, company, bio, tier="tier2"):
+        """
+        Enrichment JSON for one lead, memoized on normalized title + company + bio.
+        Keys carry the model, so switching models never serves stale entries.
+        """
+        if self.mock_mode:
+            # Same entries as the EnrichmentAgent direct mock path
+            source = MOCK_SOURCE
+            compute = lambda: json.loads(self.mock_provider._mock_enrichment(f"{title} at {company}. {bio}"))
+        else:
+            source = self._select_model(tier)
+            prompt = ENRICHMENT_PROMPT.format(profile=f"{title} at {company}. {bio}")
+            compute = lambda: self.call(prompt, tier=tier, schema=True)
+        return self.enrichment_memo.get_or_compute(title, company, bio, source, compute)
+
+    async def acall(self, prompt, tier="tier2", schema=None, system_prompt="You are a helpful assistant."):
+        """
+        Async version of call(): awaits AsyncLLMClient so many leads' LLM
+        calls overlap (bounded per tier, rate limited, retried).
+        """
+        if self.async_client is None:
+            if self.mock_mode:
+                # Mock is instant and deterministic; same result as call()
+                return self.call(prompt, tier=tier, schema=schema, system_prompt=system_prompt)
+            from async_llm_client import AsyncLLMClient
+            self.async_client = AsyncLLMClient()
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        response_str = await self.async_client.call(self._select_model(tier), messages, schema, tier=tier)
+        return self._parse(response_str, schema)
+
+    async def aclose(self):
+        """Close the pooled HTTP session (call before the event loop ends)."""
+        if self.async_client is not None:
+            await self.async_client.close()
@@ -1,44 +1,67 @@
-import sqlite3
 import json
 import time
 import os
 import hashlib
 from datetime import datetime
+from tools.sqlite_cache import SQLiteCache
+from tools.tiered_cache import TieredCache, get_shared_cache
+from tools.logger import get_jsonl_writer
+from config.settings import (
+    LLM_MEMORY_CACHE_SIZE, LLM_LOG_CACHE_HITS, LLM_LOG_QUEUE_SIZE, LLM_LOG_FLUSH_INTERVAL,
+    LLM_LOG_MAX_BYTES, LLM_LOG_ROTATE_INTERVAL, LLM_LOG_COMPRESS, LLM_LOG_BACKUP_COUNT
+)
 
 class LLMClient:
-    def __init__(self, cache_db="cache.db", log_file="logs/llm_logs.jsonl"):
+    def __init__(self, cache_db="cache.db", log_file="logs/llm_logs.jsonl", log_cache_hits=LLM_LOG_CACHE_HITS):
         self.cache_db = cache_db
         self.log_file = log_file
-        self._init_db()
+        self.log_cache_hits = log_cache_hits
+        # Memory LRU for repeated prompts in front of the SQLite tier.
+        # Responses are stored as raw strings (not JSON-encoded), with the
+        # model and write time in the table's model / timestamp columns.
+        self.cache = get_shared_cache(f"llm:{os.path.abspath(cache_db)}", lambda: TieredCache(
+            SQLiteCache(cache_db, key_column="hash", value_column="response",
+                        encode=str, decode=str, extra_columns={"model": "TEXT", "timestamp": "REAL"}),
+            memory_capacity=LLM_MEMORY_CACHE_SIZE
+        ))
         self._init_logs()
 
-    def _init_db(self):
-        conn = sqlite3.connect(self.cache_db)
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS cache
-                     (hash TEXT PRIMARY KEY, response TEXT, model TEXT, timestamp REAL)''')
-        conn.commit()
-        conn.close()
-
     def _init_logs(self):
-        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        # Background writer shared by every client logging to this file:
+        # bounded queue, batched writes, size/time rotation with gzip
+        self.log_writer = get_jsonl_writer(
+            self.log_file, max_bytes=LLM_LOG_MAX_BYTES, rotate_interval=LLM_LOG_ROTATE_INTERVAL,
+            compress=LLM_LOG_COMPRESS, backup_count=LLM_LOG_BACKUP_COUNT,
+            max_queue=LLM_LOG_QUEUE_SIZE, flush_interval=LLM_LOG_FLUSH_INTERVAL
+        )
 
     def _get_cache_key(self, model, messages, schema=None):
         # Create a deterministic hash of the input
         data = json.dumps({"model": model, "messages": messages, "schema": schema}, sort_keys=True)
         return hashlib.sha256(data.encode()).hexdigest()
 
-    def _log(self, model, messages, response, cache_hit, latency):
+    def _log(self, model, messages, response, cache_hit, latency, cache_key=None):
+        if cache_hit and self.log_cache_hits == "off":
+            return
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "model": model,
             "cache_hit": cache_hit,
             "latency_ms": round(latency * 1000, 2),
-            "messages": messages,
-            "response": response
         }
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        if cache_hit and self.log_cache_hits == "hash":
+            # The prompt hash is the cache key: the full response stays in cache.db
+            log_entry["prompt_hash"] = cache_key or self._get_cache_key(model, messages)
+            log_entry["response_hash"] = hashlib.sha256(str(response).encode()).hexdigest()
+        else:
+            log_entry["messages"] = messages
+            log_entry["response"] = response
+        # Serialized and written on the writer thread
+        self.log_writer.emit(log_entry)
+
+    def flush_logs(self):
+        """Block until every queued log entry is on disk."""
+        self.log_writer.flush()
 
     def call(self, model, messages, schema=None):
         """
@@ -46,31 +69,22 @@ class LLMClient:
         """
         cache_key = self._get_cache_key(model, messages, schema)
         
-        # 1. Check Cache
-        conn = sqlite3.connect(self.cache_db)
-        c = conn.cursor()
-        c.execute("SELECT response FROM cache WHERE hash=?", (cache_key,))
-        row = c.fetchone()
-        conn.close()
+        # 1. Check Cache (memory, then disk)
+        cached = self.cache.get(cache_key)
 
-        if row:
-            self._log(model, messages, row[0], True, 0)
-            return row[0]
+        if cached is not None:
+            self._log(model, messages, cached, True, 0, cache_key)
+            return cached
 
         # 2. Call Provider (MOCK for now)
         start_time = time.time()
         response = self._mock_provider(model, messages, schema)
         latency = time.time() - start_time
 
-        # 3. Save to Cache
-        conn = sqlite3.connect(self.cache_db)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", 
-                  (cache_key, response, model, time.time()))
-        conn.commit()
-        conn.close()
+        # 3. Save to Cache (written back to disk asynchronously)
+        self.cache.put(cache_key, response, columns={"model": model, "timestamp": time.time()})
 
-        self._log(model, messages, response, False, latency)
+        self._log(model, messages, response, False, latency, cache_key)
         return response
 
     def _mock_provider(self, model, messages, schema):
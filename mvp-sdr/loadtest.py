@@ -0,0 +1,148 @@
+"""
+Offline load test: the full pipeline against ProviderSimulator.
+
+LLM and BrightData calls get seeded latencies, 5xx, timeouts and 429s
+(profiles: SIM_ENDPOINTS in config/settings.py); everything else (caches,
+retries, backoff, fallbacks, CSE) runs as in production. Same seed and
+arguments = same faults, so throughput and tail latency can be compared
+across commits.
+
+    python loadtest.py                                  # 1000 leads, real-time latencies
+    python loadtest.py --leads 20000 --time-scale 0.01  # 100x faster clock
+    python loadtest.py --seed 7 --output loadtest.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("MOCK_MODE", "True")
+
+from agent_context import AgentContext
+from async_llm_client import SimulatedLLMClient
+from llm_adapter import LLMAdapter
+from llm_client import LLMClient
+from pipeline_executor import PipelineExecutor
+from tools import logger
+from tools.brightdata_client import BrightDataClient
+from tools.enrichment_memo import get_enrichment_memo
+from tools.provider_simulator import ProviderSimulator
+from config.settings import (
+    SIM_SEED, SIM_TIME_SCALE, PIPELINE_WORKERS, EMAIL_BATCH_SIZE,
+    LLM_RATE_LIMIT, LLM_RATE_BURST, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline against simulated providers")
+    parser.add_argument("--input", default="leads.csv", help="Template leads (cycled to --leads rows)")
+    parser.add_argument("--leads", type=int, default=1000, help="Number of leads to run")
+    parser.add_argument("--companies", type=int, default=None,
+                        help="Distinct companies (default: one per lead, i.e. no BrightData cache hits)")
+    parser.add_argument("--seed", type=int, default=SIM_SEED, help="Simulator seed")
+    parser.add_argument("--time-scale", type=float, default=SIM_TIME_SCALE,
+                        help="Multiplier on simulated latencies (0.01 = 100x faster, 0 = no sleeping)")
+    parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS, help="Leads in flight")
+    parser.add_argument("--email-batch-size", type=int, default=EMAIL_BATCH_SIZE,
+                        help="Leads per batched email prompt (0 or 1 = one prompt per lead)")
+    parser.add_argument("--output", metavar="PATH", default=None, help="Write the report to this JSON file")
+    return parser.parse_args()
+
+
+def synthesize_leads(template, n, companies=None):
+    """n unique leads cycling the template rows; names and companies get a numeric suffix"""
+    companies = max(1, companies or n)
+    for i in range(n):
+        lead = dict(template[i % len(template)])
+        lead["name"] = f"{lead['name']} {i}"
+        lead["company"] = f"{lead['company']} {i % companies}"
+        yield lead
+
+
+def build_context(simulator, workdir, time_scale):
+    """AgentContext whose providers are simulated and whose caches live in workdir (cold every run)"""
+    cache_db = os.path.join(workdir, "cache.db")
+    log_file = os.path.join(workdir, "llm_logs.jsonl")
+    memo = get_enrichment_memo(cache_db)
+    # Client-side waits follow the simulated clock too
+    scale = time_scale if time_scale > 0 else 1e-6
+    async_client = SimulatedLLMClient(
+        simulator, cache_db=cache_db, log_file=log_file,
+        rate_limit=LLM_RATE_LIMIT / scale, burst=LLM_RATE_BURST,
+        backoff_base=LLM_BACKOFF_BASE * time_scale, backoff_max=LLM_BACKOFF_MAX * time_scale,
+    )
+    llm_client = LLMClient(cache_db=cache_db, log_file=log_file)
+    return AgentContext(
+        llm_client=llm_client,
+        llm_adapter=LLMAdapter(client=llm_client, enrichment_memo=memo, async_client=async_client),
+        enrichment_memo=memo,
+        brightdata_client=BrightDataClient(cache_db=os.path.join(workdir, "brightdata_cache.db"),
+                                           simulator=simulator),
+    )
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.input):
+        print(f"Error: {args.input} not found.")
+        return
+    with open(args.input, newline="", encoding="utf-8") as f:
+        template = list(csv.DictReader(f))
+
+    logger.configure(level="WARN")
+    simulator = ProviderSimulator(seed=args.seed, time_scale=args.time_scale)
+
+    with tempfile.TemporaryDirectory(prefix="sdr-loadtest-") as workdir:
+        context = build_context(simulator, workdir, args.time_scale)
+        # CSE inline: the benchmark measures provider-bound throughput
+        executor = PipelineExecutor(workers=args.workers, cse_processes=0,
+                                    email_batch_size=args.email_batch_size, context=context)
+        print(f"Load test: {args.leads} leads, {args.workers} worker(s), seed {args.seed}, "
+              f"time scale {args.time_scale}...")
+        start = time.perf_counter()
+        executor.run_streaming(synthesize_leads(template, args.leads, args.companies), lambda row, trace: None,
+                               total=args.leads)
+        elapsed = time.perf_counter() - start
+        snapshot = executor.metrics.snapshot()
+        usage = dict(context.llm_adapter.async_client.usage)
+
+    report = {
+        "leads": args.leads,
+        "seed": args.seed,
+        "time_scale": args.time_scale,
+        "workers": args.workers,
+        "wall_seconds": round(elapsed, 3),
+        "leads_per_second": round(args.leads / elapsed, 3) if elapsed > 0 else 0.0,
+        "stages": snapshot["stages"],
+        "fallbacks": snapshot["counters"].get("fallbacks", {}),
+        "llm_usage": usage,
+        "providers": simulator.report(),
+    }
+
+    # Wall-clock figures shrink with --time-scale; provider latencies are the unscaled draws
+    print(f"Done in {report['wall_seconds']:.2f}s ({report['leads_per_second']:.1f} leads/s wall clock)")
+    print("Stage latency (wall ms):")
+    for stage, summary in report["stages"].items():
+        print(f"  {stage:12} p50 {summary['p50_ms']:10.1f}  p95 {summary['p95_ms']:10.1f}  "
+              f"p99 {summary['p99_ms']:10.1f}  max {summary['max_ms']:10.1f}")
+    print(f"Fallbacks: {report['fallbacks'] or 'none'}")
+    print(f"LLM: {usage['requests']} requests, {usage['retries']} retries, "
+          f"{usage['prompt_tokens']} prompt / {usage['completion_tokens']} completion tokens")
+    print("Providers (simulated ms):")
+    for endpoint, stats in report["providers"].items():
+        latency = stats["latency_ms"]
+        print(f"  {endpoint:20} calls {stats['calls']:7}  ok {stats['ok']:7}  429 {stats['rate_limited']:5}  "
+              f"5xx {stats['errors']:5}  timeouts {stats['timeouts']:5}  "
+              f"p50 {latency.get('p50_ms', 0):8.1f}  p99 {latency.get('p99_ms', 0):8.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,143 +1,151 @@
+import argparse
 import csv
 import os
 import json
-from agents.enrichment_agent import EnrichmentAgent
-from agents.brightdata_enrichment_agent import BrightDataEnrichmentAgent
-from agents.pain_profiler import PainProfiler
-from agents.angle_router import AngleRouter
-from agents.email_writer import EmailWriter
-from agents.email_quality_agent import EmailQualityAgent
-from schema_governor import SchemaGovernor
-from cse.engine import CSEEngine
-from cse.schema import RawContext, BrightDataOutput, PainProfilerOutput, AngleRouterOutput, EmailWriterOutput
+from pipeline_executor import PipelineExecutor
+from agents.company_prefetcher import CompanyPrefetcher
+from agents.lead_deduplicator import LeadDeduplicator
+from agents.monitor_agent import MonitorAgent
+from tools.csv_lead_input import CSVLeadInput
+from tools.output_writer import StreamingOutputWriter
+from tools.run_journal import RunJournal
+from tools.signal_store import SignalStore
+from cse.config import CSE_TRACE_LEVEL, TIER_THRESHOLDS
+from cse.result import TRACE_LEVELS
+from tools import logger
+from config.settings import (
+    PIPELINE_WORKERS, CSE_PROCESSES, RUN_JOURNAL_ENABLED, RUN_JOURNAL_PATH, EMAIL_BATCH_SIZE,
+    LOG_LEVEL, LOG_DEBUG_SAMPLE_RATE, LOG_JSONL_PATH, METRICS_STORE_PATH, METRICS_PROMETHEUS_PATH,
+    EMAIL_GATE_MIN_TIER, EMAIL_GATE_FALLBACK, SIGNAL_STORE_ENABLED, SIGNAL_STORE_PATH, SIGNAL_STORE_BATCH_SIZE,
+    DEDUP_ENABLED, DEDUP_REPORT_PATH
+)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="SDR-MVP Pipeline")
+    parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS,
+                        help="Number of leads processed concurrently")
+    parser.add_argument("--cse-processes", type=int, default=CSE_PROCESSES,
+                        help="Process pool size for CSE scoring (0 = inline)")
+    parser.add_argument("--email-batch-size", type=int, default=EMAIL_BATCH_SIZE,
+                        help="Pack this many leads' email prompts into one LLM request (0 = one request per lead)")
+    parser.add_argument("--email-min-tier", choices=list(TIER_THRESHOLDS), default=EMAIL_GATE_MIN_TIER,
+                        help="Score leads before writing: only leads whose provisional tier is at least "
+                             "this get an LLM email")
+    parser.add_argument("--gated-email", choices=["template", "none"], default=EMAIL_GATE_FALLBACK,
+                        help="Email for leads below --email-min-tier: a cheap template or none")
+    parser.add_argument("--trace-level", choices=TRACE_LEVELS, default=CSE_TRACE_LEVEL,
+                        help="Trace detail per lead: off, summary (no explanations) or full")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream leads from the CSV and write each result as soon as it is ready "
+                             "(traces go to pipeline_trace.jsonl)")
+    parser.add_argument("--resume", metavar="RUN_ID", default=None,
+                        help="Resume an interrupted run; completed leads and stages are skipped")
+    parser.add_argument("--journal", action="store_true", default=RUN_JOURNAL_ENABLED,
+                        help="Checkpoint every completed stage so the run can be resumed (--resume)")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Disable the checkpoint journal for this run")
+    parser.add_argument("--signal-store", metavar="PATH", nargs="?", const=SIGNAL_STORE_PATH,
+                        default=SIGNAL_STORE_PATH if SIGNAL_STORE_ENABLED else None,
+                        help="Record raw agent fields and normalized signals in this SQLite store "
+                             f"(for rescore.py; default path: {SIGNAL_STORE_PATH})")
+    parser.add_argument("--no-signal-store", action="store_true",
+                        help="Do not record this run in the signal store")
+    parser.add_argument("--dedup", action="store_true", default=DEDUP_ENABLED,
+                        help="Merge duplicate people/companies (fuzzy, blocked) before enrichment")
+    parser.add_argument("--dedup-report", metavar="PATH", default=DEDUP_REPORT_PATH,
+                        help="Where --dedup writes its merge groups")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Batch-fetch BrightData data for every unique company before processing leads")
+    parser.add_argument("--prefetch-plan", action="store_true",
+                        help="Report unique companies and cache coverage (BrightData quota sizing), then exit")
+    parser.add_argument("--log-level", choices=list(logger.LEVELS), default=LOG_LEVEL,
+                        help="Minimum log level (DEBUG shows per-lead signal, prompt and cache lines)")
+    parser.add_argument("--log-sample-rate", type=float, default=LOG_DEBUG_SAMPLE_RATE,
+                        help="Fraction of leads whose per-lead DEBUG lines are kept")
+    parser.add_argument("--log-jsonl", metavar="PATH", default=LOG_JSONL_PATH,
+                        help="Also write structured log records to this JSONL file")
+    parser.add_argument("--metrics", metavar="PATH", default=METRICS_STORE_PATH,
+                        help="Run metrics (stage latency percentiles, fallbacks, cache hit ratios) "
+                             "and the monitor report")
+    parser.add_argument("--metrics-prom", metavar="PATH", default=METRICS_PROMETHEUS_PATH,
+                        help="Also write run metrics in Prometheus text format to this file")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    logger.configure(level=args.log_level, jsonl_path=args.log_jsonl, sample_rate=args.log_sample_rate)
     input_file = 'leads.csv'
     output_file = 'generated_emails.csv'
     trace_file = 'pipeline_trace.json'
+    stream_trace_file = 'pipeline_trace.jsonl'
     
-    # Instantiate Agents
-    brightdata_agent = BrightDataEnrichmentAgent()
-    enrichment_agent = EnrichmentAgent()
-    pain_profiler = PainProfiler()
-    angle_router = AngleRouter()
-    email_writer = EmailWriter()
-    quality_agent = EmailQualityAgent()
-    governor = SchemaGovernor()
-    
-    # Instantiate CSE Engine
-    cse_engine = CSEEngine()
-
     print(f"Starting MVP Pipeline (Phase 7: CSE Integration)...")
     print(f"Loading {input_file}...")
 
-    leads = []
     if not os.path.exists(input_file):
         print(f"Error: {input_file} not found.")
         return
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            leads.append(row)
+    lead_input = CSVLeadInput(input_file)
+    missing = lead_input.validate_header()
+    if missing:
+        print(f"Error: {input_file} is missing required columns: {missing}")
+        return
 
-    print(f"Found {len(leads)} leads. Processing...")
+    if args.prefetch_plan:
+        CompanyPrefetcher().run(read_leads(input_file, args.dedup), dry_run=True)
+        return
 
-    results = []
-    all_traces = []
-    
-    for i, lead in enumerate(leads):
-        print(f"  [{i+1}/{len(leads)}] Processing {lead['name']} @ {lead['company']}...")
-        
-        # ===== PHASE 1: COLLECT RAW AGENT OUTPUTS =====
-        
-        # 0. BrightData Enrichment (Raw)
+    # Checkpoint journal (every completed stage is recorded per lead)
+    journal = None
+    if args.resume or (args.journal and not args.no_journal):
         try:
-            bd_raw = brightdata_agent.run(lead)
-            print(f"    [BrightData] Raw data collected")
-            bd_output = BrightDataOutput(**bd_raw)
-        except Exception as e:
-            print(f"    [BrightData] Failed: {e}")
-            bd_output = None
-        
-        # 1. Enrichment -> NormalizedLead (still needed for pain/angle agents)
-        normalized_lead = enrichment_agent.run(lead)
-        
-        # MVSG: Validate NormalizedLead
-        validation = governor.validate_normalized_lead(normalized_lead, lead['name'])
-        governor.log_validation_result(validation)
-        
-        # 2. Pain Profiler (Raw)
-        pain_raw = pain_profiler.run(normalized_lead)
-        print(f"    [Pain] Candidates: {pain_raw.get('pain_candidates', [])}")
-        pain_output = PainProfilerOutput(**pain_raw)
-        
-        # 3. Angle Router (Raw)
-        angle_raw = angle_router.run(normalized_lead, pain_raw['primary_pain'])
-        print(f"    [Angle] Selected: {angle_raw.get('selected_angle')}")
-        angle_output = AngleRouterOutput(**angle_raw)
+            journal = RunJournal(RUN_JOURNAL_PATH, run_id=args.resume, input_file=input_file)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if journal.resumed:
+            print(f"Resuming run {journal.run_id} ({journal.completed_count()} leads already complete)")
+        else:
+            print(f"Run ID: {journal.run_id} (resume with --resume {journal.run_id})")
 
-        # 4. Email Generation
-        email_output_obj = email_writer.run(normalized_lead, pain_raw['primary_pain'], angle_raw['selected_angle'])
-        
-        # MVSG: Validate EmailOutput
-        validation = governor.validate_email_output(email_output_obj, lead['name'])
-        governor.log_validation_result(validation)
+    # Signal store (raw agent fields per scored lead, replayed by rescore.py)
+    signal_store = None
+    if args.signal_store and not args.no_signal_store:
+        signal_store = SignalStore(args.signal_store, run_id=journal.run_id if journal else None,
+                                   batch_size=SIGNAL_STORE_BATCH_SIZE)
 
-        # 5. Quality Assurance
-        clean_email = quality_agent.run(email_output_obj)
-        
-        # Convert email to raw output for CSE
-        email_output = EmailWriterOutput(
-            personalization_depth=0.7,  # Placeholder
-            tone="professional",
-            structure="standard",
-            length=len(clean_email.body) if clean_email.body else 0,
-            email_body=clean_email.body
-        )
-        
-        # ===== PHASE 2: ASSEMBLE RAW CONTEXT =====
-        
-        raw_context = RawContext(
-            lead_name=lead['name'],
-            lead_company=lead['company'],
-            lead_title=lead.get('title', ''),
-            brightdata=bd_output,
-            pain=pain_output,
-            angle=angle_output,
-            email=email_output
-        )
-        
-        # ===== PHASE 3: CSE PROCESSING =====
-        
-        print(f"    [CSE] Processing...")
-        cse_result = cse_engine.process(raw_context)
-        
-        print(f"    [CSE] Score: {cse_result['lead_score']:.0f}, Tier: {cse_result['priority_tier']}, Confidence: {cse_result['avg_confidence']:.2f}")
-        
-        # ===== PHASE 4: ASSEMBLE OUTPUT =====
-        
-        # Merge lead data, CSE results, and email
-        result_row = lead.copy()
-        result_row.update({
-            "pain": pain_raw['primary_pain'],
-            "angle": angle_raw['selected_angle'],
-            "lead_score": cse_result['lead_score'],
-            "priority_tier": cse_result['priority_tier'],
-            "avg_confidence": cse_result['avg_confidence'],
-            "min_confidence": cse_result['min_confidence'],
-            "explanation_summary": cse_result['explanation_summary'],
-            "data_quality_flag": cse_result['data_quality_flag'],
-            **clean_email.dict()
-        })
-        results.append(result_row)
-        
-        # Store trace
-        all_traces.append({
-            "lead_name": lead['name'],
-            "lead_company": lead['company'],
-            "trace": cse_result['trace']
-        })
+    # Instantiate Executor (owns agents + CSE Engine)
+    executor = PipelineExecutor(workers=args.workers, cse_processes=args.cse_processes, journal=journal,
+                                email_batch_size=args.email_batch_size, trace_level=args.trace_level,
+                                email_min_tier=args.email_min_tier, gated_email=args.gated_email,
+                                signal_store=signal_store)
+
+    # Pre-fetch: one streaming scan of the input warms the BrightData cache
+    if args.prefetch:
+        CompanyPrefetcher(client=executor.brightdata_agent.client).run(read_leads(input_file, args.dedup))
+
+    # Dedup: only the first occurrence of each person reaches the agents
+    deduplicator = LeadDeduplicator() if args.dedup else None
+    leads = deduplicator.iter_unique(lead_input) if deduplicator else lead_input
+
+    if args.stream:
+        run_streaming(executor, leads, lead_input, output_file, stream_trace_file)
+        finish_dedup(deduplicator, args.dedup_report)
+        finish_journal(journal)
+        finish_signal_store(signal_store)
+        report_metrics(executor, journal, args)
+        return
+
+    leads = list(leads)
+    finish_dedup(deduplicator, args.dedup_report)
+
+    print(f"Found {len(leads)} leads. Processing with {executor.workers} worker(s)...")
+
+    # Results come back in input order regardless of completion order
+    processed = executor.run(leads)
+    results = [result_row for result_row, _ in processed]
+    all_traces = [trace_entry for _, trace_entry in processed]
         
     # ===== WRITE OUTPUTS =====
     
@@ -153,8 +161,61 @@ def main():
     with open(trace_file, 'w', encoding='utf-8') as f:
         json.dump(all_traces, f, indent=2)
 
+    finish_journal(journal)
+    finish_signal_store(signal_store)
+
     print(f"Done! Generated {len(results)} emails.")
     print(f"Trace written to {trace_file}")
+    report_metrics(executor, journal, args)
+
+def finish_journal(journal):
+    if journal:
+        journal.mark_finished()
+        journal.close()
+
+def read_leads(input_file, dedup):
+    """A fresh scan of the input (deduplicated when --dedup is on)."""
+    lead_input = CSVLeadInput(input_file)
+    return LeadDeduplicator().iter_unique(lead_input) if dedup else lead_input
+
+def finish_dedup(deduplicator, report_path):
+    if deduplicator:
+        report = deduplicator.write_report(report_path)
+        print(f"Dedup: {report['leads_scanned']} leads -> {report['unique_leads']} unique "
+              f"({report['duplicate_leads']} duplicates dropped, {report['unique_companies']} companies, "
+              f"{report['merged_company_spellings']} company spellings merged); groups in {report_path}")
+
+def finish_signal_store(signal_store):
+    if signal_store:
+        signal_store.close()
+        print(f"Signal store: {signal_store.added} leads recorded in {signal_store.db_path} "
+              f"(run {signal_store.run_id}; rescore with: python rescore.py --run-id {signal_store.run_id})")
+
+def report_metrics(executor, journal, args):
+    """Check the run against the monitor thresholds and write its metrics."""
+    report = MonitorAgent().run(executor.metrics)
+    print(f"Monitor: {report.status}")
+    for reason in report.reasons:
+        print(f"  - {reason}")
+
+    extra = {"run_id": journal.run_id if journal else None, "monitor": report.to_dict()}
+    executor.metrics.write_json(args.metrics, extra=extra)
+    print(f"Metrics written to {args.metrics}")
+    if args.metrics_prom:
+        with open(args.metrics_prom, "w", encoding="utf-8") as f:
+            f.write(executor.metrics.to_prometheus())
+
+def run_streaming(executor, leads, lead_input, output_file, trace_file):
+    """Streaming mode: rows flow from the CSV reader to disk one at a time."""
+    print(f"Streaming leads with {executor.workers} worker(s)...")
+
+    with StreamingOutputWriter(output_file, trace_file) as writer:
+        executor.run_streaming(leads, writer.write)
+
+    report = lead_input.report
+    print(f"Done! Generated {writer.count} emails "
+          f"({report['rows_read']} rows read, {report['empty_rows']} empty rows skipped).")
+    print(f"Trace written to {trace_file}")
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,7 @@
 import json
+from tools.logger import get_logger
+
+log = get_logger("mock_llm")
 
 class MockLLMProvider:
     def __init__(self):
@@ -43,6 +46,10 @@ class MockLLMProvider:
         if "Extract company_category" in prompt:
             return self._mock_enrichment(prompt)
             
+        # Layer C (batched): several email prompts packed into one request
+        if "Write cold emails in batch" in prompt:
+            return self._mock_email_batch(prompt)
+
         # Layer C: Email Generation (includes Layer B logic implicitly)
         if "Write a cold email" in prompt:
             return self._mock_email_generation(prompt)
@@ -164,6 +171,18 @@ class MockLLMProvider:
             
         return json.dumps(data)
 
+    def _mock_email_batch(self, prompt):
+        # Split on "### LEAD <n>" headers; each section is a normal email prompt
+        import re
+        parts = re.split(r"^### LEAD (\d+)$", prompt, flags=re.MULTILINE)
+        emails = []
+        for i in range(1, len(parts) - 1, 2):
+            emails.append({
+                "id": int(parts[i]),
+                "body": self._mock_email_generation(parts[i + 1])
+            })
+        return json.dumps({"emails": emails})
+
     def _mock_email_generation(self, prompt):
         # Identify Persona based on prompt content
         persona_key = "VP R&D" # Default
@@ -177,15 +196,15 @@ class MockLLMProvider:
         pain_point = "generic pain"
         try:
             import re
-            print(f"DEBUG: Prompt received:\n{prompt}")
+            log.debug("Prompt received:\n%s", prompt, sample_key=prompt)
             match = re.search(r"Pain: (.*)", prompt)
             if match:
                 pain_point = match.group(1).strip()
-                print(f"DEBUG: Extracted Pain: '{pain_point}'")
+                log.debug("Extracted Pain: '%s'", pain_point, sample_key=prompt)
             else:
-                print("DEBUG: No Pain match found!")
+                log.debug("No Pain match found!", sample_key=prompt)
         except Exception as e:
-            print(f"DEBUG: Regex Error: {e}")
+            log.warn("Regex Error: %s", e)
             pass
         
         # Templates with placeholders
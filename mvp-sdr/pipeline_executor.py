@@ -0,0 +1,442 @@
+"""
+Pipeline Executor
+Runs the SDR pipeline over many leads concurrently.
+
+- I/O-bound stages run concurrently with at most `workers` leads in flight:
+  BrightData lookups on a thread pool, LLM email generation natively async
+  (pooled HTTP session, per-tier limits, retries).
+- With `email_batch_size` > 1, email prompts from in-flight leads are packed
+  into one structured LLM request per batch (EmailBatcher).
+- CPU-bound CSE scoring runs on a process pool (or inline when
+  `cse_processes` is 0).
+- Results are returned in input order regardless of completion order, so
+  `generated_emails.csv` stays deterministic.
+- Input can be any iterable; only a bounded window of leads is held in memory.
+- With a RunJournal attached, every stage is checkpointed per lead so an
+  interrupted run can be resumed.
+- Score-before-write: with `email_min_tier` set, each lead gets a
+  provisional CSE score before email generation; leads below that tier get
+  a template email (or none) instead of a tier-1 LLM call.
+- Every run records stage latencies, fallbacks, cache hit ratios and LLM
+  token usage in `self.metrics` (RunMetrics), reset at the start of a run.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from agent_context import AgentContext
+from agents.enrichment_agent import EnrichmentAgent
+from agents.brightdata_enrichment_agent import BrightDataEnrichmentAgent
+from agents.pain_profiler import PainProfiler
+from agents.angle_router import AngleRouter
+from agents.email_writer import EmailWriter, EmailBatcher
+from agents.email_quality_agent import EmailQualityAgent
+from schema_governor import SchemaGovernor
+from contracts import EmailOutput
+from compact_contracts import CompactLead
+from cse.engine import CSEEngine
+from cse.batch_scorer import raw_fields
+from cse.config import CSE_TRACE_LEVEL, TIER_THRESHOLDS
+from cse.result import CSEResult
+from cse.schema import RawContext, BrightDataOutput, PainProfilerOutput, AngleRouterOutput, EmailWriterOutput
+from tools.run_journal import RunJournal
+from tools.signal_store import SignalStore
+from tools.logger import get_logger, flush as flush_logs
+from config.settings import (
+    PIPELINE_WORKERS, CSE_PROCESSES, EMAIL_BATCH_SIZE, EMAIL_BATCH_MAX_WAIT,
+    EMAIL_GATE_MIN_TIER, EMAIL_GATE_FALLBACK
+)
+
+# Scheduled-but-unemitted leads per worker. Bounds the reorder buffer while
+# letting fast leads run ahead of a slow one.
+REORDER_WINDOW_FACTOR = 4
+
+# Email signals CSE scores before the email exists (same placeholders the
+# written email is scored with, so a provisional tier matches the final one)
+PLANNED_EMAIL = EmailWriterOutput(personalization_depth=0.7, tone="professional", structure="standard")
+GATED_EMAIL_MODES = ("template", "none")
+
+log = get_logger("executor")
+
+# ===== CSE PROCESS POOL WORKER =====
+# Each worker process owns one CSEEngine, built once by the pool initializer.
+
+_worker_cse_engine = None
+
+
+def _init_cse_worker(weight_profile, trace_level):
+    global _worker_cse_engine
+    _worker_cse_engine = CSEEngine(weight_profile, trace_level=trace_level)
+
+
+def _cse_process(raw_context: RawContext) -> Tuple[CSEResult, Dict[str, Any]]:
+    # Export the trace in the worker so the parent only unpickles plain data
+    result = _worker_cse_engine.process(raw_context)
+    trace = result.trace_dict()
+    result.trace = None
+    return result, trace
+
+
+class PipelineExecutor:
+    """
+    Concurrent lead pipeline.
+    Owns the agents and drives each lead through
+    BrightData -> Enrichment -> Pain -> Angle -> Email -> Quality -> CSE.
+    """
+
+    def __init__(self, workers: int = PIPELINE_WORKERS, cse_processes: int = CSE_PROCESSES,
+                 weight_profile: str = None, journal: Optional[RunJournal] = None,
+                 email_batch_size: int = EMAIL_BATCH_SIZE, trace_level: str = CSE_TRACE_LEVEL,
+                 email_min_tier: Optional[str] = EMAIL_GATE_MIN_TIER, gated_email: str = EMAIL_GATE_FALLBACK,
+                 signal_store: Optional[SignalStore] = None, context: Optional[AgentContext] = None):
+        if email_min_tier is not None and email_min_tier not in TIER_THRESHOLDS:
+            raise ValueError(f"Unknown tier for email gating: {email_min_tier}")
+        if gated_email not in GATED_EMAIL_MODES:
+            raise ValueError(f"Unknown gated email mode: {gated_email} (expected one of {GATED_EMAIL_MODES})")
+        self.workers = max(1, workers)
+        self.email_batch_size = max(0, email_batch_size)
+        self.cse_processes = max(0, cse_processes)
+        self.weight_profile = weight_profile
+        self.trace_level = trace_level
+        self.journal = journal
+        # Raw agent fields + normalized signals of every scored lead (for offline rescoring)
+        self.signal_store = signal_store
+        # Score-before-write: leads whose provisional tier is below this get
+        # a template email or none instead of an LLM call (None = off)
+        self.email_min_tier = email_min_tier
+        self.gated_email = gated_email
+
+        # Clients, caches and providers: built once, injected into the agents
+        self.context = context or AgentContext()
+        log.info("Agent context ready in %.1f ms", self.context.startup_ms)
+        # Shared with the agents (they count their own fallbacks)
+        self.metrics = self.context.metrics
+
+        # Agents (shared by all in-flight leads; all are stateless per call)
+        self.brightdata_agent = BrightDataEnrichmentAgent(client=self.context.brightdata_client)
+        self.enrichment_agent = EnrichmentAgent(self.context)
+        self.pain_profiler = PainProfiler()
+        self.angle_router = AngleRouter()
+        self.email_writer = EmailWriter(self.context)
+        self.quality_agent = EmailQualityAgent()
+        self.governor = SchemaGovernor()
+        # Built per run (binds to the event loop) when batching is enabled
+        self.email_batcher = None
+
+        # Inline CSE engine (used when no process pool is configured)
+        self.cse_engine = CSEEngine(weight_profile, trace_level=trace_level)
+
+    def run(self, leads: List[Dict[str, str]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Process all leads.
+        Returns a list of (result_row, trace_entry) in input order.
+        """
+        processed = []
+        self.run_streaming(leads, lambda row, trace: processed.append((row, trace)), total=len(leads))
+        return processed
+
+    def run_streaming(self, leads: Iterable[Dict[str, str]],
+                      on_result: Callable[[Dict[str, Any], Dict[str, Any]], None],
+                      total: Optional[int] = None) -> int:
+        """
+        Process leads from any iterable (e.g. a CSVLeadInput generator).
+        Each (result_row, trace_entry) is handed to `on_result` in input order
+        as soon as it and every earlier lead are done.
+        Returns the number of leads processed.
+        """
+        self.metrics.reset()
+        cache_stats = self._cache_stats()
+        llm_usage = self._llm_usage()
+        start = time.perf_counter()
+        try:
+            return asyncio.run(self._run_all(leads, on_result, total))
+        finally:
+            self._finish_metrics(time.perf_counter() - start, cache_stats, llm_usage)
+            # Everything logged during the run is written before the caller reports
+            flush_logs()
+
+    # ===== RUN METRICS =====
+
+    def _cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "llm": self.context.llm_client.cache.stats(),
+            "brightdata": self.context.brightdata_client.cache.stats(),
+            "enrichment_memo": self.context.enrichment_memo.stats(),
+        }
+
+    def _llm_usage(self) -> Dict[str, int]:
+        # Token counts reported by the async client (absent until its first call)
+        async_client = getattr(self.context.llm_adapter, "async_client", None)
+        return dict(getattr(async_client, "usage", None) or {})
+
+    def _finish_metrics(self, elapsed: float, cache_stats, llm_usage):
+        """Record run-level metrics as deltas against the readings taken at start"""
+        for cache, after in self._cache_stats().items():
+            self.metrics.record_cache(cache, cache_stats[cache], after)
+        for field, value in self._llm_usage().items():
+            self.metrics.increment(f"llm_{field}", value - llm_usage.get(field, 0))
+
+        leads = self.metrics.counter("leads_processed") + self.metrics.counter("leads_resumed")
+        self.metrics.set_gauge("run_seconds", round(elapsed, 3))
+        self.metrics.set_gauge("leads_per_second", round(leads / elapsed, 3) if elapsed > 0 else 0.0)
+
+    async def _run_all(self, leads, on_result, total):
+        semaphore = asyncio.Semaphore(self.workers)
+        # In-order window of scheduled leads; bounds memory for any input size
+        window = deque()
+        max_window = self.workers * REORDER_WINDOW_FACTOR
+        count = 0
+
+        io_pool = ThreadPoolExecutor(max_workers=self.workers)
+        cse_pool = None
+        if self.cse_processes > 0:
+            cse_pool = ProcessPoolExecutor(
+                max_workers=self.cse_processes,
+                initializer=_init_cse_worker,
+                initargs=(self.weight_profile, self.trace_level)
+            )
+
+        if self.email_batch_size > 1:
+            self.email_batcher = EmailBatcher(self.email_writer, self.email_batch_size, EMAIL_BATCH_MAX_WAIT)
+
+        async def bounded(index, lead):
+            async with semaphore:
+                return await self._process_lead(index, total, lead, io_pool, cse_pool)
+
+        try:
+            for index, lead in enumerate(leads):
+                window.append(asyncio.ensure_future(bounded(index, lead)))
+                if len(window) >= max_window:
+                    on_result(*await window.popleft())
+                    count += 1
+
+            while window:
+                on_result(*await window.popleft())
+                count += 1
+        finally:
+            for task in window:
+                task.cancel()
+            await asyncio.gather(*window, return_exceptions=True)
+            if self.email_batcher:
+                await self.email_batcher.aclose()
+                self.email_batcher = None
+            await self.context.aclose()
+            if self.journal:
+                # Interrupted or not, every stage finished so far survives
+                self.journal.flush()
+            io_pool.shutdown(wait=True)
+            if cse_pool:
+                cse_pool.shutdown(wait=True)
+
+        return count
+
+    def _raw_context(self, lead, bd_output, pain_output, angle_output, email_output) -> RawContext:
+        return RawContext(
+            lead_name=lead['name'],
+            lead_company=lead['company'],
+            lead_title=lead.get('title', ''),
+            brightdata=bd_output,
+            pain=pain_output,
+            angle=angle_output,
+            email=email_output
+        )
+
+    async def _score(self, raw_context: RawContext, cse_pool, stage: str = "cse") -> Tuple[CSEResult, Dict[str, Any]]:
+        """CSE scoring, inline or on the process pool; returns (result, exported trace)"""
+        with self.metrics.timer(stage):
+            if cse_pool:
+                loop = asyncio.get_running_loop()
+                cse_result, cse_trace = await loop.run_in_executor(cse_pool, _cse_process, raw_context)
+            else:
+                cse_result = self.cse_engine.process(raw_context)
+                cse_trace = cse_result.trace_dict()
+        # Engine-side time (excludes process-pool round trips); only in kept traces
+        if "metrics" in cse_trace:
+            self.metrics.observe("cse_engine", cse_trace["metrics"]["processing_time_ms"])
+        return cse_result, cse_trace
+
+    async def _process_lead(self, index: int, total: int, lead: Dict[str, str], io_pool, cse_pool):
+        loop = asyncio.get_running_loop()
+        progress = f"{index+1}/{total}" if total else f"{index+1}"
+
+        # Checkpointing: every completed stage is journaled, so a resumed
+        # run skips finished leads and picks up half-finished ones mid-way.
+        # Keyed by input position too: identical rows are separate leads.
+        fingerprint = RunJournal.fingerprint(lead) if self.journal or self.signal_store else None
+        journal_key = RunJournal.lead_key(index, fingerprint) if self.journal else None
+
+        def recorded(stage):
+            return self.journal.get_stage(journal_key, stage) if self.journal else None
+
+        def record(stage, payload):
+            if self.journal:
+                self.journal.record_stage(journal_key, stage, payload)
+
+        metrics = self.metrics
+        timer = metrics.timer
+
+        done = recorded("result")
+        if done is not None:
+            log.info("  [%s] Resumed %s @ %s (already complete)", progress, lead['name'], lead['company'])
+            metrics.increment("leads_resumed")
+            metrics.increment("pains", pain=done[0]['pain'])
+            metrics.increment("angles", angle=done[0]['angle'])
+            return done[0], done[1]
+
+        log.info("  [%s] Processing %s @ %s...", progress, lead['name'], lead['company'])
+        lead_start = time.perf_counter()
+
+        # ===== PHASE 1: COLLECT RAW AGENT OUTPUTS =====
+
+        # 0. BrightData Enrichment (Raw, I/O)
+        try:
+            bd_raw = recorded("brightdata")
+            if bd_raw is None:
+                with timer("brightdata"):
+                    bd_raw = await loop.run_in_executor(io_pool, self.brightdata_agent.run, lead)
+                record("brightdata", bd_raw)
+            log.debug("    [BrightData] Raw data collected", sample_key=lead['name'])
+            bd_output = BrightDataOutput(**bd_raw)
+        except Exception as e:
+            log.warn("    [BrightData] Failed: %s", e, context={"lead": lead['name']})
+            metrics.increment("fallbacks", stage="brightdata")
+            bd_output = None
+
+        # 1. Enrichment -> CompactLead (still needed for pain/angle agents)
+        enrichment_raw = recorded("enrichment")
+        if enrichment_raw is None:
+            with timer("enrichment"):
+                normalized_lead = self.enrichment_agent.run_compact(lead)
+
+            # MVSG: Validate NormalizedLead
+            validation = self.governor.validate_normalized_lead(normalized_lead, lead['name'])
+            self.governor.log_validation_result(validation)
+            record("enrichment", normalized_lead.dict())
+        else:
+            normalized_lead = CompactLead.from_dict(enrichment_raw)
+
+        # 2. Pain Profiler (Raw)
+        pain_raw = recorded("pain")
+        if pain_raw is None:
+            with timer("pain"):
+                pain_raw = self.pain_profiler.run(normalized_lead)
+            record("pain", pain_raw)
+        log.debug("    [Pain] Candidates: %s", pain_raw.get('pain_candidates', []), sample_key=lead['name'])
+        pain_output = PainProfilerOutput(**pain_raw)
+
+        # 3. Angle Router (Raw)
+        angle_raw = recorded("angle")
+        if angle_raw is None:
+            with timer("angle"):
+                angle_raw = self.angle_router.run(normalized_lead, pain_raw['primary_pain'])
+            record("angle", angle_raw)
+        log.debug("    [Angle] Selected: %s", angle_raw.get('selected_angle'), sample_key=lead['name'])
+        angle_output = AngleRouterOutput(**angle_raw)
+
+        # 4. Score-before-write gate: the provisional tier (scored with the
+        # planned email's signals) decides whether the lead gets an LLM email
+        email_mode = "llm"
+        provisional = None
+        if self.email_min_tier:
+            provisional_context = self._raw_context(lead, bd_output, pain_output, angle_output, PLANNED_EMAIL)
+            # Taken before scoring: the inline engine fills fallbacks into the context
+            provisional_fields = raw_fields(provisional_context)
+            provisional = await self._score(provisional_context, cse_pool, stage="cse_provisional")
+            if TIER_THRESHOLDS.get(provisional[0]['priority_tier'], 0) < TIER_THRESHOLDS[self.email_min_tier]:
+                email_mode = self.gated_email
+
+        # 5. Email Generation (LLM, I/O, or template) + 6. Quality Assurance
+        email_raw = recorded("email")
+        if email_raw is None:
+            if email_mode == "none":
+                clean_email = EmailOutput(subject="", body="", angle_used=angle_raw['selected_angle'], tokens=0)
+            else:
+                if email_mode == "llm":
+                    generate = self.email_batcher.submit if self.email_batcher else self.email_writer.arun
+                    with timer("email"):
+                        email_output_obj = await generate(
+                            normalized_lead, pain_raw['primary_pain'], angle_raw['selected_angle']
+                        )
+                else:
+                    with timer("email_template"):
+                        email_output_obj = self.email_writer.template(normalized_lead, angle_raw['selected_angle'])
+
+                # MVSG: Validate EmailOutput
+                validation = self.governor.validate_email_output(email_output_obj, lead['name'])
+                self.governor.log_validation_result(validation)
+
+                with timer("quality"):
+                    clean_email = self.quality_agent.run(email_output_obj)
+                metrics.increment("email_tokens", clean_email.tokens)
+            record("email", {
+                "subject": clean_email.subject,
+                "body": clean_email.body,
+                "angle_used": clean_email.angle_used,
+                "tokens": clean_email.tokens
+            })
+        else:
+            clean_email = EmailOutput(**email_raw)
+        metrics.increment("emails", mode=email_mode)
+
+        # ===== PHASE 2: CSE PROCESSING (CPU) =====
+
+        if email_mode == "none":
+            # No email to add: the provisional result is final
+            cse_result, cse_trace = provisional
+            scored_fields = provisional_fields
+        else:
+            # Convert email to raw output for CSE
+            email_output = EmailWriterOutput(
+                personalization_depth=0.7,  # Placeholder
+                tone="professional",
+                structure="standard",
+                length=len(clean_email.body) if clean_email.body else 0,
+                email_body=clean_email.body
+            )
+            log.debug("    [CSE] Processing...", sample_key=lead['name'])
+            raw_context = self._raw_context(lead, bd_output, pain_output, angle_output, email_output)
+            scored_fields = raw_fields(raw_context)
+            cse_result, cse_trace = await self._score(raw_context, cse_pool)
+        if cse_trace.get("fallbacks_applied"):
+            metrics.increment("fallbacks", stage="cse")
+
+        log.info("    [CSE] Score: %.0f, Tier: %s, Confidence: %.2f",
+                 cse_result['lead_score'], cse_result['priority_tier'], cse_result['avg_confidence'],
+                 context={"lead": lead['name'], "company": lead['company']})
+
+        # ===== PHASE 3: ASSEMBLE OUTPUT =====
+
+        # Merge lead data, CSE results, and email
+        result_row = lead.copy()
+        result_row.update({
+            "pain": pain_raw['primary_pain'],
+            "angle": angle_raw['selected_angle'],
+            "lead_score": cse_result['lead_score'],
+            "priority_tier": cse_result['priority_tier'],
+            "avg_confidence": cse_result['avg_confidence'],
+            "min_confidence": cse_result['min_confidence'],
+            "explanation_summary": cse_result['explanation_summary'],
+            "data_quality_flag": cse_result['data_quality_flag'],
+            **clean_email.dict()
+        })
+        if self.email_min_tier:
+            result_row["email_mode"] = email_mode
+            result_row["provisional_tier"] = provisional[0]['priority_tier']
+
+        trace_entry = {
+            "lead_name": lead['name'],
+            "lead_company": lead['company'],
+            "trace": cse_trace
+        }
+        record("result", [result_row, trace_entry])
+        if self.signal_store:
+            self.signal_store.add(lead, scored_fields, cse_result, fingerprint)
+
+        metrics.observe("lead", (time.perf_counter() - lead_start) * 1000)
+        metrics.increment("leads_processed")
+        metrics.increment("pains", pain=result_row['pain'])
+        metrics.increment("angles", angle=result_row['angle'])
+        return result_row, trace_entry
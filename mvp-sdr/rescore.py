@@ -0,0 +1,75 @@
+"""
+Rescore stored leads under the current CSE config (no agent calls).
+
+Edit TIER_THRESHOLDS, NORMALIZATION_RULES, PENALTY_RULES or the weight
+profiles in cse/config.py (bump CONFIG_VERSION / SCORING_VERSION), then:
+
+    python rescore.py                          # every stored lead, active profile
+    python rescore.py --run-id <run_id> --profiles v1 v2
+    python rescore.py --runs                   # list stored runs
+"""
+
+import argparse
+import json
+import os
+
+from cse.config import WEIGHT_PROFILES, TIERS
+from cse.rescore import rescore
+from tools.signal_store import SignalStore
+from config.settings import SIGNAL_STORE_PATH, RESCORE_BATCH_SIZE
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay the CSE over the signal store")
+    parser.add_argument("--store", metavar="PATH", default=SIGNAL_STORE_PATH,
+                        help="Signal store written by main.py")
+    parser.add_argument("--run-id", default=None, help="Only rescore this run (default: all stored leads)")
+    parser.add_argument("--profiles", nargs="+", choices=list(WEIGHT_PROFILES), default=None,
+                        help="Weight profiles to score (default: the active one)")
+    parser.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE,
+                        help="Leads scored per vectorized batch")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report only; do not write to the rescores table")
+    parser.add_argument("--summary-json", metavar="PATH", default=None,
+                        help="Write the rescore summary to this JSON file")
+    parser.add_argument("--runs", action="store_true", help="List stored runs and exit")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.store or not os.path.exists(args.store):
+        print(f"Error: signal store {args.store} not found (run main.py --signal-store first).")
+        return
+
+    store = SignalStore(args.store)
+    try:
+        if args.runs:
+            for run in store.runs():
+                print(f"  {run['run_id']}  {run['leads']:8} leads  profile {run['weight_profile']}  "
+                      f"scoring {run['scoring_version']}  config {run['config_version']}")
+            return
+
+        summary = rescore(store, run_id=args.run_id, profiles=args.profiles,
+                          batch_size=max(1, args.batch_size), save=not args.dry_run)
+    finally:
+        store.conn.close()
+
+    stored = ", ".join(f"scoring {s} / config {c}" for s, c in summary["stored_versions"]) or "none"
+    print(f"Rescored {summary['leads']} leads in {summary['seconds']:.2f}s "
+          f"(stored: {stored}; now: scoring {summary['scoring_version']} / config {summary['config_version']})")
+    for profile, counts in summary["tier_counts"].items():
+        print(f"  {profile:15} " + "  ".join(f"{tier}: {counts[tier]:8}" for tier in TIERS) +
+              f"  tier changes: {summary['tier_changes'][profile]}"
+              f"  mean |score delta|: {summary['mean_abs_score_delta'][profile]}")
+        moves = {move: n for move, n in summary["migration"][profile].items() if move[0] != move[-1]}
+        if moves:
+            print("    " + ", ".join(f"{move}: {n}" for move, n in moves.items()))
+
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,11 @@ Enforces ONLY:
 """
 
 from contracts import NormalizedLead, AngleSignals, EmailOutput
+from compact_contracts import CompactAngleSignals, CompactLead
 from typing import Any, Dict, List
+from tools.logger import get_logger
+
+log = get_logger("governor")
 
 
 class ValidationResult:
@@ -28,7 +32,7 @@ class SchemaGovernor:
         Validates NormalizedLead contract.
         
         Checks:
-        - Type is NormalizedLead
+        - Type is NormalizedLead (or its CompactLead fast path)
         - first_name exists
         - company exists
         - angle_signals exists (all 8 fields)
@@ -38,7 +42,7 @@ class SchemaGovernor:
         result = ValidationResult()
         
         # 1. Type check
-        if not isinstance(lead, NormalizedLead):
+        if not isinstance(lead, (NormalizedLead, CompactLead)):
             result.warnings.append(f"[GOVERNOR] [WARN] EnrichmentAgent | Lead: {lead_name} | Type mismatch: expected NormalizedLead")
             result.failed_safe = True
             return result
@@ -59,6 +63,13 @@ class SchemaGovernor:
             result.warnings.append(f"[GOVERNOR] [WARN] EnrichmentAgent | Lead: {lead_name} | Missing: angle_signals | Applying defaults")
             lead.angle_signals = self._create_default_signals()
             result.corrections_applied["angle_signals"] = "default"
+        elif isinstance(lead.angle_signals, CompactAngleSignals):
+            # Fast path: missing signals are the zero codes
+            for signal in lead.angle_signals.missing():
+                result.warnings.append(f"[GOVERNOR] [WARN] EnrichmentAgent | Lead: {lead_name} | Missing signal: {signal}")
+                default_value = self._get_default_signal_value(signal)
+                setattr(lead.angle_signals, signal, default_value)
+                result.corrections_applied[f"angle_signals.{signal}"] = default_value
         else:
             # Check all 8 fields exist
             required_signals = [
@@ -150,6 +161,6 @@ We help engineering leaders create visibility and flow across their teams withou
 Worth a quick conversation?"""
     
     def log_validation_result(self, result: ValidationResult):
-        """Print warnings to console"""
+        """Log warnings (console / JSONL sinks)"""
         for warning in result.warnings:
-            print(warning)
+            log.warn(warning)
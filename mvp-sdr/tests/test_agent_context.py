@@ -0,0 +1,86 @@
+"""
+Agent Context Test
+Ensures clients, caches and providers are built once and shared by all
+agents, and that the email stage constructs nothing per lead.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+import llm_adapter
+import llm_client
+import mock_llm_provider
+from agents import hook_engine
+from agent_context import AgentContext
+from agents.email_writer import EmailWriter
+from agents.enrichment_agent import EnrichmentAgent
+from pipeline_executor import PipelineExecutor
+from tests.test_email_batching import ITEMS
+
+CONSTRUCTED = [
+    (llm_adapter, "LLMAdapter"),
+    (llm_client, "LLMClient"),
+    (mock_llm_provider, "MockLLMProvider"),
+    (hook_engine, "HookEngine"),
+]
+
+
+def _count_constructions():
+    """Wrap the constructors; returns {class name: count}"""
+    counts = {}
+    for module, name in CONSTRUCTED:
+        cls = getattr(module, name)
+        counts[name] = 0
+
+        def init(self, *args, __init=cls.__init__, __name=name, **kwargs):
+            counts[__name] += 1
+            __init(self, *args, **kwargs)
+
+        cls.__init__ = init
+    return counts
+
+
+def test_agents_share_one_context():
+    context = AgentContext.in_directory(tempfile.mkdtemp())
+    assert context.startup_ms > 0
+    writer, enricher = EmailWriter(context), EnrichmentAgent(context)
+    assert writer.adapter is context.llm_adapter
+    assert writer.adapter.mock_provider is enricher.provider is context.mock_provider
+    assert writer.adapter.enrichment_memo is enricher.memo is context.enrichment_memo
+
+    executor = PipelineExecutor(context=AgentContext.in_directory(tempfile.mkdtemp()))
+    assert executor.email_writer.adapter is executor.context.llm_adapter
+    assert executor.brightdata_agent.client is executor.context.brightdata_client
+
+
+def test_email_stage_has_no_per_lead_setup():
+    originals = [(getattr(module, name), getattr(module, name).__init__) for module, name in CONSTRUCTED]
+    writer = EmailWriter(AgentContext.in_directory(tempfile.mkdtemp()))
+    counts = _count_constructions()
+    try:
+        for item in ITEMS * 10:
+            writer.run(*item)
+        writer.run_batch(ITEMS)
+
+        async def scenario():
+            for item in ITEMS:
+                await writer.arun(*item)
+            await writer.arun_batch(ITEMS)
+            await writer.aclose()
+
+        asyncio.run(scenario())
+    finally:
+        for cls, init in originals:
+            cls.__init__ = init
+
+    assert counts == {name: 0 for _, name in CONSTRUCTED}, counts
+
+
+if __name__ == "__main__":
+    test_agents_share_one_context()
+    test_email_stage_has_no_per_lead_setup()
+    print("✅ ALL AGENT CONTEXT TESTS PASSED")
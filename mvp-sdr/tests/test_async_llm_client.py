@@ -0,0 +1,196 @@
+"""
+Async LLM Client Test
+Runs AsyncLLMClient against a local stub provider: retries on 429/5xx,
+per-tier concurrency limits, caching, non-retryable errors, and malformed
+200 bodies.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from aiohttp import web
+from async_llm_client import AsyncLLMClient, LLMProviderError
+
+
+class StubProvider:
+    """Minimal OpenAI-compatible /chat/completions stub."""
+
+    def __init__(self, fail_first=0, fail_status=429, delay=0.0, malformed_first=0, truncated_first=0):
+        self.fail_first = fail_first
+        self.malformed_first = malformed_first
+        self.truncated_first = truncated_first
+        self.fail_status = fail_status
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.requests <= self.fail_first:
+                return web.Response(status=self.fail_status, headers={"Retry-After": "0"}, text="slow down")
+            if self.requests <= self.malformed_first:
+                # Missing "choices", then an empty list, alternately
+                return web.json_response({"choices": []} if self.requests % 2 == 0 else {"id": "cmpl-1"})
+            if self.requests <= self.truncated_first:
+                # Cut-off JSON body, then a non-JSON content type, alternately
+                if self.requests % 2 == 0:
+                    return web.Response(status=200, text="upstream hiccup")
+                return web.Response(status=200, content_type="application/json",
+                                    text='{"choices": [{"message": {"content": "echo')
+            body = await request.json()
+            prompt = body["messages"][-1]["content"]
+            return web.json_response({
+                "choices": [{"message": {"content": f"echo: {prompt}"}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5}
+            })
+        finally:
+            self.in_flight -= 1
+
+
+async def _with_stub(stub, fn, **client_kwargs):
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", stub.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    tmp = tempfile.mkdtemp()
+    client = AsyncLLMClient(
+        base_url=f"http://127.0.0.1:{port}/v1", api_key="test",
+        cache_db=os.path.join(tmp, "cache.db"), log_file=os.path.join(tmp, "logs", "llm.jsonl"),
+        rate_limit=1000, burst=1000, backoff_base=0.01, backoff_max=0.05,
+        **client_kwargs
+    )
+    try:
+        return await fn(client)
+    finally:
+        await client.close()
+        client.cache.close()
+        await runner.cleanup()
+
+
+def _messages(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_retries_on_429_then_succeeds():
+    stub = StubProvider(fail_first=2)
+
+    async def scenario(client):
+        return await client.call("gpt-4-turbo", _messages("hello"), tier="tier1"), client.usage
+
+    response, usage = asyncio.run(_with_stub(stub, scenario))
+    assert response == "echo: hello"
+    assert stub.requests == 3
+    assert usage["retries"] == 2
+    assert usage["prompt_tokens"] == 10
+
+
+def test_gives_up_after_max_retries():
+    stub = StubProvider(fail_first=100, fail_status=503)
+
+    async def scenario(client):
+        try:
+            await client.call("gpt-4-turbo", _messages("x"), tier="tier1")
+        except LLMProviderError as e:
+            return e.status
+        return None
+
+    status = asyncio.run(_with_stub(stub, scenario, max_retries=2))
+    assert status == 503
+    assert stub.requests == 3
+
+
+def test_non_retryable_error_is_not_retried():
+    stub = StubProvider(fail_first=100, fail_status=400)
+
+    async def scenario(client):
+        try:
+            await client.call("gpt-4-turbo", _messages("x"))
+        except LLMProviderError as e:
+            return e.status
+
+    assert asyncio.run(_with_stub(stub, scenario)) == 400
+    assert stub.requests == 1
+
+
+def test_malformed_response_is_retried():
+    stub = StubProvider(malformed_first=2)
+
+    async def scenario(client):
+        return await client.call("gpt-4-turbo", _messages("hi")), client.usage
+
+    response, usage = asyncio.run(_with_stub(stub, scenario))
+    assert response == "echo: hi"
+    assert stub.requests == 3 and usage["retries"] == 2 and usage["requests"] == 1
+
+    # Never well-formed: a provider error after the retries, not a KeyError
+    stub = StubProvider(malformed_first=100)
+
+    async def failing(client):
+        try:
+            await client.call("gpt-4-turbo", _messages("x"))
+        except LLMProviderError as e:
+            return e.status, str(e)
+
+    status, message = asyncio.run(_with_stub(stub, failing, max_retries=2))
+    assert status == 200 and "malformed" in message
+
+
+def test_unparsable_body_is_retried():
+    stub = StubProvider(truncated_first=2)
+
+    async def scenario(client):
+        return await client.call("gpt-4-turbo", _messages("hi")), client.usage
+
+    response, usage = asyncio.run(_with_stub(stub, scenario))
+    assert response == "echo: hi"
+    assert stub.requests == 3 and usage["retries"] == 2 and usage["requests"] == 1
+
+    stub = StubProvider(truncated_first=100)
+
+    async def failing(client):
+        try:
+            await client.call("gpt-4-turbo", _messages("x"))
+        except LLMProviderError as e:
+            return e.status, str(e)
+
+    status, message = asyncio.run(_with_stub(stub, failing, max_retries=2))
+    assert status == 200 and "malformed" in message and stub.requests == 3
+    assert stub.requests == 3
+
+
+def test_tier_concurrency_limit_and_cache():
+    stub = StubProvider(delay=0.05)
+
+    async def scenario(client):
+        prompts = [f"lead {i}" for i in range(12)]
+        first = await asyncio.gather(*(client.call("gpt-4-turbo", _messages(p), tier="tier1") for p in prompts))
+        # Same prompts again: served from cache, no new requests
+        second = await asyncio.gather(*(client.call("gpt-4-turbo", _messages(p), tier="tier1") for p in prompts))
+        return first, second
+
+    first, second = asyncio.run(_with_stub(stub, scenario, tier_concurrency={"tier1": 3}))
+    assert first == second
+    assert stub.requests == 12
+    assert stub.max_in_flight <= 3, f"Concurrency limit exceeded: {stub.max_in_flight}"
+
+
+if __name__ == "__main__":
+    test_retries_on_429_then_succeeds()
+    test_gives_up_after_max_retries()
+    test_non_retryable_error_is_not_retried()
+    test_malformed_response_is_retried()
+    test_unparsable_body_is_retried()
+    test_tier_concurrency_limit_and_cache()
+    print("✅ ALL ASYNC LLM CLIENT TESTS PASSED")
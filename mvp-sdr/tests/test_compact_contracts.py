@@ -0,0 +1,80 @@
+"""
+Compact Contracts Test
+Ensures CompactLead / CompactAngleSignals round-trip losslessly with the
+pydantic contracts, agents produce identical output for both representations,
+and the governor fast path fills missing signals.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from agent_context import AgentContext
+from contracts import AngleSignals, NormalizedLead
+from compact_contracts import CompactAngleSignals, CompactLead, SIGNAL_FIELDS
+from agents.enrichment_agent import EnrichmentAgent
+from agents.pain_profiler import PainProfiler
+from agents.angle_router import AngleRouter
+from agents.hook_engine import HookEngine
+from schema_governor import SchemaGovernor
+
+ROWS = [
+    {"name": "Dana Levi", "company": "Acme", "title": "CTO", "linkedin_bio": "Scaling squads", "employees": "120"},
+    {"name": "Sam", "company": "Globex", "title": "Engineering Manager", "linkedin_bio": "", "employees": "4000"},
+    {"name": "Kim Park", "company": "Initech", "title": "Senior Engineer", "linkedin_bio": "Chaos", "employees": "30"},
+]
+
+
+def test_round_trip_and_agent_parity():
+    agent = EnrichmentAgent(AgentContext.in_directory(tempfile.mkdtemp()))
+    profiler, router, hooks = PainProfiler(), AngleRouter(), HookEngine()
+
+    for row in ROWS:
+        compact = agent.run_compact(row)
+        model = agent.run(row)
+        assert isinstance(model, NormalizedLead)
+        assert compact.dict() == model.dict()
+        assert list(compact.dict()) == list(model.dict())
+        assert str(compact.angle_signals) == str(model.angle_signals)
+
+        assert CompactLead.from_model(model).dict() == model.dict()
+        assert CompactLead.from_dict(model.dict()).to_model() == model
+
+        pain = profiler.run(compact)
+        assert pain == profiler.run(model)
+        assert router.run(compact, pain["primary_pain"]) == router.run(model, pain["primary_pain"])
+        assert hooks.run(compact, "Predictability") == hooks.run(model, "Predictability")
+
+
+def test_signal_codes():
+    a = CompactAngleSignals(delivery_pressure="high", team_structure="squads")
+    b = CompactAngleSignals.from_model(AngleSignals(**{f: getattr(a, f) or "x" for f in SIGNAL_FIELDS}))
+    assert all(isinstance(code, int) for code in a.codes)
+    assert a.delivery_pressure == b.delivery_pressure == "high"
+    assert a == CompactAngleSignals.from_codes(a.codes) and a != b
+    assert len(a.missing()) == len(SIGNAL_FIELDS) - 2
+
+    # Unseen values are interned, not rejected
+    a.team_structure = "guilds"
+    assert a.team_structure == "guilds"
+    assert CompactAngleSignals(team_structure="guilds").codes[2] == a.codes[2]
+
+
+def test_governor_fast_path():
+    lead = CompactLead(first_name="", last_name="B", company="C",
+                       angle_signals=CompactAngleSignals(delivery_pressure="high"))
+    result = SchemaGovernor().validate_normalized_lead(lead, "B")
+    assert not result.failed_safe
+    assert lead.first_name == "Unknown"
+    assert lead.angle_signals.missing() == []
+    assert lead.angle_signals.organizational_stage_signal == "growing"
+    assert result.corrections_applied["angle_signals.team_structure"] == "functional"
+    lead.to_model()  # Passes pydantic validation after corrections
+
+
+if __name__ == "__main__":
+    test_round_trip_and_agent_parity()
+    test_signal_codes()
+    test_governor_fast_path()
+    print("✅ ALL COMPACT CONTRACT TESTS PASSED")
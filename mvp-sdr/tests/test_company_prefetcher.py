@@ -0,0 +1,66 @@
+"""
+Company Prefetcher Test
+Ensures the dry run sizes the quota without fetching (jobs lookups of
+uncached companies included), the real run fetches companies and their
+domains once, and a warm cache fetches nothing.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from agents.company_prefetcher import CompanyPrefetcher
+from tools.brightdata_client import BrightDataClient
+
+LEADS = [
+    {"name": "Alice", "company": "TechFlow"},
+    {"name": "Bob", "company": "ScaleUp Inc"},
+    {"name": "Carol", "company": "CyberShield"},
+    {"name": "Dan", "company": "TechFlow"},
+    {"name": "Eve", "company": ""},
+]
+
+
+class CountingClient(BrightDataClient):
+    def __init__(self, cache_db):
+        super().__init__(cache_db=cache_db)
+        self.calls = []
+
+    def _fetch_company(self, company_name, cache_key):
+        self.calls.append(("company", company_name))
+        return super()._fetch_company(company_name, cache_key)
+
+    def _fetch_job_postings(self, domain, cache_key):
+        self.calls.append(("jobs", domain))
+        return super()._fetch_job_postings(domain, cache_key)
+
+
+def test_dry_run_and_real_counts():
+    with tempfile.TemporaryDirectory() as tmp:
+        client = CountingClient(os.path.join(tmp, "brightdata_cache.db"))
+        prefetcher = CompanyPrefetcher(client=client, rate_limit=1000)
+
+        plan = prefetcher.run(LEADS, dry_run=True)
+        assert client.calls == []
+        assert plan["leads_scanned"] == 5 and plan["unique_companies"] == 3
+        # Domains are unknown on a cold cache: one jobs lookup per uncached company
+        assert plan["unique_domains"] == 0 and plan["jobs_unknown"] == 3
+        assert plan["to_fetch"] == 6 and plan["fetched"] == 0
+
+        report = prefetcher.run(LEADS)
+        assert sorted(client.calls) == [("company", "CyberShield"), ("company", "ScaleUp Inc"),
+                                        ("company", "TechFlow"), ("jobs", "cybersecurity"), ("jobs", "saas")]
+        assert report["unique_domains"] == 2 and report["jobs_unknown"] == 0
+        assert report["to_fetch"] == report["fetched"] == 5 and report["failed"] == 0
+        # The dry run never under-counts the real fetches
+        assert plan["to_fetch"] >= report["fetched"]
+
+        warm = prefetcher.run(LEADS, dry_run=True)
+        assert warm["to_fetch"] == 0 and warm["jobs_unknown"] == 0 and warm["cache_hit_ratio"] == 1.0
+        client.cache.close()
+
+
+if __name__ == "__main__":
+    test_dry_run_and_real_counts()
+    print("✅ ALL COMPANY PREFETCHER TESTS PASSED")
@@ -0,0 +1,99 @@
+"""
+CSE Batch Scoring Test
+Ensures CSEEngine.process_batch matches process() lead for lead, builds the
+trace only on request, and stays well inside the per-lead latency budget.
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from cse.engine import CSEEngine
+from cse.config import MAX_CSE_LATENCY_MS
+from cse.schema import (
+    RawContext, BrightDataOutput, EnrichmentOutput, PainProfilerOutput,
+    AngleRouterOutput, EmailWriterOutput
+)
+
+PAINS = ["execution friction", "enterprise scale-up drag", "Too many initiatives", "Silent attrition"]
+ANGLES = ["Execution Velocity", "Predictability", "Team Health"]
+
+
+def _contexts(n, seed=7):
+    """Deterministic mix of complete, partial and fallback-triggering contexts"""
+    rng = random.Random(seed)
+    contexts = []
+    for i in range(n):
+        headcount = rng.choice([0, 12, 45, 120, 800, 15000])
+        contexts.append(RawContext(
+            lead_name=f"Lead {i}",
+            lead_company=f"Company {i % 50}",
+            lead_title="CTO",
+            brightdata=None if i % 11 == 0 else BrightDataOutput(
+                raw_headcount=headcount,
+                raw_open_roles=rng.choice([None, 0, 3, 40]),
+                raw_churn_rate=rng.choice([None, 0.05, 0.3])
+            ),
+            enrichment=EnrichmentOutput(raw_company_category="SaaS") if i % 3 == 0 else None,
+            pain=None if i % 7 == 0 else PainProfilerOutput(
+                pain_candidates=rng.sample(PAINS, rng.randint(0, 4)),
+                primary_pain=rng.choice(PAINS)
+            ),
+            angle=None if i % 13 == 0 else AngleRouterOutput(
+                candidate_angles=ANGLES,
+                selected_angle=rng.choice(ANGLES),
+                rejected_angles=ANGLES[:1]
+            ),
+            email=None if i % 5 == 0 else EmailWriterOutput(
+                personalization_depth=rng.choice([None, 0.2, 0.7])
+            )
+        ))
+    return contexts
+
+
+def test_batch_matches_single_lead_processing():
+    engine = CSEEngine()
+    batch = engine.process_batch(_contexts(300))
+
+    for expected_ctx, result in zip(_contexts(300), batch):
+        expected = CSEEngine().process(expected_ctx)
+        for key in ("lead_score", "priority_tier", "avg_confidence", "min_confidence",
+                    "explanation_summary", "data_quality_flag"):
+            assert result[key] == expected[key], (key, result[key], expected[key])
+        assert "trace" not in result
+
+
+def test_trace_only_on_request():
+    contexts = _contexts(40)
+    batch = CSEEngine().process_batch(contexts, include_trace=True)
+
+    for expected_ctx, result in zip(_contexts(40), batch):
+        expected = CSEEngine().process(expected_ctx)["trace"]
+        trace = result["trace"]
+        for key in ("normalized_signals", "weighted_signals", "conflicts", "confidence",
+                    "score_breakdown", "full_explanation", "fallbacks_applied"):
+            assert trace[key] == expected[key], key
+        stages = [entry["stage"] for entry in trace["lineage"]]
+        assert stages == [entry["stage"] for entry in expected["lineage"]]
+
+
+def test_batch_latency_budget():
+    contexts = _contexts(20000)
+    engine = CSEEngine()
+
+    start = time.time()
+    results = engine.process_batch(contexts)
+    per_lead_ms = (time.time() - start) * 1000 / len(contexts)
+
+    assert len(results) == len(contexts)
+    print(f"   process_batch: {per_lead_ms:.4f} ms/lead")
+    assert per_lead_ms < MAX_CSE_LATENCY_MS / 20, f"Too slow: {per_lead_ms:.4f} ms/lead"
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_lead_processing()
+    test_trace_only_on_request()
+    test_batch_latency_budget()
+    print("✅ ALL CSE BATCH TESTS PASSED")
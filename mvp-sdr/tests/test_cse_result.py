@@ -0,0 +1,89 @@
+"""
+CSE Result Test
+Ensures trace sections are built lazily, trace_level controls what is kept,
+and results export and pickle as plain data.
+"""
+
+import sys
+import os
+import json
+import pickle
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from cse.engine import CSEEngine
+from cse.explainer import Explainer
+from cse.result import TRACE_SECTIONS
+from cse.schema import RawContext, BrightDataOutput, PainProfilerOutput, AngleRouterOutput, EmailWriterOutput
+
+
+def _context():
+    return RawContext(
+        lead_name="Lead",
+        lead_company="TechFlow",
+        lead_title="CTO",
+        brightdata=BrightDataOutput(raw_headcount=120, raw_open_roles=6),
+        pain=PainProfilerOutput(pain_candidates=["execution friction"], primary_pain="execution friction"),
+        angle=AngleRouterOutput(candidate_angles=["Predictability"], selected_angle="Predictability",
+                                rejected_angles=["Team Health"]),
+        email=EmailWriterOutput(personalization_depth=0.7)
+    )
+
+
+def test_full_explanation_built_on_access():
+    calls = []
+    original = Explainer.generate_full_explanation
+
+    def counting(self, *args, **kwargs):
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    Explainer.generate_full_explanation = counting
+    try:
+        result = CSEEngine().process(_context())
+        assert result["priority_tier"] in ("A", "B", "C")
+        assert result["trace"]["normalized_signals"]["pain_strength"] == 0.2
+        assert calls == []
+
+        justification = result["trace"]["tier_justification"]
+        assert justification == result["trace"]["full_explanation"]["tier_justification"]
+        assert len(calls) == 1  # cached after first build
+    finally:
+        Explainer.generate_full_explanation = original
+
+
+def test_trace_levels():
+    full = CSEEngine(trace_level="full").process(_context())
+    summary = CSEEngine(trace_level="summary").process(_context())
+    off = CSEEngine(trace_level="off").process(_context())
+
+    assert list(full["trace"]) == list(TRACE_SECTIONS)
+    assert "full_explanation" not in summary["trace"]
+    assert "tier_justification" not in summary["trace"]
+    assert "trace" not in off and off.trace_dict() == {}
+    assert full["lead_score"] == summary["lead_score"] == off["lead_score"]
+
+    try:
+        CSEEngine(trace_level="verbose")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Invalid trace level accepted")
+
+
+def test_export_and_pickle():
+    result = CSEEngine().process(_context())
+    exported = result.to_dict()
+    json.dumps(exported)  # plain data only
+    assert set(exported) == set(result.SUMMARY_FIELDS) | {"trace"}
+    assert exported["trace"]["full_explanation"]["rejected_alternatives"] == ["Rejected: Team Health (lower relevance)"]
+
+    restored = pickle.loads(pickle.dumps(CSEEngine().process(_context())))
+    assert restored["lead_score"] == result["lead_score"]
+    assert restored.trace_dict()["conflicts"] == exported["trace"]["conflicts"]
+
+
+if __name__ == "__main__":
+    test_full_explanation_built_on_access()
+    test_trace_levels()
+    test_export_and_pickle()
+    print("✅ ALL CSE RESULT TESTS PASSED")
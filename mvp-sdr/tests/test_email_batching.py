@@ -0,0 +1,92 @@
+"""
+Email Batching Test
+Ensures batched email generation matches per-lead generation offline (mock
+provider), and that items missing from a batch response fall back to
+individual calls.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+from contracts import NormalizedLead, AngleSignals
+from agent_context import AgentContext
+from agents.email_writer import EmailWriter, EmailBatcher
+
+
+def _lead(name, role, company="TechFlow"):
+    return NormalizedLead(
+        first_name=name, last_name="Doe", role_title=role, role_seniority="VP",
+        company=company, industry="SaaS", company_size=120,
+        angle_signals=AngleSignals(
+            delivery_pressure="high", product_complexity="medium", team_structure="multi-team",
+            engineering_maturity="medium", decision_maker_level="executive",
+            execution_noise_level="high", multi_team_coordination="high",
+            organizational_stage_signal="scaleup"
+        )
+    )
+
+
+ITEMS = [
+    (_lead("Dana", "VP R&D"), "Cross-team flow collapse", "Execution Velocity"),
+    (_lead("Sam", "Head of Engineering"), "Too many initiatives", "Predictability"),
+    (_lead("Kai", "CTO", "Nimbus"), "No delegation layer", "Firefighting Spiral"),
+]
+
+
+def test_batch_matches_individual_calls():
+    writer = EmailWriter(AgentContext.in_directory(tempfile.mkdtemp()))
+    batched = writer.run_batch(ITEMS)
+    single = [writer.run(*item) for item in ITEMS]
+    assert [e.dict() for e in batched] == [e.dict() for e in single]
+
+
+def test_missing_items_fall_back_to_individual_calls():
+    prompts = []
+
+    class PartialAdapter:
+        """Batch response drops lead 1; individual calls echo a marker."""
+        def call(self, prompt, tier="tier2", schema=None):
+            prompts.append(prompt)
+            if schema:
+                return {"emails": [{"id": 0, "body": "batched 0"}, {"id": 2, "body": "batched 2"}]}
+            return "individual"
+
+    writer = EmailWriter(AgentContext.in_directory(tempfile.mkdtemp(), llm_adapter=PartialAdapter()))
+    outputs = writer.run_batch(ITEMS)
+
+    assert [e.body for e in outputs] == ["batched 0", "individual", "batched 2"]
+    assert len(prompts) == 2  # one batch request + one fallback
+
+
+def test_batcher_groups_concurrent_requests():
+    writer = EmailWriter(AgentContext.in_directory(tempfile.mkdtemp()))
+    batch_sizes = []
+    original = writer.arun_batch
+
+    async def counting(items):
+        batch_sizes.append(len(items))
+        return await original(items)
+
+    writer.arun_batch = counting
+
+    async def scenario():
+        batcher = EmailBatcher(writer, batch_size=2, max_wait=0.01)
+        outputs = await asyncio.gather(*(batcher.submit(*item) for item in ITEMS))
+        await batcher.aclose()
+        return outputs
+
+    outputs = asyncio.run(scenario())
+    assert batch_sizes == [2, 1]
+    assert [e.angle_used for e in outputs] == [item[2] for item in ITEMS]
+
+
+if __name__ == "__main__":
+    test_batch_matches_individual_calls()
+    test_missing_items_fall_back_to_individual_calls()
+    test_batcher_groups_concurrent_requests()
+    print("✅ ALL EMAIL BATCHING TESTS PASSED")
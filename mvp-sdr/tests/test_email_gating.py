@@ -0,0 +1,83 @@
+"""
+Email Gating Test
+Ensures score-before-write mode only spends LLM calls on leads whose
+provisional tier clears the threshold, gated-out leads get a template or no
+email, and provisional scores match the final ones.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+from agent_context import AgentContext
+from pipeline_executor import PipelineExecutor
+from tools.csv_lead_input import CSVLeadInput
+
+LEADS = list(CSVLeadInput(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "leads.csv")))[:10]
+
+
+class CountingAdapter:
+    """Wraps the real adapter and counts LLM email calls"""
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.calls = 0
+
+    async def acall(self, *args, **kwargs):
+        self.calls += 1
+        return await self.adapter.acall(*args, **kwargs)
+
+    async def aclose(self):
+        await self.adapter.aclose()
+
+
+def _run(**options):
+    executor = PipelineExecutor(context=AgentContext.in_directory(tempfile.mkdtemp()), **options)
+    adapter = CountingAdapter(executor.email_writer.adapter)
+    executor.email_writer.adapter = adapter
+    rows = [row for row, _ in executor.run(LEADS)]
+    return rows, adapter.calls, executor
+
+
+def test_gate_off_matches_ungated_scores():
+    baseline, calls, _ = _run()
+    assert calls == len(LEADS)
+
+    # Tier C clears every lead: same LLM emails and scores, plus the gate columns
+    gated, calls, _ = _run(email_min_tier="C")
+    assert calls == len(LEADS)
+    for base, row in zip(baseline, gated):
+        assert row["provisional_tier"] == row["priority_tier"] and row["email_mode"] == "llm"
+        assert {k: v for k, v in row.items() if k not in ("email_mode", "provisional_tier")} == base
+
+
+def test_low_tiers_skip_llm():
+    rows, calls, executor = _run(email_min_tier="A")
+    gated = [row for row in rows if row["provisional_tier"] != "A"]
+    assert gated and calls == len(rows) - len(gated)
+    assert all(row["email_mode"] == "template" and row["body"] for row in gated)
+    assert executor.metrics.counter("emails", mode="template") == len(gated)
+    assert executor.metrics.counter("fallbacks") == 0  # Gating is not a fallback
+
+    rows, calls, _ = _run(email_min_tier="A", gated_email="none")
+    skipped = [row for row in rows if row["email_mode"] == "none"]
+    assert len(skipped) == len(gated) and calls == len(rows) - len(skipped)
+    assert all(row["body"] == "" and row["email"] == "" and row["tokens"] == 0 for row in skipped)
+
+
+def test_invalid_options():
+    for options in ({"email_min_tier": "Z"}, {"gated_email": "llm"}):
+        try:
+            PipelineExecutor(**options)
+            assert False, options
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_gate_off_matches_ungated_scores()
+    test_low_tiers_skip_llm()
+    test_invalid_options()
+    print("✅ ALL EMAIL GATING TESTS PASSED")
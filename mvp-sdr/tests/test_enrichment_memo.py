@@ -0,0 +1,74 @@
+"""
+Enrichment Memo Test
+Ensures enrichment output is reused for identical (normalized) lead features,
+persists across runs, is invalidated by the version / source stamps, and is
+shared between EnrichmentAgent and LLMAdapter.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from tools.enrichment_memo import EnrichmentMemo, enrichment_key, MOCK_SOURCE
+from agent_context import AgentContext
+from agents.enrichment_agent import EnrichmentAgent
+
+
+def _temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_keys_normalize_and_stamp():
+    key = enrichment_key("CTO", "Acme", "Scaling  squads", MOCK_SOURCE)
+    assert key == enrichment_key(" cto ", "ACME", "scaling squads", MOCK_SOURCE)
+    assert key != enrichment_key("CTO", "Acme", "Scaling squads", "gpt-3.5-turbo")
+    assert key != enrichment_key("CTO", "Acme", "Scaling squads", MOCK_SOURCE, version="v0")
+
+
+def test_agent_reuses_and_persists():
+    path = _temp_db()
+    agent = EnrichmentAgent(AgentContext.in_directory(tempfile.mkdtemp()), memo=EnrichmentMemo.open(path))
+    calls = []
+    enrich = agent._enrich
+    agent._enrich = lambda *args: calls.append(args) or enrich(*args)
+
+    row = {"name": "Dana Levi", "company": "Acme", "title": "VP R&D", "linkedin_bio": "Scaling", "employees": "120"}
+    first = agent.run_compact(row)
+    second = agent.run_compact(dict(row, name="Noa Cohen", employees="900", title="vp r&d"))
+    assert len(calls) == 1
+    assert second.angle_signals == first.angle_signals
+    assert second.company_stage == "growth"  # Row fields outside the key are still applied
+    agent.memo.cache.close()
+
+    # New process-level cache on the same file: served from disk
+    memo = EnrichmentMemo.open(path)
+    assert memo.get("VP R&D", "Acme", "Scaling", MOCK_SOURCE)["angle_signals"] == first.angle_signals.dict()
+    assert memo.get("VP R&D", "Acme", "Scaling", "gpt-3.5-turbo") is None
+    assert EnrichmentMemo(memo.cache, version="v2").get("VP R&D", "Acme", "Scaling", MOCK_SOURCE) is None
+    memo.cache.close()
+    os.remove(path)
+
+
+def test_shared_with_llm_adapter():
+    path = _temp_db()
+    memo = EnrichmentMemo.open(path)
+    context = AgentContext.in_directory(tempfile.mkdtemp(), enrichment_memo=memo)
+    agent, adapter = EnrichmentAgent(context), context.llm_adapter
+    assert agent.memo is adapter.enrichment_memo is memo
+
+    agent.run_compact({"name": "Kim Park", "company": "Initech", "title": "CTO", "linkedin_bio": "", "employees": "30"})
+    adapter.mock_provider._mock_enrichment = lambda prompt: (_ for _ in ()).throw(AssertionError("memo miss"))
+    data = adapter.enrich("CTO", "Initech", "")
+    assert data["angle_signals"]["decision_maker_level"]
+    memo.cache.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    test_keys_normalize_and_stamp()
+    test_agent_reuses_and_persists()
+    test_shared_with_llm_adapter()
+    print("✅ ALL ENRICHMENT MEMO TESTS PASSED")
@@ -0,0 +1,113 @@
+"""
+Hook Catalog Test
+Ensures the compiled catalog returns exactly the hooks of the original
+exact -> partial -> default chain, and that campaign variants and hot reload
+work.
+"""
+
+import sys
+import os
+import json
+import itertools
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from agents.hook_engine import HookEngine
+from compact_contracts import CompactAngleSignals, CompactLead
+from tools.hook_catalog import HookCatalog, compile_campaign
+
+
+def _legacy_hook(role, stage, angle):
+    """The original hard-coded HookEngine chain (reference implementation)"""
+    exact_hooks = {
+        ("executive", "breaking", "Predictability"): "Teams move fast but the system doesn't keep up. That's when predictability breaks.",
+        ("executive", "scaleup", "Delivery Stability"): "Your org hits the point where alignment becomes more expensive than the code.",
+        ("senior-lead", "complex", "Strategy-to-Execution Gap"): "When surface area expands, decision-making slows down unless you constrain the work.",
+    }
+    partial_hooks = {
+        ("startup", "Execution Velocity"): "At this stage, speed is oxygen, but process is the enemy.",
+        ("scaleup", "Predictability"): "Scaling breaks things, usually starting with the roadmap.",
+        ("growth", "Cross-Team Flow"): "Silos start to form naturally when you cross the 100-person mark.",
+        ("enterprise", "Multi-Initiative Management"): "Managing dependencies across this many teams is a full-time job.",
+    }
+    default_hooks = {
+        "Predictability": "Engineering leaders often trade speed for predictability, but you shouldn't have to.",
+        "Execution Velocity": "Most teams slow down as they grow, but it's not inevitable.",
+        "Cross-Team Flow": "Dependencies kill momentum more than bad code ever could.",
+        "Team Health": "Burnout doesn't happen overnight; it happens when friction becomes normal.",
+        "Strategic Clarity": "The gap between strategy and execution is where value gets lost.",
+        "Firefighting Spiral": "If you're always fighting fires, you can't build the fire station.",
+        "Silent Attrition": "The best engineers leave when they feel blocked, not when they're overworked.",
+        "Rebuild Trust": "Trust erodes when delivery slips, and it's hard to earn back.",
+    }
+    if (role, stage, angle) in exact_hooks:
+        return exact_hooks[(role, stage, angle)]
+    if (stage, angle) in partial_hooks:
+        return partial_hooks[(stage, angle)]
+    return default_hooks.get(angle, "We help engineering teams move faster.")
+
+
+def _lead(role, stage):
+    return CompactLead(first_name="A", last_name="B", company="C", role_seniority=role,
+                       company_stage=stage, angle_signals=CompactAngleSignals())
+
+
+def _write(path, doc):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+
+
+def test_matches_legacy_chain():
+    engine = HookEngine()
+    roles = ["executive", "senior-lead", "manager", "ic", None, "VP"]
+    stages = ["startup", "scaleup", "growth", "enterprise", "breaking", "complex", None]
+    angles = ["Predictability", "Delivery Stability", "Strategy-to-Execution Gap", "Execution Velocity",
+              "Cross-Team Flow", "Team Health", "Multi-Initiative Management", "Rebuild Trust", "Unknown"]
+    for role, stage, angle in itertools.product(roles, stages, angles):
+        assert engine.run(_lead(role, stage), angle) == _legacy_hook(role, stage, angle), (role, stage, angle)
+
+
+def test_specificity_and_campaigns():
+    table, _ = compile_campaign([
+        {"seniority": "*", "stage": "*", "angle": "*", "text": "any"},
+        {"seniority": "ic", "stage": "*", "angle": "*", "text": "ic"},
+        {"seniority": "ic", "stage": "startup", "angle": "*", "text": "ic startup"},
+    ])
+    assert table[("ic", "startup", "*")] == "ic startup"
+    assert table[("ic", "*", "*")] == "ic"
+    assert table[("*", "startup", "*")] == "any"
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    _write(path, {"campaigns": {
+        "default": {"hooks": [{"seniority": "*", "stage": "*", "angle": "*", "text": "base"},
+                              {"seniority": "*", "stage": "*", "angle": "Team Health", "text": "health"}]},
+        "q3": {"extends": "default", "hooks": [{"seniority": "*", "stage": "*", "angle": "Team Health", "text": "q3 health"}]},
+    }})
+    catalog = HookCatalog(path, reload_interval=0)
+    engine = HookEngine(catalog)
+    assert engine.run(_lead("ic", "startup"), "Team Health") == "health"
+    assert engine.run(_lead("ic", "startup"), "Team Health", campaign="q3") == "q3 health"
+    assert HookEngine(catalog, campaign="q3").run(_lead("ic", None), "Other") == "base"
+    try:
+        engine.run(_lead("ic", None), "Other", campaign="missing")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown campaign accepted")
+
+    # Hot reload: picked up on the next lookup; a broken file keeps the last good catalog
+    _write(path, {"campaigns": {"default": {"hooks": [{"angle": "*", "text": "reloaded"}]}}})
+    os.utime(path, ns=(1, 1))
+    assert engine.run(_lead("ic", None), "Team Health") == "reloaded"
+    with open(path, "w") as f:
+        f.write("{not json")
+    os.utime(path, ns=(2, 2))
+    assert engine.run(_lead("ic", None), "Team Health") == "reloaded"
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    test_matches_legacy_chain()
+    test_specificity_and_campaigns()
+    print("✅ ALL HOOK CATALOG TESTS PASSED")
@@ -0,0 +1,143 @@
+"""
+Lead Dedup Test
+Ensures company and person spellings are merged by normalization, domain
+and fuzzy matching inside blocks, distinct entities (including short names
+one letter apart) stay apart, matching
+cost grows linearly, and BrightData receives the canonical company.
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from agents.lead_deduplicator import LeadDeduplicator, normalize_company, extract_domain
+from agents.brightdata_enrichment_agent import BrightDataEnrichmentAgent
+
+
+def test_company_resolution():
+    assert normalize_company("Scaleup, Inc.") == normalize_company("ScaleUp Inc") == "scaleup"
+    assert extract_domain({"website": "https://www.Globex.com/about"}) == "globex.com"
+    assert extract_domain({"email": "hank@globex.com"}) == "globex.com"
+
+    dedup = LeadDeduplicator()
+    scaleup = dedup.resolve_company("ScaleUp Inc")
+    assert dedup.resolve_company("Scaleup, Inc.") == scaleup
+    assert dedup.resolve_company("Scale-Up Ltd") == scaleup
+    techflow = dedup.resolve_company("TechFlow")
+    assert dedup.resolve_company("Techflow Solutions") != techflow  # Extra word: too far apart
+    assert dedup.resolve_company("TechFlw") != techflow             # Short names: one letter is another company
+    cybershield = dedup.resolve_company("CyberShield")
+    assert dedup.resolve_company("CyberSheild") == cybershield      # Long name typo: fuzzy match in block
+    assert dedup.resolve_company("Acme") != dedup.resolve_company("Apex")
+    assert dedup.resolve_company("Stripe") != dedup.resolve_company("Stripes")
+    assert dedup.resolve_company("Monday") != dedup.resolve_company("Mondays")
+    assert dedup.resolve_company("Stripes", "stripe.com") == dedup.resolve_company("Stripe", "stripe.com")
+
+    # Domains merge different names and split identical ones
+    globex = dedup.resolve_company("Globex", "globex.com")
+    assert dedup.resolve_company("Globex Corporation International", "globex.com") == globex
+    assert dedup.resolve_company("Globex", "globex.io") != globex
+    # ...but a shared domain does not merge clearly different names
+    assert dedup.resolve_company("Initech", "globex.com") != globex
+
+
+def test_free_mail_domains_are_not_company_domains():
+    assert extract_domain({"email": "john@gmail.com"}) == ""
+    assert extract_domain({"email": "john@Outlook.com", "website": "acme.com"}) == "acme.com"
+    unique = LeadDeduplicator().run([
+        {"name": "John Doe", "company": "Acme", "email": "john@gmail.com"},
+        {"name": "Mary Roe", "company": "Globex", "email": "mary@gmail.com"},
+        {"name": "Ann Poe", "company": "Acme", "email": "ann@yahoo.com"},
+    ])
+    assert [lead["canonical_company"] for lead in unique] == ["Acme", "Globex", "Acme"]
+
+
+def test_people_merge_within_company():
+    leads = [
+        {"name": "Robert Smith", "company": "ScaleUp Inc", "title": "Head of Engineering"},
+        {"name": "robert  smith", "company": "Scaleup, Inc.", "title": "VP Engineering"},
+        {"name": "Robert Smtih", "company": "ScaleUp", "title": "Head of Engineering"},
+        {"name": "Robert Smith", "company": "CorpNet", "title": "CTO"},
+        {"name": "Alice Jones", "company": "ScaleUp Inc", "title": "CTO"},
+        {"name": "Maria Garcia", "company": "ScaleUp Inc", "title": "CFO"},
+        {"name": "Mario Garcia", "company": "ScaleUp Inc", "title": "COO"},
+        {"name": "Katherine Robertson", "company": "ScaleUp Inc", "title": "CMO"},
+        {"name": "Katherine Robretson", "company": "ScaleUp", "title": "CMO"},
+        {"name": "Katherine", "company": "ScaleUp Inc", "title": "CMO"},
+        {"name": "", "company": "ScaleUp Inc", "title": "CTO"},
+        {"name": "", "company": "ScaleUp Inc", "title": "CTO"},
+    ]
+    dedup = LeadDeduplicator()
+    unique = dedup.run(leads)
+    # Short tokens must match exactly ("Smtih", "Maria"/"Mario"); long ones tolerate a typo
+    assert [(lead["name"], lead["company"]) for lead in unique] == [
+        ("Robert Smith", "ScaleUp Inc"), ("Robert Smtih", "ScaleUp"), ("Robert Smith", "CorpNet"),
+        ("Alice Jones", "ScaleUp Inc"), ("Maria Garcia", "ScaleUp Inc"), ("Mario Garcia", "ScaleUp Inc"),
+        ("Katherine Robertson", "ScaleUp Inc"), ("Katherine", "ScaleUp Inc"),
+        ("", "ScaleUp Inc"), ("", "ScaleUp Inc"),
+    ]
+    assert all(lead["canonical_company"] in ("ScaleUp Inc", "CorpNet") for lead in unique)
+
+    report = dedup.report()
+    assert report["leads_scanned"] == 12 and report["unique_leads"] == 10 and report["duplicate_leads"] == 2
+    assert report["person_groups"] == [
+        {"canonical": {"row": 0, "name": "Robert Smith", "company": "ScaleUp Inc"},
+         "duplicates": [{"row": 1, "name": "robert  smith", "company": "Scaleup, Inc."}]},
+        {"canonical": {"row": 7, "name": "Katherine Robertson", "company": "ScaleUp Inc"},
+         "duplicates": [{"row": 8, "name": "Katherine Robretson", "company": "ScaleUp"}]},
+    ]
+    assert report["company_groups"][0]["spellings"] == {"ScaleUp Inc": 8, "Scaleup, Inc.": 1, "ScaleUp": 2}
+
+
+def _synthetic(n_companies, seed=5):
+    """Random company names with 3 people each, plus one lead per company under a typo'd spelling"""
+    rng = random.Random(seed)
+    people = ["Alice Jones", "Bruno Marsh", "Chen Wei"]
+    leads = []
+    for _ in range(n_companies):
+        company = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(12)).capitalize()
+        for name in people:
+            leads.append({"name": name, "company": company + rng.choice(["", " Inc", ", Inc.", " LLC"])})
+        typo = company[:7] + company[8] + company[7] + company[9:]
+        leads.append({"name": people[0], "company": typo})
+    rng.shuffle(leads)
+    return leads
+
+
+def test_cost_grows_linearly():
+    small, large = LeadDeduplicator(), LeadDeduplicator()
+    small.run(_synthetic(1000))
+    large.run(_synthetic(4000))
+    report = large.report()
+    # Nearly every typo'd spelling is merged (a transposition inside a letter run can fall below the threshold)
+    assert 4000 <= report["unique_companies"] <= 4010
+    assert 4000 * 3 <= report["unique_leads"] <= 4000 * 3 + 10
+    # 4x the leads: about 4x the comparisons, nowhere near the 16x of all-pairs
+    assert large.comparisons < 6 * small.comparisons
+
+
+def test_brightdata_uses_canonical_company():
+    class RecordingClient:
+        def __init__(self):
+            self.searched = []
+
+        def search_company(self, name):
+            self.searched.append(name)
+            return {}
+
+    client = RecordingClient()
+    agent = BrightDataEnrichmentAgent(client=client)
+    for lead in LeadDeduplicator().run([{"name": "A", "company": "ScaleUp Inc"},
+                                        {"name": "B", "company": "Scaleup, Inc."}]):
+        agent.run(lead)
+    assert client.searched == ["ScaleUp Inc", "ScaleUp Inc"]
+
+
+if __name__ == "__main__":
+    test_company_resolution()
+    test_free_mail_domains_are_not_company_domains()
+    test_people_merge_within_company()
+    test_cost_grows_linearly()
+    test_brightdata_uses_canonical_company()
+    print("✅ ALL LEAD DEDUP TESTS PASSED")
@@ -0,0 +1,89 @@
+"""
+LLM Log Writer Test
+Ensures LLMClient call logs go through the buffered background writer, cache
+hits can be logged as hashes, and the JSONL sink rotates and compresses.
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from llm_client import LLMClient
+from tools.logger import JSONLSink, QueueHandler
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_cache_hits_logged_as_hashes():
+    tmp = tempfile.mkdtemp()
+    log_file = os.path.join(tmp, "logs", "llm.jsonl")
+    client = LLMClient(cache_db=os.path.join(tmp, "cache.db"), log_file=log_file, log_cache_hits="hash")
+    messages = [{"role": "user", "content": "Write an email"}]
+
+    response = client.call("gpt-3.5-turbo", messages)
+    assert client.call("gpt-3.5-turbo", messages) == response
+    client.flush_logs()
+
+    miss, hit = _read(log_file)
+    assert miss["cache_hit"] is False and miss["messages"] == messages and miss["response"] == response
+    assert hit["cache_hit"] is True and "messages" not in hit and "response" not in hit
+    assert hit["prompt_hash"] == client._get_cache_key("gpt-3.5-turbo", messages)
+    assert len(hit["response_hash"]) == 64
+
+    client.log_cache_hits = "off"
+    client.call("gpt-3.5-turbo", messages)
+    client.flush_logs()
+    assert len(_read(log_file)) == 2
+
+
+def test_rotation_and_compression():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "calls.jsonl")
+    writer = QueueHandler([JSONLSink(path, max_bytes=2000, compress=True, backup_count=3)], max_batch=10)
+    for i in range(200):
+        writer.emit({"i": i, "payload": "x" * 50})
+    writer.close()
+
+    backups = [name for name in os.listdir(tmp) if name != "calls.jsonl"]
+    assert len(backups) == 3 and all(name.endswith(".gz") for name in backups)
+    rows = []
+    for name in sorted(backups):
+        with gzip.open(os.path.join(tmp, name), "rt", encoding="utf-8") as f:
+            rows += [json.loads(line)["i"] for line in f]
+    rows += [row["i"] for row in _read(path)]
+    assert rows == sorted(rows) and rows[-1] == 199  # Newest records kept, in order
+
+
+def test_bounded_queue_and_throughput():
+    tmp = tempfile.mkdtemp()
+    client = LLMClient(cache_db=os.path.join(tmp, "cache.db"), log_file=os.path.join(tmp, "llm.jsonl"))
+    messages = [{"role": "user", "content": "Enrich " + "profile " * 200}]
+    client.call("gpt-3.5-turbo", messages)
+
+    start = time.time()
+    for _ in range(5000):
+        client.call("gpt-3.5-turbo", messages)
+    client.flush_logs()
+    per_call_ms = (time.time() - start) * 1000 / 5000
+    print(f"   cached call + log: {per_call_ms:.4f} ms")
+    assert len(_read(client.log_file)) == 5001
+
+    dropping = QueueHandler([], max_queue=1, drop_when_full=True, flush_interval=0.2)
+    for i in range(50):
+        dropping.emit({"i": i})
+    assert dropping.dropped > 0
+    dropping.close()
+
+
+if __name__ == "__main__":
+    test_cache_hits_logged_as_hashes()
+    test_rotation_and_compression()
+    test_bounded_queue_and_throughput()
+    print("✅ ALL LLM LOG WRITER TESTS PASSED")
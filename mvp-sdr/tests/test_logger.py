@@ -0,0 +1,72 @@
+"""
+Logger Test
+Ensures disabled levels never format their arguments, per-lead DEBUG lines are
+sampled per key, and records reach the console and JSONL sinks through the
+background queue.
+"""
+
+import sys
+import os
+import io
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from tools.logger import Logger, QueueHandler, ConsoleSink, JSONLSink, DEBUG, INFO, WARN
+
+
+class Expensive:
+    """Counts how often it is rendered."""
+    renders = 0
+
+    def __str__(self):
+        Expensive.renders += 1
+        return "rendered"
+
+
+def test_disabled_levels_cost_nothing():
+    handler = QueueHandler([])
+    log = Logger("test", handler, level="WARN")
+    log.debug("signals: %s", Expensive())
+    log.info("signals: %s", Expensive())
+    assert Expensive.renders == 0
+    assert not log.enabled_for(INFO) and log.enabled_for(WARN)
+    handler.close()
+
+
+def test_sinks_and_sampling():
+    stream = io.StringIO()
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    handler = QueueHandler([ConsoleSink(stream), JSONLSink(path)])
+
+    log = Logger("test", handler, level=DEBUG, sample_rate=0.5)
+    leads = [f"Lead {i}" for i in range(200)]
+    for lead in leads:
+        log.debug("a %s", lead, sample_key=lead)
+        log.debug("b %s", lead, sample_key=lead)
+    log.warn("[GOVERNOR] [WARN] Missing: %s", "company", context={"lead": "Lead 0"})
+    log.log_metric("leads_processed", 200)
+    handler.flush()
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    debug_leads = [r["message"][2:] for r in records if r["level"] == "DEBUG"]
+    kept = set(debug_leads)
+    assert 50 < len(kept) < 150, len(kept)
+    assert all(debug_leads.count(lead) == 2 for lead in kept)  # A lead keeps all of its lines
+
+    assert records[-2]["lead"] == "Lead 0" and records[-2]["level"] == "WARN"
+    assert records[-1]["metric"] == "leads_processed" and records[-1]["value"] == 200
+
+    console = stream.getvalue().splitlines()
+    assert console[-2] == "[GOVERNOR] [WARN] Missing: company"
+    assert console[0].startswith("DEBUG: a ")
+    handler.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    test_disabled_levels_cost_nothing()
+    test_sinks_and_sampling()
+    print("✅ ALL LOGGER TESTS PASSED")
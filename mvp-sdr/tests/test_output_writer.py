@@ -0,0 +1,80 @@
+"""
+Streaming Output Writer Test
+Ensures the CSV header comes from the first row and stays fixed for the
+run, traces are written as one JSON object per line, and every written
+row is on disk before the writer is closed.
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from tools.output_writer import StreamingOutputWriter
+
+
+def _paths():
+    workdir = tempfile.mkdtemp()
+    return os.path.join(workdir, "emails.csv"), os.path.join(workdir, "trace.jsonl")
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_header_and_column_stability():
+    csv_path, trace_path = _paths()
+    with StreamingOutputWriter(csv_path, trace_path) as writer:
+        writer.write({"name": "Alice", "company": "TechFlow", "lead_score": 71}, {"lead_name": "Alice"})
+        # Later rows keep the first row's column order; missing fields are blank
+        writer.write({"lead_score": 42, "company": "ScaleUp", "name": "Bob"}, {"lead_name": "Bob"})
+        writer.write({"name": "Carol", "company": "CorpNet"}, {"lead_name": "Carol"})
+        try:
+            writer.write({"name": "Dan", "company": "Acme", "lead_score": 10, "extra": "x"}, {})
+            assert False, "a new column must not silently shift the CSV"
+        except ValueError:
+            pass
+
+    assert _read_csv(csv_path) == [
+        ["name", "company", "lead_score"],
+        ["Alice", "TechFlow", "71"],
+        ["Bob", "ScaleUp", "42"],
+        ["Carol", "CorpNet", ""],
+    ]
+    assert writer.count == 3
+
+
+def test_trace_jsonl():
+    csv_path, trace_path = _paths()
+    traces = [{"lead_name": "Alice", "trace": {"lineage": [{"stage": "cse", "data": {"score": 71}}]}},
+              {"lead_name": "Bob", "trace": {}}]
+    with StreamingOutputWriter(csv_path, trace_path) as writer:
+        for trace in traces:
+            writer.write({"name": trace["lead_name"]}, trace)
+
+    with open(trace_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == traces
+
+
+def test_rows_flushed_before_close():
+    csv_path, trace_path = _paths()
+    writer = StreamingOutputWriter(csv_path, trace_path, flush_every=2).__enter__()
+    writer.write({"name": "Alice"}, {"lead_name": "Alice"})
+    assert _read_csv(csv_path) == []  # Buffered until flush_every rows
+    writer.write({"name": "Bob"}, {"lead_name": "Bob"})
+    assert _read_csv(csv_path) == [["name"], ["Alice"], ["Bob"]]
+    with open(trace_path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 2
+    writer.close()
+    writer.close()  # Idempotent
+
+
+if __name__ == "__main__":
+    test_header_and_column_stability()
+    test_trace_jsonl()
+    test_rows_flushed_before_close()
+    print("✅ ALL OUTPUT WRITER TESTS PASSED")
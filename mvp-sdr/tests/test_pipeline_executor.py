@@ -0,0 +1,92 @@
+"""
+Pipeline Executor Test
+Ensures results come out in input order when leads finish out of order,
+the reorder window keeps at most workers * REORDER_WINDOW_FACTOR leads in
+flight, and CSE scoring on a process pool matches inline scoring.
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+from agent_context import AgentContext
+from pipeline_executor import PipelineExecutor, REORDER_WINDOW_FACTOR
+from tools.csv_lead_input import CSVLeadInput
+
+LEADS = list(CSVLeadInput(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "leads.csv")))[:12]
+
+
+def _executor(**kwargs):
+    return PipelineExecutor(context=AgentContext.in_directory(tempfile.mkdtemp()), **kwargs)
+
+
+def _delay_brightdata(executor, delay):
+    """Run BrightData for each lead after delay(lead name) seconds; returns the completion order"""
+    finished = []
+    bd_run = executor.brightdata_agent.run
+
+    def delayed(lead):
+        time.sleep(delay(lead["name"]))
+        result = bd_run(lead)
+        finished.append(lead["name"])
+        return result
+
+    executor.brightdata_agent.run = delayed
+    return finished
+
+
+def test_output_in_input_order():
+    expected = [row for row, _ in _executor(workers=1).run(LEADS)]
+
+    executor = _executor(workers=6)
+    names = [lead["name"] for lead in LEADS]
+    # Earlier leads take longer: they finish last
+    finished = _delay_brightdata(executor, lambda name: 0.02 * (len(names) - names.index(name)))
+    rows = [row for row, _ in executor.run(LEADS)]
+
+    assert finished != names  # Completion really was out of order
+    assert [row["name"] for row in rows] == names
+    assert rows == expected
+
+
+def test_reorder_window_is_bounded():
+    workers = 2
+    max_window = workers * REORDER_WINDOW_FACTOR
+    leads = [dict(LEADS[i % len(LEADS)], name=f"Lead {i}") for i in range(30)]
+    executor = _executor(workers=workers)
+    # The first lead is slow: everything behind it piles up in the window
+    _delay_brightdata(executor, lambda name: 0.3 if name == "Lead 0" else 0.0)
+
+    delivered = []
+    in_flight = []
+
+    def source():
+        for i, lead in enumerate(leads):
+            in_flight.append(i + 1 - len(delivered))  # Scheduled but not yet handed out, this one included
+            yield lead
+
+    count = executor.run_streaming(source(), lambda row, trace: delivered.append(row["name"]))
+    assert count == 30 and delivered == [lead["name"] for lead in leads]
+    assert max(in_flight) == max_window
+
+
+def _lineage(trace):
+    return [{k: v for k, v in step.items() if k != "timestamp"} for step in trace["trace"]["lineage"]]
+
+
+def test_process_pool_matches_inline():
+    inline = _executor(workers=4, cse_processes=0).run(LEADS)
+    pooled = _executor(workers=4, cse_processes=2).run(LEADS)
+    assert [row for row, _ in pooled] == [row for row, _ in inline]
+    # Traces match apart from wall-clock fields
+    assert [_lineage(trace) for _, trace in pooled] == [_lineage(trace) for _, trace in inline]
+
+
+if __name__ == "__main__":
+    test_output_in_input_order()
+    test_reorder_window_is_bounded()
+    test_process_pool_matches_inline()
+    print("✅ ALL PIPELINE EXECUTOR TESTS PASSED")
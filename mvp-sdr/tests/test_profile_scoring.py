@@ -0,0 +1,110 @@
+"""
+Profile Scoring Test
+Ensures multi-profile scoring matches a per-profile CSEEngine lead for lead,
+rescoring from stored traces reproduces the pipeline's scores, and a large
+historical set scores in well under a second per profile.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from cse.engine import CSEEngine
+from cse.config import WEIGHT_PROFILES
+from cse.batch_scorer import BatchScorer, SignalMatrix, tier_migration
+from cse.profile_comparison import ProfileComparison, load_traces
+from test_cse_batch import _contexts
+
+
+def _entries(contexts):
+    engine = CSEEngine(trace_level="summary")
+    return [
+        {"lead_name": ctx.lead_name, "lead_company": ctx.lead_company, "trace": engine.process(ctx).trace_dict()}
+        for ctx in contexts
+    ]
+
+
+def test_profiles_match_single_profile_engines():
+    contexts = _contexts(200)
+    scores = CSEEngine().score_profiles(contexts)
+    assert set(scores) == set(WEIGHT_PROFILES)
+
+    for profile in WEIGHT_PROFILES:
+        engine = CSEEngine(weight_profile=profile)
+        for i, ctx in enumerate(_contexts(200)):
+            result = engine.process(ctx)
+            assert abs(scores[profile]["final_score"][i] - result.lead_score) < 1e-9, (profile, i)
+            assert scores[profile]["tier"][i] == result.priority_tier, (profile, i)
+
+
+def test_rescore_from_traces():
+    contexts = _contexts(120)
+    entries = _entries(contexts)
+    comparison = ProfileComparison.from_traces(entries, baseline="v1")
+
+    for profile in WEIGHT_PROFILES:
+        engine = CSEEngine(weight_profile=profile)
+        expected = [engine.process(ctx).lead_score for ctx in _contexts(120)]
+        assert np.allclose(comparison.scores[profile]["final_score"], expected), profile
+
+    # JSONL round trip, CSV columns and migration totals
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    loaded = load_traces(path)
+    assert not isinstance(loaded, list)  # Streamed, not read whole
+    assert list(loaded) == entries
+    assert len(ProfileComparison.from_traces(load_traces(path))) == len(entries)
+    os.remove(path)
+
+    row = next(comparison.rows())
+    assert {f"score_{p}" for p in WEIGHT_PROFILES} | {f"tier_{p}" for p in WEIGHT_PROFILES} <= set(row)
+    for moves in comparison.migration().values():
+        assert sum(moves.values()) == len(contexts)
+
+    entries[0]["trace"] = {}  # Trace level off
+    try:
+        ProfileComparison.from_traces(entries)
+        assert False, "missing signals accepted"
+    except ValueError:
+        pass
+
+
+def test_large_history_scores_fast():
+    n = 200_000
+    rng = np.random.default_rng(3)
+    signal_dicts = [
+        {"stress_signals": a, "pain_strength": b, "angle_relevance": c, "org_health": d}
+        for a, b, c, d in rng.random((n, 4)).round(3).tolist()
+    ]
+    signals = SignalMatrix.from_signal_dicts(signal_dicts)
+
+    start = time.perf_counter()
+    scores = BatchScorer().score_profiles(signals, conflict_penalty=np.zeros(n))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0 * len(scores), elapsed
+    assert all(len(result["tier"]) == n for result in scores.values())
+    assert sum(tier_migration(scores["v1"]["tier"], scores["v2"]["tier"]).values()) == n
+
+
+def test_unknown_profile():
+    try:
+        CSEEngine().score_profiles(_contexts(3), profiles=["nope"])
+        assert False, "unknown profile accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_profiles_match_single_profile_engines()
+    test_rescore_from_traces()
+    test_large_history_scores_fast()
+    test_unknown_profile()
+    print("✅ ALL PROFILE SCORING TESTS PASSED")
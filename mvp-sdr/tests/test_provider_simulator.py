@@ -0,0 +1,154 @@
+"""
+Provider Simulator Test
+Ensures simulated outcomes are reproducible under a seed (independent of
+call order), fault rates and token-based timing follow the profile, 429
+Retry-After is honoured by the async client, and a full pipeline run
+against simulated providers counts its fallbacks.
+"""
+
+import sys
+import os
+import asyncio
+import csv
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+from async_llm_client import SimulatedLLMClient
+from pipeline_executor import PipelineExecutor
+from tools.provider_simulator import ProviderSimulator, SimulatedProviderError, SimulatedTimeout
+from config.settings import SIM_ENDPOINTS
+from loadtest import build_context, synthesize_leads
+
+ROOT = os.path.dirname(os.path.abspath(__file__)) + "/.."
+
+FLAKY = {
+    "api": {
+        "latency": {"dist": "lognormal", "median_ms": 200, "sigma": 0.5},
+        "ms_per_token": 2.0,
+        "error_rate": 0.1, "timeout_rate": 0.05, "rate_limit_rate": 0.1, "retry_after_s": 3.0,
+    },
+    "fixed": {"latency": {"dist": "constant", "ms": 100}, "ms_per_token": 2.0, "ms_per_prompt_token": 0.5},
+}
+
+
+def _outcomes(sim, keys):
+    return {key: (o.status, o.latency_s, o.retry_after) for key in keys for o in [sim.plan("api", key)]}
+
+
+def test_deterministic_under_seed():
+    keys = [f"lead-{i}" for i in range(500)]
+    first = _outcomes(ProviderSimulator(seed=7, endpoints=FLAKY, time_scale=0), keys)
+    # Reversed call order: every key still gets the same draw
+    second = _outcomes(ProviderSimulator(seed=7, endpoints=FLAKY, time_scale=0), keys[::-1])
+    assert first == second
+    assert first != _outcomes(ProviderSimulator(seed=8, endpoints=FLAKY, time_scale=0), keys)
+
+    # Retries of a key are new draws, reproducible too
+    a, b = (ProviderSimulator(seed=7, endpoints=FLAKY, time_scale=0) for _ in range(2))
+    assert [a.plan("api", "x").latency_s for _ in range(5)] == [b.plan("api", "x").latency_s for _ in range(5)]
+
+
+def test_fault_rates_and_token_timing():
+    sim = ProviderSimulator(seed=1, endpoints=FLAKY, time_scale=0)
+    n = 20000
+    for i in range(n):
+        sim.plan("api", str(i))
+    stats = sim.report()["api"]
+    assert stats["calls"] == n
+    assert abs(stats["timeouts"] / n - 0.05) < 0.01
+    assert abs(stats["rate_limited"] / n - 0.1) < 0.01
+    assert abs(stats["errors"] / n - 0.1) < 0.01
+    # Lognormal median (plus no tokens) stays near its configured value
+    assert 180 < stats["latency_ms"]["p50_ms"] < 220
+
+    assert sim.plan("fixed", tokens=50, prompt_tokens=100).latency_s == (100 + 50 * 2.0 + 100 * 0.5) / 1000
+
+    try:
+        ProviderSimulator(endpoints={"bad": {"latency": {"dist": "zipf"}}})
+        assert False, "unknown distribution must fail"
+    except ValueError:
+        pass
+
+
+def test_sleeps_and_raises():
+    sim = ProviderSimulator(seed=3, endpoints={"down": {"latency": {"dist": "constant", "ms": 1000},
+                                                        "timeout_rate": 1.0, "timeout_s": 2.0}},
+                            time_scale=0.01)
+    start = time.perf_counter()
+    try:
+        sim.call("down", "k")
+        assert False, "timeout expected"
+    except SimulatedTimeout:
+        pass
+    assert time.perf_counter() - start >= 0.02  # timeout_s at 1/100 speed
+
+    limited = ProviderSimulator(endpoints={"busy": {"rate_limit_rate": 1.0, "retry_after_s": 2.0}}, time_scale=0.5)
+    try:
+        asyncio.run(limited.acall("busy"))
+        assert False, "429 expected"
+    except SimulatedProviderError as e:
+        assert e.status == 429 and e.retry_after == 1.0  # Scaled like the sleeps
+
+
+def test_llm_client_honours_retry_after():
+    endpoints = {"llm_tier2": {"latency": {"dist": "constant", "ms": 0},
+                               "rate_limit_rate": 0.5, "retry_after_s": 1.0}}
+    sim = ProviderSimulator(seed=11, endpoints=endpoints, time_scale=0.05)
+
+    async def run(client):
+        start = time.perf_counter()
+        results = []
+        for i in range(10):
+            results.append(await client.call("m", [{"role": "user", "content": f"Write cold emails for {i}"}]))
+        await client.close()
+        return results, time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = SimulatedLLMClient(sim, cache_db=os.path.join(tmp, "cache.db"),
+                                    log_file=os.path.join(tmp, "llm.jsonl"),
+                                    max_retries=20, backoff_base=0.0, backoff_max=0.0, rate_limit=1000)
+        results, elapsed = asyncio.run(run(client))
+
+    limited = sim.report()["llm_tier2"]["rate_limited"]
+    assert limited > 0 and all(results)
+    assert client.usage["requests"] == 10 and client.usage["retries"] == limited
+    # No backoff configured: every wait comes from Retry-After (1.0s * 0.05)
+    assert elapsed >= limited * 0.05 * 0.9
+
+
+def test_pipeline_counts_fallbacks():
+    endpoints = {name: dict(profile) for name, profile in SIM_ENDPOINTS.items()}
+    endpoints["brightdata_company"].update(error_rate=0.0, rate_limit_rate=0.0, timeout_rate=0.5)
+    with open(os.path.join(ROOT, "leads.csv"), newline="", encoding="utf-8") as f:
+        template = list(csv.DictReader(f))
+    leads = list(synthesize_leads(template, 60))
+
+    def run():
+        sim = ProviderSimulator(seed=5, endpoints=endpoints, time_scale=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            executor = PipelineExecutor(workers=8, cse_processes=0, email_batch_size=0,
+                                        context=build_context(sim, tmp, 0))
+            rows = [row for row, _ in executor.run(leads)]
+        return rows, executor.metrics, sim.report()
+
+    rows, metrics, report = run()
+    assert len(rows) == 60
+    timeouts = report["brightdata_company"]["timeouts"]
+    assert 15 < timeouts < 45
+    assert metrics.counter("fallbacks", stage="brightdata") == timeouts
+    assert report["llm_tier1"]["ok"] == 60  # Every email eventually generated (retried on faults)
+
+    again_rows, again_metrics, again_report = run()
+    assert again_report == report
+    assert again_rows == rows
+
+
+if __name__ == "__main__":
+    test_deterministic_under_seed()
+    test_fault_rates_and_token_timing()
+    test_sleeps_and_raises()
+    test_llm_client_honours_retry_after()
+    test_pipeline_counts_fallbacks()
+    print("✅ ALL PROVIDER SIMULATOR TESTS PASSED")
@@ -0,0 +1,131 @@
+"""
+Rule Engine Test
+Ensures compiled pain rules match the original hand-written PainProfiler
+logic for every signal combination, batch evaluation matches per-lead
+evaluation, declared conflicts fire, and the disabled churn_vs_org_health
+conflict stays inert.
+"""
+
+import sys
+import os
+import itertools
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from contracts import AngleSignals, NormalizedLead
+from agents.pain_profiler import PainProfiler
+from cse.config import CONFLICT_DEFINITIONS
+from cse.conflict_resolver import ConflictResolver
+from cse.provenance import ProvenanceTracker
+from tools.rule_engine import RuleSet, columns_from_records
+
+VALUES = {
+    "execution_noise_level": ["low", "high", "extreme"],
+    "organizational_stage_signal": ["chaos", "breaking", "scaleup", "stable"],
+    "team_structure": ["matrix", "squads", "cross-functional", "flat", "single"],
+    "multi_team_coordination": ["low", "high"],
+    "engineering_maturity": ["low", "high"],
+}
+
+
+def _legacy_pains(s):
+    """The original PainProfiler if-chain (reference implementation)"""
+    pains = []
+    if s.execution_noise_level == "extreme" or s.organizational_stage_signal == "chaos":
+        pains.append("firefighting spiral")
+    if s.team_structure == "matrix" and s.execution_noise_level == "high":
+        pains.append("silent attrition")
+    if s.multi_team_coordination == "high" or s.team_structure == "squads":
+        pains.append("cross-team flow collapse")
+    if s.organizational_stage_signal == "breaking" and s.execution_noise_level == "high":
+        pains.append("too many initiatives")
+    if s.team_structure == "cross-functional" or s.organizational_stage_signal == "scaleup":
+        pains.append("architecture drift")
+    if s.team_structure == "flat" and s.engineering_maturity == "low":
+        pains.append("no delegation layer")
+    return pains or ["execution friction"]
+
+
+def _leads():
+    leads = []
+    for combo in itertools.product(*VALUES.values()):
+        fields = dict(zip(VALUES.keys(), combo))
+        signals = AngleSignals(
+            delivery_pressure="high", product_complexity="medium",
+            decision_maker_level="executive", **fields
+        )
+        leads.append(NormalizedLead(first_name="A", last_name="B", company="C", angle_signals=signals))
+    return leads
+
+
+def test_pain_rules_match_legacy_logic():
+    profiler = PainProfiler()
+    leads = _leads()
+    batch = profiler.run_batch(leads)
+
+    for lead, batched in zip(leads, batch):
+        single = profiler.run(lead)
+        assert single["pain_candidates"] == _legacy_pains(lead.angle_signals)
+        assert single["primary_pain"] == single["pain_candidates"][0]
+        assert batched == single
+
+    silent = profiler.run(NormalizedLead(first_name="A", last_name="B", company="C", angle_signals=AngleSignals(
+        delivery_pressure="x", product_complexity="x", team_structure="matrix", engineering_maturity="x",
+        decision_maker_level="x", execution_noise_level="high", multi_team_coordination="low",
+        organizational_stage_signal="stable"
+    )))
+    assert silent["pattern_matches"] == {
+        "silent attrition": {"team_structure": "matrix", "execution_noise_level": "high"}
+    }
+
+
+def test_conflicts_and_inert_churn():
+    resolver = ConflictResolver(ProvenanceTracker("off"))
+    signals = {"domain_complexity": 0.9, "personalization_depth": 0.2, "org_health": 0.7}
+    raw = {"brightdata": {"raw_headcount": 20, "raw_churn_rate": 0.35}, "pain": {"primary_pain": "Enterprise scale-up"}}
+
+    # churn_vs_org_health is disabled: high churn alone changes nothing
+    report = resolver.resolve_all(signals, raw)
+    assert [c["type"] for c in report["conflicts"]] == ["size_vs_pain", "complexity_vs_personalization"]
+    assert report["severity"] == "moderate"
+    assert abs(report["total_penalty"] - 0.25) < 1e-9
+
+    # Once enabled, it compiles and fires like the others
+    enabled = RuleSet([{"name": name, **definition, "enabled": True}
+                       for name, definition in CONFLICT_DEFINITIONS.items()])
+    report = ConflictResolver(ProvenanceTracker("off"), enabled).resolve_all(signals, raw)
+    assert report["conflicts"][-1]["type"] == "churn_vs_org_health" and report["severity"] == "severe"
+
+    calm = resolver.resolve_all({"org_health": 0.7}, {"brightdata": {"raw_headcount": None}, "pain": {}})
+    assert calm["count"] == 0 and calm["severity"] == "none"
+
+    matrix = resolver.resolve_batch({
+        "headcount": [20, 500, None], "churn_rate": [0.35, None, 0.5],
+        "primary_pain": ["scale", "scale", None], "domain_complexity": [0.5, 0.9, 0.5],
+        "personalization_depth": [0.7, 0.1, 0.7], "org_health": [0.7, 0.7, 0.3],
+    })
+    assert matrix.tolist() == [[True, False], [False, True], [False, False]]
+
+
+def test_many_rules_and_validation():
+    # > 64 predicates spans several bitmask words
+    rules = [{"name": f"r{i}", "conditions": [("x", "==", i), ("y", ">=", i)]} for i in range(50)]
+    ruleset = RuleSet(rules)
+    records = [{"x": i % 60, "y": i} for i in range(200)]
+    matrix = ruleset.match_batch(columns_from_records(records, ruleset.fields))
+    for record, row in zip(records, matrix):
+        expected = [r["name"] for r in ruleset.match_one(record)]
+        assert [ruleset.names[j] for j in row.nonzero()[0]] == expected
+
+    try:
+        RuleSet([{"name": "bad", "conditions": [("x", "~", 1)]}])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown operator accepted")
+
+
+if __name__ == "__main__":
+    test_pain_rules_match_legacy_logic()
+    test_conflicts_and_inert_churn()
+    test_many_rules_and_validation()
+    print("✅ ALL RULE ENGINE TESTS PASSED")
@@ -0,0 +1,127 @@
+"""
+Run Journal Test
+Ensures stages are buffered and committed in batches, identical input rows
+are separate leads, a run that crashed mid-lead resumes without redoing
+finished stages (and matches a clean run), and old finished runs are pruned.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+from agent_context import AgentContext
+from pipeline_executor import PipelineExecutor
+from tools.csv_lead_input import CSVLeadInput
+from tools.run_journal import RunJournal
+
+LEADS = list(CSVLeadInput(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "leads.csv")))[:6]
+
+
+class Crash(BaseException):
+    """Not an Exception: escapes the per-stage fallbacks like a killed process"""
+
+
+def _executor(journal=None):
+    return PipelineExecutor(journal=journal, context=AgentContext.in_directory(tempfile.mkdtemp()))
+
+
+def _stored(path, run_id):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM stages WHERE run_id=?", (run_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_batched_commits():
+    path = os.path.join(tempfile.mkdtemp(), "journal.db")
+    journal = RunJournal(path, batch_size=3, flush_interval=3600)
+    journal.record_stage("0:a", "brightdata", {"x": 1})
+    journal.record_stage("0:a", "enrichment", {"y": 2})
+    assert _stored(path, journal.run_id) == 0
+    assert journal.get_stage("0:a", "enrichment") == {"y": 2}  # Served from the buffer
+
+    journal.record_stage("0:a", "pain", {"z": 3})  # Third record: one commit
+    assert _stored(path, journal.run_id) == 3
+    assert journal.get_stage("0:a", "brightdata") == {"x": 1}
+    journal.close()
+
+
+def test_identical_rows_are_separate_leads():
+    path = os.path.join(tempfile.mkdtemp(), "journal.db")
+    executor = _executor(RunJournal(path))
+    leads = [LEADS[0], dict(LEADS[0]), LEADS[1]]
+    executor.run(leads)
+    assert executor.metrics.counter("leads_processed") == 3
+    assert executor.metrics.counter("leads_resumed") == 0
+    assert executor.journal.completed_count() == 3
+    executor.journal.close()
+
+
+def test_resume_after_mid_lead_crash():
+    expected = [row for row, _ in _executor().run(LEADS)]
+
+    path = os.path.join(tempfile.mkdtemp(), "journal.db")
+    executor = _executor(RunJournal(path, batch_size=1000, flush_interval=3600))
+    run_id = executor.journal.run_id
+    pain_run = executor.pain_profiler.run
+
+    def crash_on_fourth(lead, *args, **kwargs):
+        if lead.first_name == LEADS[3]["name"]:
+            raise Crash()
+        return pain_run(lead, *args, **kwargs)
+
+    executor.pain_profiler.run = crash_on_fourth
+    try:
+        executor.run(LEADS)
+        assert False, "crash expected"
+    except Crash:
+        pass
+    # The crash is not a clean close: only what the executor flushed on the way out is on disk
+    executor.journal.conn.close()
+
+    resumed = _executor(RunJournal(path, run_id=run_id))
+    assert resumed.journal.resumed
+    fetched = []
+    bd_run = resumed.brightdata_agent.run
+    resumed.brightdata_agent.run = lambda lead: fetched.append(lead["name"]) or bd_run(lead)
+    rows = [row for row, _ in resumed.run(LEADS)]
+
+    assert rows == expected
+    assert resumed.metrics.counter("leads_resumed") == 3
+    assert resumed.metrics.counter("leads_processed") == 3
+    # The crashed lead's finished stages were not redone
+    assert LEADS[3]["name"] not in fetched and fetched == [lead["name"] for lead in LEADS[4:]]
+    resumed.journal.close()
+
+
+def test_prunes_old_finished_runs():
+    path = os.path.join(tempfile.mkdtemp(), "journal.db")
+    unfinished = RunJournal(path, keep_runs=2)
+    unfinished.record_stage("0:a", "result", [{}, {}])
+    unfinished.close()
+
+    finished = []
+    for _ in range(4):
+        journal = RunJournal(path, keep_runs=2)
+        journal.record_stage("0:a", "result", [{}, {}])
+        journal.mark_finished()
+        finished.append(journal.run_id)
+        journal.close()
+
+    conn = sqlite3.connect(path)
+    runs = {row[0]: row[1] for row in conn.execute("SELECT run_id, status FROM runs")}
+    conn.close()
+    assert runs == {unfinished.run_id: "running", finished[2]: "finished", finished[3]: "finished"}
+    assert _stored(path, finished[0]) == 0 and _stored(path, unfinished.run_id) == 1
+
+
+if __name__ == "__main__":
+    test_batched_commits()
+    test_identical_rows_are_separate_leads()
+    test_resume_after_mid_lead_crash()
+    test_prunes_old_finished_runs()
+    print("✅ ALL RUN JOURNAL TESTS PASSED")
@@ -0,0 +1,103 @@
+"""
+Run Metrics Test
+Ensures stage latency percentiles are accurate, metrics export to JSON and
+Prometheus text, the executor instruments every stage, and MonitorAgent
+flags runs that cross its thresholds.
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+os.environ["MOCK_MODE"] = "True"
+
+from tools.run_metrics import LatencyHistogram, RunMetrics
+from agents.monitor_agent import MonitorAgent
+
+
+def test_histogram_quantiles():
+    rng = random.Random(7)
+    samples = sorted(rng.lognormvariate(0, 1.5) for _ in range(20000))
+    histogram = LatencyHistogram()
+    for ms in samples:
+        histogram.observe(ms)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = samples[int(q * len(samples)) - 1]
+        assert abs(histogram.quantile(q) - exact) / exact < 0.03, (q, histogram.quantile(q), exact)
+    assert histogram.summary()["count"] == 20000
+    assert len(histogram.buckets) < 500  # Constant memory, not one entry per sample
+
+
+def test_json_and_prometheus_export():
+    metrics = RunMetrics()
+    for ms in (1.0, 2.0, 3.0):
+        metrics.observe("email", ms)
+    metrics.increment("fallbacks", stage="email")
+    metrics.increment("email_tokens", 120)
+    metrics.record_cache("llm", {"memory_hits": 1, "disk_hits": 0, "misses": 1},
+                         {"memory_hits": 7, "disk_hits": 1, "misses": 3})
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    metrics.write_json(path, extra={"run_id": "abc"})
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    os.remove(path)
+    assert data["stages"]["email"]["count"] == 3 and data["run_id"] == "abc"
+    assert data["counters"] == {"fallbacks": {"stage=email": 1}, "email_tokens": 120}
+    assert data["caches"]["llm"] == {"lookups": 9, "hits": 7, "hit_ratio": 0.7778}
+
+    text = metrics.to_prometheus()
+    assert '# TYPE sdr_stage_latency_seconds summary' in text
+    assert 'sdr_stage_latency_seconds_count{stage="email"} 3' in text
+    assert 'sdr_fallbacks_total{stage="email"} 1' in text
+    assert 'sdr_cache_hit_ratio{cache="llm"} 0.7778' in text
+
+
+def test_executor_records_every_stage():
+    from agent_context import AgentContext
+    from pipeline_executor import PipelineExecutor
+    from tools.csv_lead_input import CSVLeadInput
+
+    leads = list(CSVLeadInput(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "leads.csv")))[:5]
+    executor = PipelineExecutor(context=AgentContext.in_directory(tempfile.mkdtemp()))
+    executor.run(leads)
+
+    stages = executor.metrics.snapshot()["stages"]
+    for stage in ("brightdata", "enrichment", "pain", "angle", "email", "quality", "cse", "lead"):
+        assert stages[stage]["count"] == 5, stage
+    assert executor.metrics.counter("leads_processed") == 5
+    assert sum(executor.metrics.counters("angles").values()) == 5
+    assert executor.metrics.caches["brightdata"]["lookups"] > 0
+
+
+def test_monitor_thresholds():
+    metrics = RunMetrics()
+    for i in range(10):
+        metrics.increment("leads_processed")
+        metrics.increment("pains", pain=f"pain {i % 4}")
+        metrics.increment("angles", angle="Predictability" if i < 6 else "Execution Velocity")
+        metrics.observe("email", 5.0)
+
+    report = MonitorAgent(stage_p95_budget_ms={}).run(metrics)
+    assert report.status == "WARN" and len(report.reasons) == 1  # Predictability is 60% of leads
+    assert report.metrics["top_angle"] == "Predictability"
+
+    metrics.increment("fallbacks", 2, stage="email")
+    report = MonitorAgent(fallback_threshold=0.1, max_angle_share=0.7, stage_p95_budget_ms={"email": 1.0}).run(metrics)
+    assert report.status == "FAIL"
+    assert report.metrics["fallback_rates"] == {"email": 0.2}
+    assert any("p95" in reason for reason in report.reasons)
+
+    assert MonitorAgent().run(RunMetrics()).status == "WARN"  # Empty run
+
+
+if __name__ == "__main__":
+    test_histogram_quantiles()
+    test_json_and_prometheus_export()
+    test_executor_records_every_stage()
+    test_monitor_thresholds()
+    print("✅ ALL RUN METRICS TESTS PASSED")
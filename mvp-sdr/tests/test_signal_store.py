@@ -0,0 +1,117 @@
+"""
+Signal Store Test
+Ensures stored raw agent fields replay to the exact scores the pipeline
+gave, config changes show up as tier migrations, rescores are versioned,
+and batched streaming matches a single pass.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["MOCK_MODE"] = "True"
+
+from cse.engine import CSEEngine
+from cse.config import TIER_THRESHOLDS
+from cse.batch_scorer import raw_fields, SIGNAL_COLUMNS
+from cse.rescore import rescore
+from tools import signal_store
+from tools.signal_store import SignalStore
+from test_cse_batch import _contexts
+
+
+def _store(n=300, batch_size=64):
+    """Store n synthetic leads the way the executor does (fields taken before scoring)"""
+    path = os.path.join(tempfile.mkdtemp(), "signals.db")
+    store = SignalStore(path, run_id="run1", batch_size=batch_size)
+    engine = CSEEngine(trace_level="summary")
+    traces = []
+    for ctx in _contexts(n):
+        lead = {"name": ctx.lead_name, "company": ctx.lead_company, "title": ctx.lead_title}
+        fields = raw_fields(ctx)
+        result = engine.process(ctx)
+        store.add(lead, fields, result)
+        traces.append(result.trace_dict())
+    store.flush()
+    return store, traces
+
+
+def _cleanup(store):
+    store.close()
+    shutil.rmtree(os.path.dirname(store.db_path))
+
+
+def test_replay_matches_pipeline_scores():
+    store, traces = _store()
+    assert store.count() == 300 == store.count("run1")
+
+    # Normalized signals are stored as typed columns, NULL where absent
+    columns = ", ".join(f"sig_{name}" for name in SIGNAL_COLUMNS)
+    rows = store.conn.execute(f"SELECT {columns} FROM leads ORDER BY id").fetchall()
+    for row, trace in zip(rows, traces):
+        stored = {name: value for name, value in zip(SIGNAL_COLUMNS, row) if value is not None}
+        assert stored == trace["normalized_signals"]
+
+    summary = rescore(store)
+    assert summary["leads"] == 300
+    assert summary["tier_changes"] == {"v1": 0}
+    assert summary["mean_abs_score_delta"] == {"v1": 0.0}
+    assert store.conn.execute("SELECT COUNT(*) FROM rescores").fetchone()[0] == 300
+
+    # Batch size does not change the result
+    assert rescore(store, batch_size=7, save=False)["tier_counts"] == summary["tier_counts"]
+    _cleanup(store)
+
+
+def test_config_change_and_versions():
+    store, _ = _store()
+    saved = dict(TIER_THRESHOLDS)
+    try:
+        TIER_THRESHOLDS["B"] = 20  # Lower the B threshold: some C leads move up
+        summary = rescore(store, save=False)
+    finally:
+        TIER_THRESHOLDS.update(saved)
+    assert summary["tier_changes"]["v1"] > 0
+    assert set(move for move, n in summary["migration"]["v1"].items() if move[0] != move[-1]) == {"C->B"}
+    assert summary["mean_abs_score_delta"]["v1"] == 0.0  # Thresholds move tiers, not scores
+
+    # Rescores under a new config version are kept next to the old ones
+    rescore(store)
+    version = signal_store.CONFIG_VERSION
+    signal_store.CONFIG_VERSION = "test-next"
+    try:
+        rescore(store, profiles=["v1", "v2"])
+    finally:
+        signal_store.CONFIG_VERSION = version
+    counts = dict(store.conn.execute(
+        "SELECT config_version || '/' || weight_profile, COUNT(*) FROM rescores GROUP BY 1"
+    ).fetchall())
+    assert counts == {f"{version}/v1": 300, "test-next/v1": 300, "test-next/v2": 300}
+    _cleanup(store)
+
+
+def test_pipeline_records_every_scored_lead():
+    from agent_context import AgentContext
+    from pipeline_executor import PipelineExecutor
+    from tools.csv_lead_input import CSVLeadInput
+
+    leads = list(CSVLeadInput(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "leads.csv")))[:5]
+    path = os.path.join(tempfile.mkdtemp(), "signals.db")
+    store = SignalStore(path)
+    context = AgentContext.in_directory(tempfile.mkdtemp())
+    rows = [row for row, _ in PipelineExecutor(signal_store=store, context=context).run(leads)]
+    store.flush()
+
+    stored = store.conn.execute("SELECT lead_name, lead_score, priority_tier FROM leads ORDER BY id").fetchall()
+    assert sorted(stored) == sorted((r["name"], r["lead_score"], r["priority_tier"]) for r in rows)
+    assert rescore(store)["mean_abs_score_delta"] == {"v1": 0.0}
+    _cleanup(store)
+
+
+if __name__ == "__main__":
+    test_replay_matches_pipeline_scores()
+    test_config_change_and_versions()
+    test_pipeline_records_every_scored_lead()
+    print("✅ ALL SIGNAL STORE TESTS PASSED")
@@ -0,0 +1,77 @@
+"""
+Single-Flight Test
+Ensures concurrent lookups for the same key share one execution.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from tools.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_fetch():
+    flights = SingleFlight()
+    calls = []
+    results = []
+    start = threading.Barrier(8)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"name": "ScaleUp Inc"}
+
+    def worker():
+        start.wait()
+        results.append(flights.do("company:scaleup", fetch))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1, f"Expected one fetch, got {len(calls)}"
+    assert all(r == {"name": "ScaleUp Inc"} for r in results)
+    assert flights.stats() == {"executed": 1, "coalesced": 7}
+
+
+def test_errors_propagate_to_waiters():
+    flights = SingleFlight()
+    errors = []
+    start = threading.Barrier(3)
+
+    def fetch():
+        time.sleep(0.1)
+        raise RuntimeError("BrightData 503")
+
+    def worker():
+        start.wait()
+        try:
+            flights.do("jobs:saas", fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == ["BrightData 503"] * 3
+
+
+def test_key_released_after_completion():
+    flights = SingleFlight()
+    assert flights.do("k", lambda: 1) == 1
+    assert flights.do("k", lambda: 2) == 2
+    assert flights.stats()["executed"] == 2
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_fetch()
+    test_errors_propagate_to_waiters()
+    test_key_released_after_completion()
+    print("✅ ALL SINGLE-FLIGHT TESTS PASSED")
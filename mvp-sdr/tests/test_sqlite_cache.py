@@ -0,0 +1,195 @@
+"""
+SQLite Cache Test
+Ensures the shared cache backend batches writes, keeps a batch readable while
+it is being committed, honours TTLs, evicts by size, and reads legacy cache
+tables.
+"""
+
+import sys
+import os
+import gc
+import sqlite3
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from tools import sqlite_cache
+from tools.sqlite_cache import SQLiteCache
+
+
+def _temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_batched_writes_visible_before_flush():
+    """Buffered entries are readable immediately and persisted on flush"""
+    path = _temp_db()
+    cache = SQLiteCache(path, batch_size=10)
+
+    cache.put("a", {"employees": 50})
+    assert cache.get("a") == {"employees": 50}
+
+    # Not on disk yet
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+
+    cache.flush()
+    assert conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 1
+    conn.close()
+    cache.close()
+
+
+def test_entries_readable_while_flush_commits():
+    """A get() racing a flush sees the batch, not a miss, until the commit lands"""
+    path = _temp_db()
+    cache = SQLiteCache(path, batch_size=100)
+    cache.put_many({"a": 1, "b": 2})
+
+    # Another writer holds the database lock: the flush blocks inside its transaction
+    blocker = sqlite3.connect(path)
+    blocker.execute("BEGIN IMMEDIATE")
+    flusher = threading.Thread(target=cache.flush)
+    flusher.start()
+    deadline = time.time() + 2
+    while not cache._flushing and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache._flushing and not cache._pending
+
+    assert cache.get("a") == 1
+    assert cache.get_many(["a", "b"]) == {"a": 1, "b": 2}
+    blocker.rollback()
+    blocker.close()
+    flusher.join()
+
+    assert not cache._flushing
+    assert cache.get_many(["a", "b"]) == {"a": 1, "b": 2}  # Now served from disk
+    cache.close()
+
+
+def test_get_many_put_many():
+    path = _temp_db()
+    cache = SQLiteCache(path, batch_size=2)
+    cache.put_many({f"k{i}": i for i in range(5)})
+    cache.flush()
+
+    found = cache.get_many(["k0", "k3", "missing"])
+    assert found == {"k0": 0, "k3": 3}
+    cache.close()
+
+
+def test_ttl_expiry():
+    path = _temp_db()
+    cache = SQLiteCache(path)
+    cache.put("short", "x", ttl=0.05)
+    cache.put("forever", "y")
+    cache.flush()
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert cache.get("forever") == "y"
+    cache.close()
+
+
+def test_size_bounded_eviction():
+    path = _temp_db()
+    cache = SQLiteCache(path, max_entries=3, batch_size=1)
+    for i in range(5):
+        cache.put(f"k{i}", i)
+        time.sleep(0.01)
+
+    assert cache.get("k0") is None
+    assert cache.get("k1") is None
+    assert cache.get_many(["k2", "k3", "k4"]) == {"k2": 2, "k3": 3, "k4": 4}
+    cache.close()
+
+
+def test_eviction_uses_running_count():
+    """Flushes keep a running row count (no full-table COUNT) and replaced keys do not grow it"""
+    path = _temp_db()
+    cache = SQLiteCache(path, max_entries=3, batch_size=1)
+    statements = []
+    cache._conn().set_trace_callback(statements.append)
+
+    for i in range(3):
+        cache.put(f"k{i}", i)
+    for _ in range(5):
+        cache.put("k0", "updated")  # Replacement: nothing evicted
+        time.sleep(0.01)
+    cache.put("expired", 1, ttl=-1)
+    cache.put("k3", 3)  # Fourth live row: the oldest (k1) goes
+
+    assert cache.get_many(["k0", "k1", "k2", "k3"]) == {"k0": "updated", "k2": 2, "k3": 3}
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == cache._row_count == 3
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(cache)")}
+    conn.close()
+    assert {"idx_cache_created_at", "idx_cache_expires_at"} <= indexes
+    assert not [s for s in statements if s.strip().endswith("SELECT COUNT(*) FROM cache")]
+    cache.close()
+
+
+def test_closed_and_dropped_caches_are_released():
+    closed = SQLiteCache(_temp_db())
+    dropped = SQLiteCache(_temp_db())
+    assert closed in sqlite_cache._OPEN_CACHES and dropped in sqlite_cache._OPEN_CACHES
+    closed.close()
+    assert closed not in sqlite_cache._OPEN_CACHES
+
+    before = len(sqlite_cache._OPEN_CACHES)
+    del dropped
+    gc.collect()
+    assert len(sqlite_cache._OPEN_CACHES) == before - 1  # Not kept alive until exit
+
+
+def test_legacy_table_upgraded_in_place():
+    """Existing (key, response) tables keep their entries"""
+    path = _temp_db()
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, response TEXT)")
+    conn.execute("INSERT INTO cache VALUES ('old', '{\"name\": \"TechFlow\"}')")
+    conn.commit()
+    conn.close()
+
+    cache = SQLiteCache(path)
+    assert cache.get("old") == {"name": "TechFlow"}
+    cache.close()
+
+
+def test_thread_local_connections():
+    path = _temp_db()
+    cache = SQLiteCache(path, batch_size=1)
+    errors = []
+
+    def work(n):
+        try:
+            for i in range(20):
+                cache.put(f"t{n}-{i}", i)
+                assert cache.get(f"t{n}-{i}") == i
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, errors
+    assert len(cache.get_many([f"t{n}-{i}" for n in range(4) for i in range(20)])) == 80
+    cache.close()
+
+
+if __name__ == "__main__":
+    test_batched_writes_visible_before_flush()
+    test_entries_readable_while_flush_commits()
+    test_get_many_put_many()
+    test_ttl_expiry()
+    test_size_bounded_eviction()
+    test_eviction_uses_running_count()
+    test_closed_and_dropped_caches_are_released()
+    test_legacy_table_upgraded_in_place()
+    test_thread_local_connections()
+    print("✅ ALL SQLITE CACHE TESTS PASSED")
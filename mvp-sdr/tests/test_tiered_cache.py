@@ -0,0 +1,155 @@
+"""
+Tiered Cache Test
+Ensures the memory LRU serves repeated keys, promotes disk hits, honours
+TTLs in both tiers, and writes back to the SQLite tier in the background
+with coalesced, bounded pending writes.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+from tools.sqlite_cache import SQLiteCache
+from tools.tiered_cache import LRUCache, TieredCache
+from llm_client import LLMClient
+
+
+def _temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_lru_eviction_and_counters():
+    lru = LRUCache(capacity=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # "a" becomes most recent
+    lru.put("c", 3)           # evicts "b"
+
+    assert lru.get("b") is None
+    assert lru.get("c") == 3
+    assert lru.hits == 2
+    assert lru.misses == 1
+
+
+def test_write_back_reaches_disk():
+    path = _temp_db()
+    cache = TieredCache(SQLiteCache(path), memory_capacity=10)
+    cache.put("company:TechFlow", {"employees": 100})
+    cache.flush()
+    cache.close()
+
+    # A fresh cache over the same file sees the entry on disk
+    reopened = TieredCache(SQLiteCache(path), memory_capacity=10)
+    assert reopened.get("company:TechFlow") == {"employees": 100}
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1
+
+    # Second lookup is served from memory
+    reopened.get("company:TechFlow")
+    assert reopened.stats()["memory_hits"] == 1
+    reopened.close()
+
+
+def test_string_values_for_llm_cache():
+    path = _temp_db()
+    disk = SQLiteCache(path, key_column="hash", value_column="response", encode=str, decode=str)
+    cache = TieredCache(disk)
+    cache.put("h1", "Subject: Speed")
+    cache.flush()
+    assert disk.get("h1") == "Subject: Speed"
+    cache.close()
+
+
+def test_llm_cache_rows_keep_model_and_timestamp():
+    """New LLM cache rows fill the legacy model / timestamp columns through the write-back"""
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "cache.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cache (hash TEXT PRIMARY KEY, response TEXT, model TEXT, timestamp REAL)")
+    conn.commit()
+
+    client = LLMClient(cache_db=path, log_file=os.path.join(workdir, "llm_logs.jsonl"))
+    before = time.time()
+    response = client.call("gpt-4-turbo", [{"role": "user", "content": "Write an email"}])
+    client.cache.flush()
+
+    row = conn.execute("SELECT response, model, timestamp FROM cache").fetchone()
+    conn.close()
+    assert row[0] == response and row[1] == "gpt-4-turbo" and row[2] >= before
+    client.cache.close()
+
+
+def test_ttl_expires_in_memory():
+    path = _temp_db()
+    cache = TieredCache(SQLiteCache(path), memory_capacity=10)
+    cache.put("jobs:acme", {"open_roles": 3}, ttl=0.2)
+    cache.put("company:acme", {"employees": 50})
+    assert cache.get("jobs:acme") == {"open_roles": 3}
+    time.sleep(0.3)
+    assert cache.get("jobs:acme") is None
+    assert cache.disk.get("jobs:acme") is None
+    assert cache.get("company:acme") == {"employees": 50}
+    cache.close()
+
+    # Disk hits are promoted with their expiry, not forever
+    cache = TieredCache(SQLiteCache(path), memory_capacity=10)
+    cache.disk.put("jobs:globex", {"open_roles": 1}, ttl=0.2)
+    assert cache.get("jobs:globex") == {"open_roles": 1}
+    assert cache.stats()["disk_hits"] == 1
+    time.sleep(0.3)
+    assert cache.get("jobs:globex") is None
+    cache.close()
+
+
+class SlowDisk(SQLiteCache):
+    def __init__(self, path):
+        super().__init__(path)
+        self.release = threading.Event()
+        self.writes = []
+
+    def put_many(self, items, ttl=None, columns=None):
+        self.release.wait()
+        self.writes.append(dict(items))
+        super().put_many(items, ttl, columns)
+
+
+def test_pending_writes_are_bounded_and_coalesced():
+    disk = SlowDisk(_temp_db())
+    cache = TieredCache(disk, memory_capacity=100, max_pending_writes=3)
+    cache.put("a", 1)  # Taken by the writer, which stalls on the disk
+    while cache.pending_writes():
+        time.sleep(0.01)
+    for value in range(5):
+        cache.put("b", value)  # Same key: one pending write
+    cache.put("c", 1)
+    cache.put("d", 1)
+    assert cache.pending_writes() == 3
+
+    blocked = threading.Thread(target=cache.put, args=("e", 1))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()  # Full: the writer waits for the disk
+
+    disk.release.set()
+    blocked.join(2)
+    assert not blocked.is_alive()
+    cache.flush()
+    assert disk.get_many(["a", "b", "c", "d", "e"]) == {"a": 1, "b": 4, "c": 1, "d": 1, "e": 1}
+    assert sum(len(batch) for batch in disk.writes) == 5  # "b" written once
+    cache.close()
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_counters()
+    test_write_back_reaches_disk()
+    test_string_values_for_llm_cache()
+    test_llm_cache_rows_keep_model_and_timestamp()
+    test_ttl_expires_in_memory()
+    test_pending_writes_are_bounded_and_coalesced()
+    print("✅ ALL TIERED CACHE TESTS PASSED")
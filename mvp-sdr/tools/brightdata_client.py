@@ -1,12 +1,20 @@
 import requests
-import sqlite3
 import json
 import os
 import hashlib
-from config.settings import BRIGHTDATA_API_KEY
+from tools.sqlite_cache import SQLiteCache
+from tools.tiered_cache import TieredCache, get_shared_cache
+from tools.single_flight import SingleFlight
+from config.settings import (
+    BRIGHTDATA_API_KEY, BRIGHTDATA_COMPANY_TTL, BRIGHTDATA_JOBS_TTL,
+    BRIGHTDATA_CACHE_MAX_ENTRIES, BRIGHTDATA_CACHE_BATCH_SIZE, BRIGHTDATA_MEMORY_CACHE_SIZE
+)
+from tools.logger import get_logger
+
+log = get_logger("brightdata")
 
 class BrightDataClient:
-    def __init__(self, cache_db="brightdata_cache.db"):
+    def __init__(self, cache_db="brightdata_cache.db", simulator=None):
         self.api_key = BRIGHTDATA_API_KEY
         self.base_url = "https://api.brightdata.com" # Placeholder, actual endpoint needed if known, or mock for now as per instructions "No Code" usually implies simulation if no real endpoint provided, but user gave key.
         # Assuming standard BrightData dataset API or similar. 
@@ -15,16 +23,19 @@ class BrightDataClient:
         # Usually this involves sending a request to a dataset collection endpoint.
         
         self.cache_db = cache_db
-        self._init_cache()
-
-    def _init_cache(self):
-        """Initialize SQLite cache."""
-        conn = sqlite3.connect(self.cache_db)
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS cache
-                     (key TEXT PRIMARY KEY, response TEXT)''')
-        conn.commit()
-        conn.close()
+        # Memory LRU (many leads share a company) in front of the SQLite tier
+        self.cache = get_shared_cache(f"brightdata:{os.path.abspath(cache_db)}", lambda: TieredCache(
+            SQLiteCache(
+                cache_db,
+                max_entries=BRIGHTDATA_CACHE_MAX_ENTRIES,
+                batch_size=BRIGHTDATA_CACHE_BATCH_SIZE
+            ),
+            memory_capacity=BRIGHTDATA_MEMORY_CACHE_SIZE
+        ))
+        # Coalesces concurrent lookups for the same cache key
+        self.flights = SingleFlight()
+        # ProviderSimulator (load tests): latency and faults in place of the network call
+        self.simulator = simulator
 
     def _get_cache_key(self, endpoint, params):
         """Generate a unique cache key."""
@@ -34,23 +45,21 @@ class BrightDataClient:
 
     def _get_from_cache(self, key):
         """Retrieve from cache."""
-        conn = sqlite3.connect(self.cache_db)
-        c = conn.cursor()
-        c.execute("SELECT response FROM cache WHERE key=?", (key,))
-        row = c.fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0])
-        return None
-
-    def _save_to_cache(self, key, data):
-        """Save to cache."""
-        conn = sqlite3.connect(self.cache_db)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO cache (key, response) VALUES (?, ?)", 
-                  (key, json.dumps(data)))
-        conn.commit()
-        conn.close()
+        return self.cache.get(key)
+
+    def _save_to_cache(self, key, data, ttl=None):
+        """Save to cache (batched; flushed by the cache layer)."""
+        self.cache.put(key, data, ttl=ttl)
+
+    def company_cache_key(self, company_name):
+        return self._get_cache_key("company_search", {"query": company_name})
+
+    def jobs_cache_key(self, domain):
+        return self._get_cache_key("job_postings", {"domain": domain})
+
+    def get_cached_many(self, keys):
+        """Bulk cache lookup: {key: data} for every cached key."""
+        return self.cache.get_many(keys)
 
     def search_company(self, company_name):
         """
@@ -66,15 +75,26 @@ class BrightDataClient:
         # It did NOT provide dataset IDs.
         # I will implement this with placeholders for Dataset IDs and add a TODO.
         
-        params = {"query": company_name}
-        cache_key = self._get_cache_key("company_search", params)
+        cache_key = self.company_cache_key(company_name)
         
         cached = self._get_from_cache(cache_key)
         if cached:
-            print(f"[BrightData] Cache Hit for company: {company_name}")
+            log.debug("[BrightData] Cache Hit for company: %s", company_name, sample_key=company_name)
+            return cached
+
+        # Concurrent misses for the same company share one fetch
+        return self.flights.do(cache_key, lambda: self._fetch_company(company_name, cache_key))
+
+    def _fetch_company(self, company_name, cache_key):
+        """Fetch one company (runs once per in-flight cache key)."""
+        # A flight for this key may have finished between our miss and now
+        cached = self._get_from_cache(cache_key)
+        if cached:
             return cached
 
-        print(f"[BrightData] API Call for company: {company_name}")
+        log.info("[BrightData] API Call for company: %s", company_name)
+        if self.simulator:
+            self.simulator.call("brightdata_company", company_name)
         
         # REAL API CALL WOULD GO HERE
         # response = requests.get(..., headers={"Authorization": f"Bearer {self.api_key}"})
@@ -94,22 +114,32 @@ class BrightDataClient:
             "description": f"A leading {company_name} in the tech space."
         }
         
-        self._save_to_cache(cache_key, mock_response)
+        self._save_to_cache(cache_key, mock_response, ttl=BRIGHTDATA_COMPANY_TTL)
         return mock_response
 
     def get_job_postings(self, domain):
         """
         Get job postings (Jobs Dataset).
         """
-        params = {"domain": domain}
-        cache_key = self._get_cache_key("job_postings", params)
+        cache_key = self.jobs_cache_key(domain)
         
         cached = self._get_from_cache(cache_key)
         if cached:
-            print(f"[BrightData] Cache Hit for jobs: {domain}")
+            log.debug("[BrightData] Cache Hit for jobs: %s", domain, sample_key=domain)
+            return cached
+
+        # Concurrent misses for the same domain share one fetch
+        return self.flights.do(cache_key, lambda: self._fetch_job_postings(domain, cache_key))
+
+    def _fetch_job_postings(self, domain, cache_key):
+        """Fetch job postings for one domain (runs once per in-flight cache key)."""
+        cached = self._get_from_cache(cache_key)
+        if cached:
             return cached
 
-        print(f"[BrightData] API Call for jobs: {domain}")
+        log.info("[BrightData] API Call for jobs: %s", domain)
+        if self.simulator:
+            self.simulator.call("brightdata_jobs", domain)
         
         # MOCK RESPONSE
         mock_response = {
@@ -122,5 +152,5 @@ class BrightDataClient:
             "hiring_trend": "growing"
         }
         
-        self._save_to_cache(cache_key, mock_response)
+        self._save_to_cache(cache_key, mock_response, ttl=BRIGHTDATA_JOBS_TTL)
         return mock_response
@@ -8,14 +8,68 @@ INPUT CONTRACT:
 - File path to CSV
 
 OUTPUT CONTRACT:
-- List of dicts (raw rows)
+- Generator of dicts (raw rows), one row at a time
 - Validation report (missing columns, empty rows)
 
 RESPONSIBILITIES:
 - Validate required columns exist (name, company, title, etc.)
 - Clean whitespace from headers and values
 - Filter out empty rows
+- Stream rows so memory stays flat regardless of file size
 """
 
+import csv
+from typing import Dict, Iterator, List
+
+REQUIRED_COLUMNS = ("name", "company")
+
+
 class CSVLeadInput:
-    pass
+    def __init__(self, path: str, required_columns=REQUIRED_COLUMNS):
+        self.path = path
+        self.required_columns = tuple(required_columns)
+        self.report = {
+            "rows_read": 0,
+            "rows_yielded": 0,
+            "empty_rows": 0,
+            "missing_columns": [],
+        }
+
+    def validate_header(self) -> List[str]:
+        """Read only the header row and return the missing required columns."""
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), [])
+        columns = {h.strip() for h in header}
+        missing = [c for c in self.required_columns if c not in columns]
+        self.report["missing_columns"] = missing
+        return missing
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """
+        Yield cleaned rows one at a time.
+        Raises ValueError if required columns are missing.
+        """
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            reader.fieldnames = [h.strip() for h in (reader.fieldnames or [])]
+
+            missing = [c for c in self.required_columns if c not in reader.fieldnames]
+            self.report["missing_columns"] = missing
+            if missing:
+                raise ValueError(f"{self.path} is missing required columns: {missing}")
+
+            for row in reader:
+                self.report["rows_read"] += 1
+
+                # Drop overflow cells (restkey None) and strip whitespace
+                clean = {
+                    k: (v.strip() if isinstance(v, str) else v)
+                    for k, v in row.items() if k is not None
+                }
+
+                if not any(clean.values()):
+                    self.report["empty_rows"] += 1
+                    continue
+
+                self.report["rows_yielded"] += 1
+                yield clean
@@ -0,0 +1,94 @@
+"""
+TOOL: enrichment_memo.py
+
+PURPOSE:
+Content-addressed memo of enrichment output (the parsed LLM JSON), keyed on
+the lead features that influence it. Shared by EnrichmentAgent and LLMAdapter.
+
+API DEFINITION:
+- def enrichment_key(title, company, bio, source, version=ENRICHMENT_MEMO_VERSION) -> str
+- class EnrichmentMemo:
+    - def get(self, title, company, bio, source) -> dict | None
+    - def put(self, title, company, bio, source, data)
+    - def get_or_compute(self, title, company, bio, source, compute) -> dict
+    - def flush(self)
+    - def stats(self) -> dict
+- MOCK_SOURCE: source stamp for MockLLMProvider output
+- def get_enrichment_memo(db_path=ENRICHMENT_MEMO_DB) -> EnrichmentMemo (one per file per process)
+
+RESPONSIBILITIES:
+- Normalize features (whitespace collapsed, case folded) before hashing
+- Stamp keys with ENRICHMENT_MEMO_VERSION and the source (provider/model),
+  so a prompt or model change never serves stale entries
+- Persist across runs (table "enrichment_memo" in cache.db, next to the LLM cache)
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from tools.sqlite_cache import SQLiteCache
+from tools.tiered_cache import TieredCache, get_shared_cache
+from config.settings import ENRICHMENT_MEMO_VERSION, ENRICHMENT_MEMO_DB, ENRICHMENT_MEMO_MEMORY_SIZE
+
+# Source stamp for the deterministic MockLLMProvider enrichment
+MOCK_SOURCE = "mock"
+
+
+def _normalize(value: Any) -> str:
+    return " ".join(str(value or "").split()).casefold()
+
+
+def enrichment_key(title: str, company: str, bio: str, source: str,
+                   version: str = ENRICHMENT_MEMO_VERSION) -> str:
+    """Deterministic hash of the normalized enrichment inputs"""
+    features = {
+        "version": version,
+        "source": source,
+        "title": _normalize(title),
+        "company": _normalize(company),
+        "bio": _normalize(bio),
+    }
+    return hashlib.sha256(json.dumps(features, sort_keys=True).encode()).hexdigest()
+
+
+class EnrichmentMemo:
+    def __init__(self, cache: TieredCache, version: str = ENRICHMENT_MEMO_VERSION):
+        self.cache = cache
+        self.version = version
+
+    @classmethod
+    def open(cls, db_path: str, version: str = ENRICHMENT_MEMO_VERSION) -> "EnrichmentMemo":
+        return cls(TieredCache(
+            SQLiteCache(db_path, table="enrichment_memo", key_column="key", value_column="data"),
+            memory_capacity=ENRICHMENT_MEMO_MEMORY_SIZE
+        ), version)
+
+    def get(self, title: str, company: str, bio: str, source: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(enrichment_key(title, company, bio, source, self.version))
+
+    def put(self, title: str, company: str, bio: str, source: str, data: Dict[str, Any]):
+        self.cache.put(enrichment_key(title, company, bio, source, self.version), data)
+
+    def get_or_compute(self, title: str, company: str, bio: str, source: str,
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Cached data, or compute() stored under the key. Callers must not mutate the result."""
+        data = self.get(title, company, bio, source)
+        if data is None:
+            data = compute()
+            if data:  # Never memoize an empty (failed) parse
+                self.put(title, company, bio, source, data)
+        return data
+
+    def flush(self):
+        self.cache.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+def get_enrichment_memo(db_path: str = ENRICHMENT_MEMO_DB) -> EnrichmentMemo:
+    """Process-wide memo for `db_path` (shares one TieredCache and writer thread)"""
+    cache = get_shared_cache(f"enrichment:{os.path.abspath(db_path)}", lambda: EnrichmentMemo.open(db_path).cache)
+    return EnrichmentMemo(cache)
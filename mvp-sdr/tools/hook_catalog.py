@@ -0,0 +1,163 @@
+"""
+TOOL: hook_catalog.py
+
+PURPOSE:
+Precompiled hook lookup for HookEngine. Hooks are loaded once from a data
+file (config/hooks.json) into one flat table per campaign, keyed by
+(seniority, stage, angle).
+
+API DEFINITION:
+- class HookCatalog:
+    - def __init__(self, path=HOOK_CATALOG_PATH, reload_interval=HOOK_CATALOG_RELOAD_INTERVAL)
+    - def lookup(self, seniority, stage, angle, campaign=HOOK_CAMPAIGN) -> str
+    - def reload(self, force=False) -> bool (True if the catalog was rebuilt)
+    - def campaigns(self) -> list of campaign names
+- def compile_campaign(hooks) -> (table, domains)
+- def get_hook_catalog(path=HOOK_CATALOG_PATH) -> HookCatalog (one per file per process)
+
+RESPONSIBILITIES:
+- Resolve "*" wildcards at build time: every (seniority, stage, angle) key,
+  including "*" for values the catalog never mentions, maps to one hook text
+- Most specific hook wins (most concrete fields); ties go to the earlier entry
+- Campaign variants: a campaign may "extend" another and add/override hooks
+- Hot reload: rebuild when the file changes (checked at most every
+  reload_interval seconds) and swap the tables in atomically
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import HOOK_CATALOG_PATH, HOOK_CATALOG_RELOAD_INTERVAL, HOOK_CAMPAIGN
+from tools.logger import get_logger
+
+log = get_logger("hooks")
+
+WILDCARD = "*"
+KEY_FIELDS = ("seniority", "stage", "angle")
+# Served only if a campaign has no catch-all ("*", "*", "*") hook
+DEFAULT_HOOK = "We help engineering teams move faster."
+
+
+def compile_campaign(hooks: List[Dict[str, str]]) -> Tuple[Dict[tuple, str], Tuple[frozenset, ...]]:
+    """
+    Flatten a hook list into {(seniority, stage, angle): text}.
+    Returns (table, domains) where domains holds the concrete values per field.
+    """
+    domains = tuple(
+        frozenset(hook[field] for hook in hooks if hook.get(field, WILDCARD) != WILDCARD)
+        for field in KEY_FIELDS
+    )
+
+    # 1. Most specific first; stable sort keeps file order for ties
+    ranked = sorted(hooks, key=lambda hook: -sum(hook.get(f, WILDCARD) != WILDCARD for f in KEY_FIELDS))
+
+    # 2. First hook to cover a key owns it
+    table = {}
+    for hook in ranked:
+        axes = [
+            (hook[field],) if hook.get(field, WILDCARD) != WILDCARD else (*domain, WILDCARD)
+            for field, domain in zip(KEY_FIELDS, domains)
+        ]
+        for key in itertools.product(*axes):
+            table.setdefault(key, hook["text"])
+    return table, domains
+
+
+class HookCatalog:
+    def __init__(self, path: str = HOOK_CATALOG_PATH, reload_interval: Optional[float] = HOOK_CATALOG_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        # campaign -> (table, domains); replaced as a whole on reload
+        self._compiled: Dict[str, Tuple[Dict[tuple, str], Tuple[frozenset, ...]]] = {}
+        self.reload(force=True)
+
+    # ===== LOOKUP =====
+
+    def lookup(self, seniority: Any, stage: Any, angle: Any, campaign: str = HOOK_CAMPAIGN) -> str:
+        if self.reload_interval is not None and time.monotonic() >= self._next_check:
+            self.reload()
+
+        compiled = self._compiled.get(campaign)
+        if compiled is None:
+            raise ValueError(f"Unknown hook campaign: {campaign}")
+        table, (seniorities, stages, angles) = compiled
+
+        # Values the catalog never mentions can only match wildcards
+        key = (
+            seniority if seniority in seniorities else WILDCARD,
+            stage if stage in stages else WILDCARD,
+            angle if angle in angles else WILDCARD,
+        )
+        return table.get(key, DEFAULT_HOOK)
+
+    def campaigns(self) -> List[str]:
+        return list(self._compiled)
+
+    # ===== BUILD / RELOAD =====
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild if the file changed (or force). Returns True if rebuilt."""
+        with self._lock:
+            if self.reload_interval is not None:
+                self._next_check = time.monotonic() + self.reload_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                if force:
+                    raise
+                return False  # Keep serving the last good catalog
+            if not force and mtime == self._mtime:
+                return False
+
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    campaigns = json.load(f)["campaigns"]
+                compiled = {
+                    name: compile_campaign(self._resolve_hooks(campaigns, name))
+                    for name in campaigns
+                }
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if force:
+                    raise
+                log.warn("[HookCatalog] Reload of %s failed (%s); keeping the previous catalog", self.path, e)
+                return False
+            self._compiled = compiled
+            self._mtime = mtime
+            return True
+
+    def _resolve_hooks(self, campaigns: Dict[str, Any], name: str, seen: tuple = ()) -> List[Dict[str, str]]:
+        """Campaign hooks followed by its parent's (so the campaign wins ties)"""
+        if name in seen:
+            raise ValueError(f"Hook campaign inheritance cycle: {' -> '.join(seen + (name,))}")
+        if name not in campaigns:
+            raise ValueError(f"Unknown hook campaign: {name}")
+        campaign = campaigns[name]
+        hooks = list(campaign.get("hooks", []))
+        parent = campaign.get("extends")
+        if parent:
+            hooks += self._resolve_hooks(campaigns, parent, seen + (name,))
+        return hooks
+
+
+# ===== PROCESS-WIDE INSTANCES =====
+
+_catalogs: Dict[str, HookCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_hook_catalog(path: str = HOOK_CATALOG_PATH) -> HookCatalog:
+    """Return the shared catalog for `path`, loading it on first use."""
+    key = os.path.abspath(path)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = HookCatalog(path)
+            _catalogs[key] = catalog
+        return catalog
@@ -3,24 +3,409 @@ TOOL: logger.py
 
 PURPOSE:
 Unified logging and metrics collection for the pipeline.
+Structured, leveled records written off the hot path by a background thread.
 
 API DEFINITION:
 - class Logger:
-    - def info(self, message: str, context: dict = None)
-    - def warn(self, message: str, context: dict = None)
-    - def error(self, message: str, context: dict = None)
-    - def log_metric(self, metric_name: str, value: any)
-
-METRICS SCHEMA:
-- run_id: UUID for the current pipeline run
-- timestamp: ISO format
-- lead_count: Total leads processed
-- fallback_count: Number of leads hitting fallback logic
-- signal_distribution: Dict of {signal_name: count}
-
-STORAGE:
-- Metrics should be persisted to a JSON file (metrics.json) for historical analysis.
+    - def debug(self, message: str, *args, context: dict = None, sample_key: str = None)
+    - def info(self, message: str, *args, context: dict = None)
+    - def warn(self, message: str, *args, context: dict = None)
+    - def error(self, message: str, *args, context: dict = None)
+    - def log_metric(self, metric_name: str, value: any, context: dict = None)
+    - def enabled_for(self, level: int) -> bool
+- class ConsoleSink / JSONLSink: record writers (write_batch(records), close());
+  JSONLSink rotates by size or age, optionally gzip-compressed
+- class QueueHandler: bounded, buffered async writer in front of the sinks
+- def get_logger(name) -> Logger (shared handler, configured from settings)
+- def configure(level=None, jsonl_path=None, sample_rate=None, console=None)
+- def flush()
+- def get_jsonl_writer(path, **options) -> QueueHandler for a standalone JSONL file
+  (e.g. LLM call logs; one per file per process)
+
+RECORD SCHEMA (JSONL sink):
+- ts: epoch seconds
+- level: "DEBUG" | "INFO" | "WARN" | "ERROR"
+- logger: logger name (e.g. "enrichment")
+- message: formatted message
+- context fields (lead, company, ...) merged in
+- metric / value for log_metric records
+
+RESPONSIBILITIES:
+- Disabled levels cost one comparison: messages use %-style args, formatted
+  only once the level check passes (guard costly arguments with enabled_for)
+- Per-lead DEBUG lines are sampled by sample_key (a lead keeps all or none)
+- Sinks are written in batches on one background thread
 """
 
+import atexit
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+from config.settings import LOG_LEVEL, LOG_DEBUG_SAMPLE_RATE, LOG_JSONL_PATH, LOG_CONSOLE
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARN": WARN, "ERROR": ERROR, "OFF": OFF}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+
+def parse_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level} (expected one of {list(LEVELS)})")
+
+
+# ===== SINKS =====
+
+class ConsoleSink:
+    """Plain text lines, same look as the former print() output."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write_batch(self, records: List[Dict[str, Any]]):
+        stream = self.stream or sys.stdout
+        lines = []
+        for record in records:
+            if record["level"] == "DEBUG":
+                lines.append(f"DEBUG: {record['message']}\n")
+            else:
+                lines.append(f"{record['message']}\n")
+            if "traceback" in record:
+                lines.append(record["traceback"])
+        stream.write("".join(lines))
+        stream.flush()
+
+    def close(self):
+        pass
+
+
+class JSONLSink:
+    """
+    One JSON object per record, appended to a file kept open between batches.
+    Optional rotation by size (max_bytes) or age (rotate_interval seconds);
+    rotated files are renamed <path>.<timestamp>, gzip-compressed if requested,
+    and only the newest backup_count are kept.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, rotate_interval: Optional[float] = None,
+                 compress: bool = False, backup_count: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.compress = compress
+        self.backup_count = backup_count
+        self._file = None
+        self._opened_at = 0.0
+
+    def write_batch(self, records: List[Dict[str, Any]]):
+        lines = [json.dumps(record, default=str) + "\n" for record in records]
+        if self.max_bytes is None and self.rotate_interval is None:
+            self._open().write("".join(lines))
+        else:
+            # A drained backlog can span several files; rotate between lines
+            for line in lines:
+                if self._file is not None and self._should_rotate():
+                    self._rotate()
+                self._open().write(line)
+        self._file.flush()
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._opened_at = time.time()
+        return self._file
+
+    def _should_rotate(self) -> bool:
+        if self.max_bytes is not None and self._file.tell() >= self.max_bytes:
+            return True
+        return self.rotate_interval is not None and time.time() - self._opened_at >= self.rotate_interval
+
+    def _rotate(self):
+        self.close()
+        rotated = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1000000000:09d}"
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+        if self.backup_count is not None:
+            for old in self.backups()[:-self.backup_count or None]:
+                os.remove(old)
+
+    def backups(self) -> List[str]:
+        """Rotated files, oldest first."""
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self.path) + "."
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.startswith(prefix))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ===== ASYNC HANDLER =====
+
+class QueueHandler:
+    """
+    Records are appended to an in-memory buffer; a daemon thread swaps the
+    buffer out and writes it in batches to every sink.
+    max_queue bounds the buffer (0 = unbounded): when full, emit() blocks, or
+    drops the record (counted in .dropped) if drop_when_full is set.
+    flush_interval > 0: the writer wakes every flush_interval seconds (or once
+    max_batch records are waiting) instead of per record.
+    """
+
+    def __init__(self, sinks: List[Any], max_batch: int = 500, max_queue: int = 0,
+                 flush_interval: float = 0.0, drop_when_full: bool = False):
+        self.sinks = list(sinks)
+        self.max_batch = max(1, max_batch)
+        self.max_queue = max(0, max_queue)
+        self.flush_interval = flush_interval
+        self.drop_when_full = drop_when_full
+        self.dropped = 0
+
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._emitted = 0      # Records accepted so far
+        self._written = 0      # Records handed to the sinks so far
+        self._flush_waiters = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def emit(self, record: Dict[str, Any]):
+        with self._cond:
+            if self.max_queue and len(self._buffer) >= self.max_queue:
+                if self.drop_when_full:
+                    self.dropped += 1
+                    return
+                while len(self._buffer) >= self.max_queue and not self._closed:
+                    self._cond.notify_all()
+                    self._cond.wait()
+            self._buffer.append(record)
+            self._emitted += 1
+            if self.flush_interval <= 0 or len(self._buffer) >= self.max_batch:
+                self._cond.notify_all()
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                # Let the batch fill unless someone is waiting on it
+                if (self.flush_interval > 0 and len(self._buffer) < self.max_batch
+                        and not self._closed and not self._flush_waiters):
+                    self._cond.wait(self.flush_interval)
+                batch, self._buffer = self._buffer, []
+                stop = self._closed and not batch
+                self._cond.notify_all()  # Wake producers blocked on a full buffer
+            if stop:
+                return
+
+            for sink in self.sinks:
+                try:
+                    sink.write_batch(batch)
+                except Exception as e:
+                    sys.stderr.write(f"[Logger] Sink {type(sink).__name__} failed: {e}\n")
+
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+    def flush(self):
+        """Block until every record emitted so far has been written."""
+        with self._cond:
+            target = self._emitted
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._written < target and self._thread.is_alive():
+                    self._cond.wait(0.1)
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+
+# ===== LOGGER =====
+
 class Logger:
-    pass
+    def __init__(self, name: str, handler: Optional[QueueHandler] = None, level=LOG_LEVEL,
+                 sample_rate: float = LOG_DEBUG_SAMPLE_RATE):
+        self.name = name
+        self.handler = handler
+        self.level = parse_level(level)
+        self.sample_rate = sample_rate
+
+    def enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def debug(self, message: str, *args, context: Dict[str, Any] = None, sample_key: str = None):
+        if self.level > DEBUG:
+            return
+        if sample_key is not None and not self._sampled(sample_key):
+            return
+        self._emit(DEBUG, message, args, context)
+
+    def info(self, message: str, *args, context: Dict[str, Any] = None):
+        if self.level > INFO:
+            return
+        self._emit(INFO, message, args, context)
+
+    def warn(self, message: str, *args, context: Dict[str, Any] = None):
+        if self.level > WARN:
+            return
+        self._emit(WARN, message, args, context)
+
+    def error(self, message: str, *args, context: Dict[str, Any] = None):
+        if self.level > ERROR:
+            return
+        self._emit(ERROR, message, args, context)
+
+    def log_metric(self, metric_name: str, value: Any, context: Dict[str, Any] = None):
+        if self.level > INFO:
+            return
+        self._emit(INFO, "%s=%s", (metric_name, value), dict(context or {}, metric=metric_name, value=value))
+
+    def _sampled(self, key: str) -> bool:
+        """Deterministic per key: a sampled lead keeps all of its debug lines."""
+        if self.sample_rate >= 1.0:
+            return True
+        return (zlib.crc32(str(key).encode()) % 10000) < self.sample_rate * 10000
+
+    def _emit(self, level: int, message: str, args: tuple, context: Optional[Dict[str, Any]]):
+        # Formatted here (not on the writer thread): arguments may change after the call
+        if args:
+            message = message % args
+        record = {"ts": time.time(), "level": LEVEL_NAMES[level], "logger": self.name, "message": message}
+        if context:
+            record.update(context)
+        if self.handler is not None:
+            self.handler.emit(record)
+
+
+# ===== PROCESS-WIDE CONFIGURATION =====
+
+_loggers: Dict[str, Logger] = {}
+_config = {
+    "level": LOG_LEVEL,
+    "sample_rate": LOG_DEBUG_SAMPLE_RATE,
+    "jsonl_path": LOG_JSONL_PATH,
+    "console": LOG_CONSOLE,
+}
+_handler: Optional[QueueHandler] = None
+_lock = threading.Lock()
+
+
+def _build_handler() -> QueueHandler:
+    sinks = []
+    if _config["console"]:
+        sinks.append(ConsoleSink())
+    if _config["jsonl_path"]:
+        sinks.append(JSONLSink(_config["jsonl_path"]))
+    return QueueHandler(sinks)
+
+
+def get_logger(name: str) -> Logger:
+    """Shared Logger for `name`; all loggers write through one QueueHandler."""
+    global _handler
+    with _lock:
+        logger = _loggers.get(name)
+        if logger is None:
+            if _handler is None:
+                _handler = _build_handler()
+            logger = Logger(name, _handler, _config["level"], _config["sample_rate"])
+            _loggers[name] = logger
+        return logger
+
+
+def configure(level=None, jsonl_path: Optional[str] = None, sample_rate: Optional[float] = None,
+              console: Optional[bool] = None):
+    """Apply settings to every logger (e.g. from CLI flags). Sinks are rebuilt if they change."""
+    global _handler
+    with _lock:
+        if level is not None:
+            _config["level"] = parse_level(level)
+        if sample_rate is not None:
+            _config["sample_rate"] = sample_rate
+
+        sinks_changed = False
+        if jsonl_path is not None and jsonl_path != _config["jsonl_path"]:
+            _config["jsonl_path"] = jsonl_path
+            sinks_changed = True
+        if console is not None and console != _config["console"]:
+            _config["console"] = console
+            sinks_changed = True
+        if sinks_changed and _handler is not None:
+            _handler.close()
+            _handler = _build_handler()
+
+        for logger in _loggers.values():
+            logger.level = parse_level(_config["level"])
+            logger.sample_rate = _config["sample_rate"]
+            logger.handler = _handler
+
+
+def flush():
+    """Wait until everything logged so far is written (e.g. before printing a summary)."""
+    handler = _handler
+    if handler is not None:
+        handler.flush()
+
+
+# ===== STANDALONE JSONL WRITERS =====
+
+_writers: Dict[str, QueueHandler] = {}
+
+
+def get_jsonl_writer(path: str, max_bytes: Optional[int] = None, rotate_interval: Optional[float] = None,
+                     compress: bool = False, backup_count: Optional[int] = None, max_queue: int = 0,
+                     flush_interval: float = 0.0, drop_when_full: bool = False) -> QueueHandler:
+    """Shared background writer for a JSONL file (options apply when it is first opened)."""
+    key = os.path.abspath(path)
+    with _lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            sink = JSONLSink(path, max_bytes=max_bytes, rotate_interval=rotate_interval,
+                             compress=compress, backup_count=backup_count)
+            writer = QueueHandler([sink], max_queue=max_queue, flush_interval=flush_interval,
+                                  drop_when_full=drop_when_full)
+            _writers[key] = writer
+        return writer
+
+
+def _shutdown():
+    for writer in list(_writers.values()):
+        writer.close()
+    if _handler is not None:
+        _handler.close()
+
+
+atexit.register(_shutdown)
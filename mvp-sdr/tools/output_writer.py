@@ -0,0 +1,57 @@
+"""
+TOOL: output_writer.py
+
+PURPOSE:
+Incremental output for streaming pipeline runs.
+
+OUTPUT CONTRACT:
+- CSV of result rows (header taken from the first row)
+- JSONL of traces (one compact JSON object per line)
+
+RESPONSIBILITIES:
+- Write each result as soon as it is ready, so memory does not grow with the run
+- Flush regularly, so a crash keeps every finished lead on disk
+"""
+
+import csv
+import json
+from typing import Any, Dict
+
+
+class StreamingOutputWriter:
+    def __init__(self, csv_path: str, trace_path: str, flush_every: int = 1):
+        self.csv_path = csv_path
+        self.trace_path = trace_path
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._csv_file = None
+        self._trace_file = None
+        self._writer = None
+
+    def __enter__(self):
+        self._csv_file = open(self.csv_path, 'w', newline='', encoding='utf-8')
+        self._trace_file = open(self.trace_path, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write(self, result_row: Dict[str, Any], trace_entry: Dict[str, Any]):
+        """Append one result row and its trace."""
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._csv_file, fieldnames=list(result_row.keys()))
+            self._writer.writeheader()
+
+        self._writer.writerow(result_row)
+        self._trace_file.write(json.dumps(trace_entry) + "\n")
+        self.count += 1
+
+        if self.count % self.flush_every == 0:
+            self._csv_file.flush()
+            self._trace_file.flush()
+
+    def close(self):
+        for f in (self._csv_file, self._trace_file):
+            if f and not f.closed:
+                f.close()
@@ -0,0 +1,187 @@
+"""
+TOOL: provider_simulator.py
+
+PURPOSE:
+Seeded stand-in for slow, flaky providers (LLM, BrightData) so throughput
+and tail-latency benchmarks run offline and reproducibly.
+
+INPUT CONTRACT:
+- Per-endpoint profiles (see SIM_ENDPOINTS in config/settings.py):
+  latency distribution, ms_per_token / ms_per_prompt_token,
+  error_rate (+ error_statuses), timeout_rate (+ timeout_s),
+  rate_limit_rate (+ retry_after_s)
+
+OUTPUT CONTRACT:
+- plan(): the Outcome of one attempt (status, latency, Retry-After)
+- call() / acall(): sleep for the latency (scaled by time_scale), then
+  return or raise SimulatedProviderError / SimulatedTimeout
+
+RESPONSIBILITIES:
+- Draw every attempt from its own seeded RNG (seed, endpoint, request key,
+  attempt number), so outcomes do not depend on scheduling order
+- Keep per-endpoint counts and simulated latency histograms
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from tools.run_metrics import LatencyHistogram
+from config.settings import SIM_SEED, SIM_TIME_SCALE, SIM_ENDPOINTS
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "pareto")
+
+
+class SimulatedProviderError(Exception):
+    """Simulated HTTP error (429 carries retry_after in seconds)"""
+
+    def __init__(self, endpoint: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"{endpoint} returned {status} (simulated)")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class SimulatedTimeout(TimeoutError):
+    """Simulated request that never answered within timeout_s"""
+
+
+class Outcome:
+    __slots__ = ("status", "latency_s", "retry_after")
+
+    def __init__(self, status: int, latency_s: float, retry_after: Optional[float] = None):
+        self.status = status            # 200, 429, 5xx, or 0 for a timeout
+        self.latency_s = latency_s
+        self.retry_after = retry_after
+
+
+def sample_latency_ms(spec: Dict[str, Any], rng: random.Random) -> float:
+    dist = spec.get("dist", "constant")
+    if dist == "constant":
+        return float(spec.get("ms", 0.0))
+    if dist == "uniform":
+        return rng.uniform(spec["min_ms"], spec["max_ms"])
+    if dist == "normal":
+        return max(0.0, rng.gauss(spec["mean_ms"], spec["std_ms"]))
+    if dist == "lognormal":
+        return rng.lognormvariate(math.log(spec["median_ms"]), spec["sigma"])
+    if dist == "pareto":
+        # Heavy tail: scale_ms is the minimum, smaller alpha = longer tail
+        return spec["scale_ms"] * rng.paretovariate(spec["alpha"])
+    raise ValueError(f"Unknown latency distribution '{dist}' (expected one of {LATENCY_DISTRIBUTIONS})")
+
+
+class ProviderSimulator:
+    def __init__(self, seed: int = SIM_SEED, endpoints: Optional[Dict[str, Dict[str, Any]]] = None,
+                 time_scale: float = SIM_TIME_SCALE):
+        """
+        time_scale multiplies every sleep (1.0 = real time, 0.01 = 100x
+        faster, 0 = no sleeping; simulated latencies are recorded as drawn).
+        """
+        self.seed = seed
+        self.endpoints = dict(SIM_ENDPOINTS if endpoints is None else endpoints)
+        for name, profile in self.endpoints.items():
+            sample_latency_ms(profile.get("latency", {}), random.Random(0))  # Fail fast on bad profiles
+        self.time_scale = max(0.0, time_scale)
+        self._attempts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    def _profile(self, endpoint: str) -> Dict[str, Any]:
+        if endpoint not in self.endpoints:
+            raise ValueError(f"No simulation profile for endpoint '{endpoint}'")
+        return self.endpoints[endpoint]
+
+    def _rng(self, endpoint: str, key: str, attempt: int) -> random.Random:
+        digest = hashlib.blake2b(f"{self.seed}|{endpoint}|{key}|{attempt}".encode(), digest_size=8).digest()
+        return random.Random(int.from_bytes(digest, "big"))
+
+    def plan(self, endpoint: str, key: str = "", tokens: int = 0, prompt_tokens: int = 0) -> Outcome:
+        """
+        Outcome of the next attempt for (endpoint, key). Retries of the same
+        key are new attempts with their own draws.
+        """
+        profile = self._profile(endpoint)
+        with self._lock:
+            attempt = self._attempts.get((endpoint, key), 0)
+            self._attempts[(endpoint, key)] = attempt + 1
+        rng = self._rng(endpoint, key, attempt)
+
+        # 1. Fault draw (one uniform number, so rates are exact partitions)
+        roll = rng.random()
+        timeout_rate = profile.get("timeout_rate", 0.0)
+        rate_limit_rate = profile.get("rate_limit_rate", 0.0)
+        error_rate = profile.get("error_rate", 0.0)
+        if roll < timeout_rate:
+            outcome = Outcome(0, profile.get("timeout_s", 30.0))
+        elif roll < timeout_rate + rate_limit_rate:
+            # Rejected up front: short latency, Retry-After tells the client when to come back
+            outcome = Outcome(429, sample_latency_ms(profile.get("reject_latency", {"ms": 5.0}), rng) / 1000,
+                              profile.get("retry_after_s", 1.0))
+        elif roll < timeout_rate + rate_limit_rate + error_rate:
+            status = rng.choice(profile.get("error_statuses", [500, 502, 503]))
+            outcome = Outcome(status, sample_latency_ms(profile.get("latency", {}), rng) / 1000)
+        else:
+            # 2. Success: base latency plus token-proportional generation time
+            latency_ms = (
+                sample_latency_ms(profile.get("latency", {}), rng) +
+                tokens * profile.get("ms_per_token", 0.0) +
+                prompt_tokens * profile.get("ms_per_prompt_token", 0.0)
+            )
+            outcome = Outcome(200, latency_ms / 1000)
+
+        self._record(endpoint, outcome)
+        return outcome
+
+    def _record(self, endpoint: str, outcome: Outcome):
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, {"calls": 0, "ok": 0, "timeouts": 0, "rate_limited": 0,
+                                                     "errors": 0})
+            stats["calls"] += 1
+            if outcome.status == 200:
+                stats["ok"] += 1
+                self.latency.setdefault(endpoint, LatencyHistogram()).observe(outcome.latency_s * 1000)
+            elif outcome.status == 0:
+                stats["timeouts"] += 1
+            elif outcome.status == 429:
+                stats["rate_limited"] += 1
+            else:
+                stats["errors"] += 1
+
+    def _raise(self, endpoint: str, outcome: Outcome):
+        if outcome.status == 0:
+            raise SimulatedTimeout(f"{endpoint} timed out after {outcome.latency_s:.1f}s (simulated)")
+        if outcome.status != 200:
+            # Retry-After is in wall-clock seconds, like the sleeps
+            retry_after = None if outcome.retry_after is None else outcome.retry_after * self.time_scale
+            raise SimulatedProviderError(endpoint, outcome.status, retry_after)
+
+    def call(self, endpoint: str, key: str = "", tokens: int = 0, prompt_tokens: int = 0) -> Outcome:
+        """Blocking attempt (for thread-pool callers such as BrightDataClient)"""
+        outcome = self.plan(endpoint, key, tokens, prompt_tokens)
+        if self.time_scale:
+            time.sleep(outcome.latency_s * self.time_scale)
+        self._raise(endpoint, outcome)
+        return outcome
+
+    async def acall(self, endpoint: str, key: str = "", tokens: int = 0, prompt_tokens: int = 0) -> Outcome:
+        outcome = self.plan(endpoint, key, tokens, prompt_tokens)
+        if self.time_scale:
+            await asyncio.sleep(outcome.latency_s * self.time_scale)
+        self._raise(endpoint, outcome)
+        return outcome
+
+    def report(self) -> Dict[str, Any]:
+        """Per-endpoint counts and simulated (unscaled) success latency percentiles"""
+        with self._lock:
+            return {
+                endpoint: {
+                    **stats,
+                    "latency_ms": self.latency[endpoint].summary() if endpoint in self.latency else {},
+                }
+                for endpoint, stats in sorted(self.stats.items())
+            }
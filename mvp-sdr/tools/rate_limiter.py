@@ -0,0 +1,59 @@
+"""
+TOOL: rate_limiter.py
+
+PURPOSE:
+Token-bucket rate limiting for paid provider calls (BrightData, LLM).
+
+API DEFINITION:
+- class TokenBucket:
+    - def __init__(self, rate: float, capacity: float = None)
+    - def acquire(self, tokens: float = 1.0)   # blocks until allowed
+    - async def acquire_async(self, tokens: float = 1.0)
+
+RESPONSIBILITIES:
+- Allow bursts up to `capacity`, then sustain `rate` tokens per second
+- Thread-safe; usable from threads and from asyncio tasks
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens if available; otherwise return the seconds to wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` are available."""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        """Wait (without blocking the event loop) until `tokens` are available."""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
@@ -0,0 +1,227 @@
+"""
+TOOL: rule_engine.py
+
+PURPOSE:
+Declarative rules (pain patterns, CSE conflicts) compiled once into a
+decision table and evaluated per lead or over a whole batch.
+
+RULE FORMAT:
+{
+    "name": "silent attrition",
+    "match": "all" | "any",
+    "conditions": [(field, op, value), ...],
+    ...any extra keys (description, penalty, severity) are kept on the rule
+}
+ops: "==", "!=", "in", "<", "<=", ">", ">=", "contains"
+("contains" is a case-insensitive substring test; value may be a list = any of)
+
+API DEFINITION:
+- class RuleSet:
+    - def __init__(self, rules: list)
+    - def match_one(self, record) -> list of matched rules (rule order)
+    - def match_batch(self, columns: {field: sequence}) -> np.ndarray (leads x rules, bool)
+- def columns_from_records(records, fields) -> {field: list}
+
+RESPONSIBILITIES:
+- Each distinct (field, op, value) condition becomes one predicate bit
+- Categorical fields are enum-encoded; a value's predicate bits are computed
+  once per distinct value, numeric fields are compared as arrays
+- Rules are evaluated once per distinct predicate bitmask (decision table),
+  so adding rules adds no per-lead branching
+"""
+
+import operator
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+NUMERIC_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+MATCH_MODES = ("all", "any")
+
+
+def _categorical_test(op: str, expected: Any, value: Any) -> bool:
+    if op == "==":
+        return value == expected
+    if op == "!=":
+        return value != expected
+    if op == "in":
+        return value in expected
+    if op == "contains":
+        text = str(value or "").lower()
+        needles = expected if isinstance(expected, (list, tuple)) else [expected]
+        return any(str(needle).lower() in text for needle in needles)
+    raise ValueError(f"Unknown rule operator '{op}'")
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def columns_from_records(records: Iterable[Any], fields: Iterable[str]) -> Dict[str, List[Any]]:
+    """Collect fields from dicts or objects (missing -> None) into columns"""
+    records = list(records)
+    columns = {}
+    for field in fields:
+        columns[field] = [
+            record.get(field) if isinstance(record, dict) else getattr(record, field, None)
+            for record in records
+        ]
+    return columns
+
+
+class RuleSet:
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = list(rules)
+        self.names = [rule["name"] for rule in self.rules]
+
+        # 1. Intern predicates: one bit per distinct (field, op, value)
+        self.predicates = []
+        predicate_index = {}
+        rule_predicates = []
+        for rule in self.rules:
+            if rule.get("match", "all") not in MATCH_MODES:
+                raise ValueError(f"Rule '{rule['name']}': match must be one of {MATCH_MODES}")
+            bits = []
+            for field, op, value in rule["conditions"]:
+                if op not in NUMERIC_OPS and op not in ("==", "!=", "in", "contains"):
+                    raise ValueError(f"Rule '{rule['name']}': unknown operator '{op}'")
+                key = (field, op, tuple(value) if isinstance(value, list) else value)
+                if key not in predicate_index:
+                    predicate_index[key] = len(self.predicates)
+                    self.predicates.append((field, op, value))
+                bits.append(predicate_index[key])
+            rule_predicates.append(bits)
+
+        # 2. Group predicates by field; a field is numeric if any op on it is numeric
+        self.fields = []
+        self._field_predicates = {}
+        for bit, (field, op, value) in enumerate(self.predicates):
+            if field not in self._field_predicates:
+                self.fields.append(field)
+                self._field_predicates[field] = []
+            self._field_predicates[field].append((bit, op, value))
+        self._numeric_fields = {
+            field for field, preds in self._field_predicates.items()
+            if any(op in NUMERIC_OPS for _, op, _ in preds)
+        }
+
+        # 3. Decision table inputs: required bits per rule
+        self._rule_masks = [sum(1 << bit for bit in bits) for bits in rule_predicates]
+        self._rule_any = [rule.get("match", "all") == "any" for rule in self.rules]
+        self._value_bits = {field: {} for field in self.fields}  # enum encoding per field
+        self._decisions = {}                                    # bitmask -> matched rule indices
+
+    # ===== PREDICATE BITS =====
+
+    def _bits_for_value(self, field: str, value: Any) -> int:
+        if field in self._numeric_fields:
+            number = _to_float(value)
+            bits = 0
+            for bit, op, expected in self._field_predicates[field]:
+                if op in NUMERIC_OPS:
+                    hit = not np.isnan(number) and NUMERIC_OPS[op](number, expected)
+                else:
+                    hit = _categorical_test(op, expected, value)
+                if hit:
+                    bits |= 1 << bit
+            return bits
+
+        cache = self._value_bits[field]
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable value
+            return self._categorical_bits(field, value)
+        bits = cache[value] = self._categorical_bits(field, value)
+        return bits
+
+    def _categorical_bits(self, field: str, value: Any) -> int:
+        bits = 0
+        for bit, op, expected in self._field_predicates[field]:
+            if _categorical_test(op, expected, value):
+                bits |= 1 << bit
+        return bits
+
+    def _decide(self, bits: int) -> tuple:
+        decision = self._decisions.get(bits)
+        if decision is None:
+            decision = tuple(
+                i for i, (mask, any_mode) in enumerate(zip(self._rule_masks, self._rule_any))
+                if (bits & mask if any_mode else (bits & mask) == mask)
+            )
+            self._decisions[bits] = decision
+        return decision
+
+    # ===== EVALUATION =====
+
+    def match_one(self, record: Any) -> List[Dict[str, Any]]:
+        """Rules matched by one record (dict or object), in rule order"""
+        get = record.get if isinstance(record, dict) else (lambda f: getattr(record, f, None))
+        bits = 0
+        for field in self.fields:
+            bits |= self._bits_for_value(field, get(field))
+        return [self.rules[i] for i in self._decide(bits)]
+
+    def match_batch(self, columns: Dict[str, Sequence[Any]]) -> np.ndarray:
+        """Boolean (leads x rules) matrix for column-oriented input"""
+        n = len(next(iter(columns.values()))) if columns else 0
+        words = max(1, (len(self.predicates) + 63) // 64)
+        bits = np.zeros((n, words), dtype=np.uint64)
+
+        for field in self.fields:
+            values = columns.get(field)
+            if values is None:
+                values = [None] * n
+            if field in self._numeric_fields:
+                self._numeric_column_bits(field, values, bits)
+            else:
+                self._categorical_column_bits(field, values, bits)
+
+        # Decision table: evaluate rules once per distinct bitmask
+        unique_rows, inverse = np.unique(bits, axis=0, return_inverse=True)
+        table = np.zeros((len(unique_rows), len(self.rules)), dtype=bool)
+        for row, words_row in enumerate(unique_rows):
+            mask = 0
+            for w, word in enumerate(words_row):
+                mask |= int(word) << (64 * w)
+            table[row, list(self._decide(mask))] = True
+        return table[inverse.reshape(-1)]
+
+    def _categorical_column_bits(self, field: str, values: Sequence[Any], bits: np.ndarray):
+        # Enum-encode the column, then look up each distinct value's bits once
+        codes = np.empty(len(values), dtype=np.int64)
+        index = {}
+        distinct = []
+        for i, value in enumerate(values):
+            try:
+                hash(value)
+            except TypeError:
+                value = repr(value)
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(distinct)
+                distinct.append(value)
+            codes[i] = code
+        lookup = np.zeros((len(distinct), bits.shape[1]), dtype=np.uint64)
+        for code, value in enumerate(distinct):
+            self._set_words(lookup[code], self._bits_for_value(field, value))
+        bits |= lookup[codes]
+
+    def _numeric_column_bits(self, field: str, values: Sequence[Any], bits: np.ndarray):
+        numbers = np.array([_to_float(v) for v in values], dtype=float)
+        for bit, op, expected in self._field_predicates[field]:
+            if op in NUMERIC_OPS:
+                with np.errstate(invalid="ignore"):
+                    hit = NUMERIC_OPS[op](numbers, expected) & ~np.isnan(numbers)
+            else:
+                hit = np.array([_categorical_test(op, expected, v) for v in values], dtype=bool)
+            bits[hit, bit // 64] |= np.uint64(1 << (bit % 64))
+
+    @staticmethod
+    def _set_words(row: np.ndarray, mask: int):
+        for w in range(row.shape[0]):
+            row[w] = np.uint64((mask >> (64 * w)) & 0xFFFFFFFFFFFFFFFF)
@@ -0,0 +1,151 @@
+"""
+TOOL: run_journal.py
+
+PURPOSE:
+Checkpoint/resume support for long pipeline runs.
+
+STORAGE:
+- SQLite (WAL mode), one row per (run_id, lead key, stage); the lead key is
+  the row index plus the row fingerprint, so identical input rows are
+  separate leads
+- Payloads are JSON
+
+RESPONSIBILITIES:
+- Derive a stable fingerprint for each lead row
+- Buffer completed stages and commit them in batches (by count or age);
+  a crash loses at most the last batch, which is simply recomputed
+- On resume, hand back recorded stage outputs so finished leads and
+  half-finished stages are skipped
+- Keep only the newest keep_runs finished runs (unfinished runs stay resumable)
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import RUN_JOURNAL_BATCH_SIZE, RUN_JOURNAL_FLUSH_INTERVAL, RUN_JOURNAL_KEEP_RUNS
+
+STAGES = ("brightdata", "enrichment", "pain", "angle", "email", "result")
+
+
+class RunJournal:
+    def __init__(self, db_path: str, run_id: Optional[str] = None, input_file: Optional[str] = None,
+                 batch_size: int = RUN_JOURNAL_BATCH_SIZE, flush_interval: float = RUN_JOURNAL_FLUSH_INTERVAL,
+                 keep_runs: int = RUN_JOURNAL_KEEP_RUNS):
+        """
+        Open (or create) a journal.
+        run_id=None starts a new run; an existing run_id resumes it.
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.keep_runs = max(0, keep_runs)
+        self._pending: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._last_flush = time.monotonic()
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+        if run_id is None:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.conn.execute(
+                "INSERT INTO runs (run_id, input_file, started_at, status) VALUES (?, ?, ?, ?)",
+                (self.run_id, input_file, time.time(), "running")
+            )
+            self.conn.commit()
+            self.resumed = False
+            self.prune()
+        else:
+            row = self.conn.execute("SELECT run_id FROM runs WHERE run_id=?", (run_id,)).fetchone()
+            if row is None:
+                self.conn.close()
+                raise ValueError(f"Unknown run_id: {run_id}")
+            self.run_id = run_id
+            self.conn.execute("UPDATE runs SET status='running' WHERE run_id=?", (run_id,))
+            self.conn.commit()
+            self.resumed = True
+
+    def _init_db(self):
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS runs
+                             (run_id TEXT PRIMARY KEY, input_file TEXT, started_at REAL, status TEXT)''')
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS stages
+                             (run_id TEXT, fingerprint TEXT, stage TEXT, payload TEXT, completed_at REAL,
+                              PRIMARY KEY (run_id, fingerprint, stage))''')
+        self.conn.commit()
+
+    @staticmethod
+    def lead_key(index: int, fingerprint: str) -> str:
+        """Journal key of the lead at input position `index`"""
+        return f"{index}:{fingerprint}"
+
+    @staticmethod
+    def fingerprint(lead: Dict[str, Any]) -> str:
+        """Stable hash of the raw lead row (column order independent)."""
+        data = json.dumps(lead, sort_keys=True)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get_stage(self, key: str, stage: str) -> Optional[Any]:
+        """Return the recorded payload for a stage, or None if it has not completed."""
+        pending = self._pending.get((key, stage))
+        if pending is not None:
+            return json.loads(pending[0])
+        row = self.conn.execute(
+            "SELECT payload FROM stages WHERE run_id=? AND fingerprint=? AND stage=?",
+            (self.run_id, key, stage)
+        ).fetchone()
+        if row:
+            return json.loads(row[0])
+        return None
+
+    def record_stage(self, key: str, stage: str, payload: Any):
+        """Buffer a completed stage (committed with the next batch)."""
+        self._pending[(key, stage)] = (json.dumps(payload), time.time())
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Commit the buffered stages in one transaction"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO stages (run_id, fingerprint, stage, payload, completed_at) VALUES (?, ?, ?, ?, ?)",
+            [(self.run_id, key, stage, payload, completed_at)
+             for (key, stage), (payload, completed_at) in self._pending.items()]
+        )
+        self.conn.commit()
+        self._pending = {}
+
+    def completed_count(self) -> int:
+        """Number of leads with a recorded final result."""
+        self.flush()
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM stages WHERE run_id=? AND stage='result'", (self.run_id,)
+        ).fetchone()
+        return row[0]
+
+    def mark_finished(self):
+        self.flush()
+        self.conn.execute("UPDATE runs SET status='finished' WHERE run_id=?", (self.run_id,))
+        self.conn.commit()
+        self.prune()
+
+    def prune(self) -> int:
+        """Drop finished runs beyond the newest keep_runs; returns the number of runs dropped"""
+        old = [row[0] for row in self.conn.execute(
+            "SELECT run_id FROM runs WHERE status='finished' ORDER BY started_at DESC LIMIT -1 OFFSET ?",
+            (self.keep_runs,)
+        )]
+        if old:
+            self.conn.executemany("DELETE FROM stages WHERE run_id=?", [(run_id,) for run_id in old])
+            self.conn.executemany("DELETE FROM runs WHERE run_id=?", [(run_id,) for run_id in old])
+            self.conn.commit()
+        return len(old)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
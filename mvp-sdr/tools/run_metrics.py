@@ -0,0 +1,235 @@
+"""
+TOOL: run_metrics.py
+
+PURPOSE:
+Per-run instrumentation for the pipeline: stage latency histograms,
+counters (fallbacks, cache lookups, LLM tokens) and gauges, exported to
+metrics.json and as a Prometheus text dump.
+
+API DEFINITION:
+- class LatencyHistogram:
+    - def observe(self, ms: float)
+    - def quantile(self, q: float) -> float (ms)
+    - def summary(self) -> {count, sum_ms, mean_ms, max_ms, p50_ms, p95_ms, p99_ms}
+- class RunMetrics:
+    - def observe(self, stage: str, ms: float)
+    - def timer(self, stage: str) -> context manager timing its block
+    - def increment(self, name: str, value=1, **labels)
+    - def set_gauge(self, name: str, value, **labels)
+    - def counter(self, name: str, **labels) -> total (labels given must match)
+    - def counters(self, name: str) -> {label value: total} for a one-label counter
+    - def record_cache(self, cache: str, before: dict, after: dict)
+    - def snapshot(self) -> dict (metrics.json schema below)
+    - def write_json(self, path=METRICS_STORE_PATH, extra=None)
+    - def to_prometheus(self, prefix="sdr") -> str
+    - def reset(self)
+
+METRICS.JSON SCHEMA:
+- stages: {stage: {count, sum_ms, mean_ms, max_ms, p50_ms, p95_ms, p99_ms}}
+- counters: {name: total} or {name: {"label=value,...": total}}
+- gauges: same shape as counters
+- caches: {cache: {lookups, hits, hit_ratio}}
+
+RESPONSIBILITIES:
+- Constant memory per stage: log-spaced buckets (~2.5% quantile error)
+  instead of raw samples
+- Safe to update from the event loop and worker threads
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import METRICS_STORE_PATH
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Bucket i covers [MIN_MS * GROWTH**i, MIN_MS * GROWTH**(i+1))
+MIN_MS = 0.001
+GROWTH = 1.05
+_LOG_GROWTH = math.log(GROWTH)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (milliseconds)"""
+
+    __slots__ = ("buckets", "count", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        index = int(math.log(ms / MIN_MS) / _LOG_GROWTH) if ms > MIN_MS else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, never above the observed max
+                return min(MIN_MS * GROWTH ** (index + 0.5), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        summary = {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}_ms"] = round(self.quantile(q), 3)
+        return summary
+
+
+def _label_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _prometheus_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages: Dict[str, LatencyHistogram] = {}
+            # name -> {label key: value}
+            self._counters: Dict[str, Dict[tuple, float]] = {}
+            self._gauges: Dict[str, Dict[tuple, float]] = {}
+            self.caches: Dict[str, Dict[str, Any]] = {}
+
+    # ===== RECORDING =====
+
+    def observe(self, stage: str, ms: float):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.observe(ms)
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, (time.perf_counter() - start) * 1000)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def record_cache(self, cache: str, before: Dict[str, Any], after: Dict[str, Any]):
+        """Cache activity during the run, from two TieredCache.stats() readings"""
+        def totals(stats):
+            hits = stats.get("memory_hits", 0) + stats.get("disk_hits", 0)
+            return hits, hits + stats.get("misses", 0)
+
+        hits_before, lookups_before = totals(before)
+        hits_after, lookups_after = totals(after)
+        hits, lookups = hits_after - hits_before, lookups_after - lookups_before
+        with self._lock:
+            self.caches[cache] = {
+                "lookups": lookups,
+                "hits": hits,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    # ===== READING =====
+
+    def counter(self, name: str, **labels) -> float:
+        """Total of every series of `name` whose labels include the given ones"""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(value for key, value in self._counters.get(name, {}).items() if wanted <= set(key))
+
+    def counters(self, name: str) -> Dict[str, float]:
+        """{label value: total} for a counter with one label"""
+        with self._lock:
+            return {key[0][1]: value for key, value in self._counters.get(name, {}).items() if len(key) == 1}
+
+    def snapshot(self) -> Dict[str, Any]:
+        def series(metrics):
+            exported = {}
+            for name, values in metrics.items():
+                if list(values) == [()]:
+                    exported[name] = values[()]
+                else:
+                    exported[name] = {",".join(f"{k}={v}" for k, v in key): value for key, value in values.items()}
+            return exported
+
+        with self._lock:
+            return {
+                "stages": {stage: histogram.summary() for stage, histogram in self.stages.items()},
+                "counters": series(self._counters),
+                "gauges": series(self._gauges),
+                "caches": {cache: dict(stats) for cache, stats in self.caches.items()},
+            }
+
+    # ===== EXPORT =====
+
+    def write_json(self, path: str = METRICS_STORE_PATH, extra: Optional[Dict[str, Any]] = None):
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+
+    def to_prometheus(self, prefix: str = "sdr") -> str:
+        """Prometheus text exposition format (latencies in seconds)"""
+        lines = []
+        with self._lock:
+            name = f"{prefix}_stage_latency_seconds"
+            lines += [f"# HELP {name} Per-lead pipeline stage latency", f"# TYPE {name} summary"]
+            for stage, histogram in sorted(self.stages.items()):
+                for q in QUANTILES:
+                    lines.append(f"{name}{_prometheus_labels([('stage', stage), ('quantile', q)])} "
+                                 f"{histogram.quantile(q) / 1000:.6g}")
+                lines.append(f"{name}_sum{_prometheus_labels([('stage', stage)])} {histogram.sum_ms / 1000:.6g}")
+                lines.append(f"{name}_count{_prometheus_labels([('stage', stage)])} {histogram.count}")
+
+            for counter, values in sorted(self._counters.items()):
+                name = f"{prefix}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                lines += [f"{name}{_prometheus_labels(key)} {value:g}" for key, value in sorted(values.items())]
+
+            for gauge, values in sorted(self._gauges.items()):
+                name = f"{prefix}_{gauge}"
+                lines.append(f"# TYPE {name} gauge")
+                lines += [f"{name}{_prometheus_labels(key)} {value:g}" for key, value in sorted(values.items())]
+
+            if self.caches:
+                for field, kind in (("lookups", "counter"), ("hits", "counter"), ("hit_ratio", "gauge")):
+                    name = f"{prefix}_cache_{field}" + ("_total" if kind == "counter" else "")
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines += [f"{name}{_prometheus_labels([('cache', cache)])} {stats[field]:g}"
+                              for cache, stats in sorted(self.caches.items())]
+        return "\n".join(lines) + "\n"
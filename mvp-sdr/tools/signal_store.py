@@ -0,0 +1,179 @@
+"""
+TOOL: signal_store.py
+
+PURPOSE:
+Persistent, typed record of what the CSE scored for every lead of every run,
+so scoring config changes can be replayed without calling the agents again.
+
+STORAGE:
+- SQLite (WAL mode), one row per scored lead with typed columns:
+  raw agent fields (RAW_FIELDS, before fallbacks), normalized signals
+  (NULL where absent), the score/tier given at the time and the
+  SCORING_VERSION / CONFIG_VERSION / weight profile that produced it
+- rescores: one row per (lead, weight profile, scoring version, config version)
+
+RESPONSIBILITIES:
+- Buffer rows from the pipeline and insert them in batches
+- Stream stored leads back in id order as column arrays (constant memory)
+- Record rescoring results next to the original ones
+"""
+
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from cse.batch_scorer import SIGNAL_COLUMNS, RAW_FIELDS, SignalMatrix, raw_arrays, apply_fallbacks
+from cse.config import SCORING_VERSION, CONFIG_VERSION, ACTIVE_WEIGHT_PROFILE
+
+LEAD_COLUMNS = ("run_id", "fingerprint", "lead_name", "lead_company", "lead_title")
+RAW_TYPES = ("INTEGER", "INTEGER", "INTEGER", "REAL", "INTEGER", "INTEGER", "TEXT", "TEXT", "INTEGER", "REAL")
+SIGNAL_FIELDS = tuple(f"sig_{name}" for name in SIGNAL_COLUMNS)
+RESULT_COLUMNS = ("fallback_penalty", "lead_score", "priority_tier", "weight_profile",
+                  "scoring_version", "config_version", "created_at")
+INSERT_COLUMNS = LEAD_COLUMNS + RAW_FIELDS + SIGNAL_FIELDS + RESULT_COLUMNS
+
+
+class SignalStore:
+    def __init__(self, db_path: str, run_id: Optional[str] = None, weight_profile: Optional[str] = None,
+                 batch_size: int = 500):
+        """
+        Open (or create) a store. Rows added through this instance are
+        tagged with run_id (a new one when None).
+        """
+        self.db_path = db_path
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.weight_profile = weight_profile or ACTIVE_WEIGHT_PROFILE
+        self.batch_size = max(1, batch_size)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+        self._pending: List[Tuple[Tuple, Tuple, Dict[str, Any]]] = []
+        self.added = 0
+
+    def _init_db(self):
+        raw = ", ".join(f"{name} {kind}" for name, kind in zip(RAW_FIELDS, RAW_TYPES))
+        signals = ", ".join(f"{name} REAL" for name in SIGNAL_FIELDS)
+        self.conn.execute(f'''CREATE TABLE IF NOT EXISTS leads
+                              (id INTEGER PRIMARY KEY, run_id TEXT, fingerprint TEXT,
+                               lead_name TEXT, lead_company TEXT, lead_title TEXT,
+                               {raw}, {signals},
+                               fallback_penalty REAL, lead_score REAL, priority_tier TEXT, weight_profile TEXT,
+                               scoring_version TEXT, config_version TEXT, created_at REAL)''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_run ON leads (run_id)")
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS rescores
+                             (lead_id INTEGER, weight_profile TEXT, scoring_version TEXT, config_version TEXT,
+                              lead_score REAL, priority_tier TEXT, rescored_at REAL,
+                              PRIMARY KEY (lead_id, weight_profile, scoring_version, config_version))''')
+        self.conn.commit()
+
+    # ===== WRITE (pipeline) =====
+
+    def add(self, lead: Dict[str, str], fields: Tuple, cse_result: Any, fingerprint: Optional[str] = None):
+        """
+        Buffer one scored lead.
+        fields: raw_fields() of the RawContext taken before the CSE applied
+        fallbacks; cse_result: the CSEResult it produced.
+        """
+        identity = (self.run_id, fingerprint, lead.get("name", ""), lead.get("company", ""), lead.get("title", ""))
+        result = {"lead_score": cse_result["lead_score"], "priority_tier": cse_result["priority_tier"]}
+        self._pending.append((identity, fields, result))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Normalize the buffered leads in one vectorized pass and insert them"""
+        if not self._pending:
+            return
+        raw = raw_arrays([fields for _, fields, _ in self._pending])
+        fallback_penalty = apply_fallbacks(raw).tolist()
+        signals = SignalMatrix.from_raw(raw)
+        values = np.where(signals.present, signals.values, np.nan).tolist()
+
+        now = time.time()
+        rows = []
+        for i, (identity, fields, result) in enumerate(self._pending):
+            rows.append(
+                identity + tuple(_sql_value(v) for v in fields) +
+                tuple(None if v != v else v for v in values[i]) +  # NaN -> NULL
+                (fallback_penalty[i], result["lead_score"], result["priority_tier"], self.weight_profile,
+                 SCORING_VERSION, CONFIG_VERSION, now)
+            )
+        placeholders = ", ".join("?" * len(INSERT_COLUMNS))
+        self.conn.executemany(
+            f"INSERT INTO leads ({', '.join(INSERT_COLUMNS)}) VALUES ({placeholders})", rows
+        )
+        self.conn.commit()
+        self.added += len(rows)
+        self._pending = []
+
+    # ===== READ (rescoring) =====
+
+    def count(self, run_id: Optional[str] = None) -> int:
+        if run_id:
+            return self.conn.execute("SELECT COUNT(*) FROM leads WHERE run_id=?", (run_id,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Stored runs with their lead counts and the versions that scored them"""
+        rows = self.conn.execute(
+            '''SELECT run_id, COUNT(*), MIN(created_at), weight_profile, scoring_version, config_version
+               FROM leads GROUP BY run_id, weight_profile, scoring_version, config_version
+               ORDER BY MIN(created_at)'''
+        ).fetchall()
+        keys = ("run_id", "leads", "created_at", "weight_profile", "scoring_version", "config_version")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def iter_batches(self, run_id: Optional[str] = None,
+                     batch_size: int = 50000) -> Iterator[Dict[str, Any]]:
+        """
+        Stored leads in id order, batch_size at a time (keyset pagination, so
+        memory stays flat for any store size). Each batch is a dict with
+        "ids", "lead_score", "priority_tier" and "raw" (raw_arrays columns,
+        fallbacks not yet applied).
+        """
+        columns = ("id", "lead_score", "priority_tier") + RAW_FIELDS
+        query = f"SELECT {', '.join(columns)} FROM leads WHERE id > ?"
+        params: Tuple = ()
+        if run_id:
+            query += " AND run_id = ?"
+            params = (run_id,)
+        query += " ORDER BY id LIMIT ?"
+
+        last_id = 0
+        while True:
+            rows = self.conn.execute(query, (last_id,) + params + (batch_size,)).fetchall()
+            if not rows:
+                return
+            ids, scores, tiers = zip(*(row[:3] for row in rows))
+            last_id = ids[-1]
+            yield {
+                "ids": np.array(ids, dtype=np.int64),
+                "lead_score": np.array(scores, dtype=float),
+                "priority_tier": np.array(tiers, dtype=str),
+                "raw": raw_arrays([row[3:] for row in rows]),
+            }
+
+    def save_rescores(self, ids: np.ndarray, weight_profile: str, final_score: np.ndarray, tier: np.ndarray):
+        """Record one profile's rescoring of a batch under the current versions"""
+        now = time.time()
+        self.conn.executemany(
+            '''INSERT OR REPLACE INTO rescores
+               (lead_id, weight_profile, scoring_version, config_version, lead_score, priority_tier, rescored_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            [(lead_id, weight_profile, SCORING_VERSION, CONFIG_VERSION, score, lead_tier, now)
+             for lead_id, score, lead_tier in zip(ids.tolist(), final_score.tolist(), tier.tolist())]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def _sql_value(value):
+    # SQLite has no bool type; flags are stored as 0/1 INTEGER
+    return int(value) if isinstance(value, bool) else value
@@ -0,0 +1,66 @@
+"""
+TOOL: single_flight.py
+
+PURPOSE:
+Request coalescing for duplicate in-flight lookups.
+
+API DEFINITION:
+- class SingleFlight:
+    - def do(self, key: str, fn: callable) -> result of fn()
+    - def stats(self) -> {"executed": int, "coalesced": int}
+
+RESPONSIBILITIES:
+- Concurrent callers with the same key wait on ONE execution of fn
+- Every waiter receives the leader's result (or its exception)
+- Nothing is remembered after the call completes (caching is the caller's job)
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "coalesced": self.coalesced}
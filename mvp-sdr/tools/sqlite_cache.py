@@ -0,0 +1,255 @@
+"""
+TOOL: sqlite_cache.py
+
+PURPOSE:
+Reusable on-disk key/value cache backed by SQLite.
+
+API DEFINITION:
+- class SQLiteCache:
+    - def get(self, key) -> value | None
+    - def get_many(self, keys) -> {key: value} (hits only)
+    - def get_many_with_expiry(self, keys) -> {key: (value, expires_at)} (hits only)
+    - def put(self, key, value, ttl=None, columns=None)
+    - def put_many(self, items: dict, ttl=None, columns=None)
+      (columns: values for extra_columns, {column: value} per entry)
+    - def flush(self)
+    - def close(self)
+
+RESPONSIBILITIES:
+- One persistent connection per thread (thread-local pool), WAL mode
+- Buffer writes and upsert them in batches (one transaction per batch)
+- Per-entry TTL (expired entries read as misses)
+- Size-bounded eviction (oldest entries dropped past max_entries), driven by
+  a running row count and indexed deletes, so flushes do no table scans
+- Work on existing cache tables: missing columns are added in place
+- Optional extra columns written with each entry (e.g. model / timestamp of
+  the LLM cache table)
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# The running row count is re-read from the table every this many flushes
+# (other processes may write to the same file)
+RECOUNT_EVERY_FLUSHES = 100
+
+# Caches with open connections; flushed and closed once at interpreter exit
+# (weak: a dropped cache does not live until exit)
+_OPEN_CACHES = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_caches():
+    for cache in list(_OPEN_CACHES):
+        cache.close()
+
+
+class SQLiteCache:
+    def __init__(self, db_path: str, table: str = "cache", key_column: str = "key",
+                 value_column: str = "response", default_ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, batch_size: int = 100,
+                 encode: Callable[[Any], str] = json.dumps,
+                 decode: Callable[[str], Any] = json.loads,
+                 extra_columns: Optional[Dict[str, str]] = None):
+        self.db_path = db_path
+        self.table = table
+        self.key_column = key_column
+        self.value_column = value_column
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.batch_size = max(1, batch_size)
+        self.encode = encode
+        self.decode = decode
+        # {column: SQL type} stored alongside the value (NULL when not given)
+        self.extra_columns = dict(extra_columns or {})
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        # key -> (encoded value, created_at, expires_at, *extra column values); visible to reads before flush
+        self._pending: Dict[str, tuple] = {}
+        # Batch being written by flush(); still readable until its commit lands
+        self._flushing: Dict[str, tuple] = {}
+        self._flush_lock = threading.Lock()
+        # Rows in the table (tracked only when size-bounded)
+        self._row_count: Optional[int] = None
+        self._flushes = 0
+
+        self._init_db()
+
+    # ===== CONNECTIONS =====
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+            _OPEN_CACHES.add(self)
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} "
+                     f"({self.key_column} TEXT PRIMARY KEY, {self.value_column} TEXT)")
+
+        # Upgrade older cache tables in place (keeps existing entries)
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+        for column, sql_type in {"created_at": "REAL", "expires_at": "REAL", **self.extra_columns}.items():
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {column} {sql_type}")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_created_at ON {self.table} (created_at)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_expires_at ON {self.table} (expires_at)")
+        conn.commit()
+        if self.max_entries is not None:
+            self._row_count = self._count(conn)
+
+    def _count(self, conn: sqlite3.Connection) -> int:
+        return conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _existing(self, conn: sqlite3.Connection, keys: list) -> int:
+        """How many of keys are already stored (primary key lookups)"""
+        existing = 0
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            existing += conn.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {self.key_column} IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchone()[0]
+        return existing
+
+    # ===== READS =====
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on miss / expiry."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return {key: value} for every key that is cached and not expired."""
+        return {key: value for key, (value, _) in self.get_many_with_expiry(keys).items()}
+
+    def get_many_with_expiry(self, keys: Iterable[str]) -> Dict[str, tuple]:
+        """Like get_many, with each entry's expires_at (None = never)"""
+        now = time.time()
+        found = {}
+        missing = []
+
+        with self._lock:
+            for key in keys:
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._flushing.get(key)
+                if pending is not None:
+                    if pending[2] is None or pending[2] > now:
+                        found[key] = (self.decode(pending[0]), pending[2])
+                else:
+                    missing.append(key)
+
+        # SQLite caps bound parameters per statement; query in chunks
+        conn = self._conn()
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT {self.key_column}, {self.value_column}, expires_at FROM {self.table} "
+                f"WHERE {self.key_column} IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now)
+            ).fetchall()
+            for key, value, expires_at in rows:
+                found[key] = (self.decode(value), expires_at)
+
+        return found
+
+    # ===== WRITES =====
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, columns: Optional[Dict[str, Any]] = None):
+        """Buffer one entry; written with the next batch."""
+        self.put_many({key: value}, ttl, {key: columns} if columns else None)
+
+    def put_many(self, items: Dict[str, Any], ttl: Optional[float] = None,
+                 columns: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Buffer many entries; flushed once the batch size is reached."""
+        now = time.time()
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = now + ttl if ttl is not None else None
+        columns = columns or {}
+
+        with self._lock:
+            for key, value in items.items():
+                extra = columns.get(key) or {}
+                self._pending[key] = (self.encode(value), now, expires_at,
+                                      *(extra.get(column) for column in self.extra_columns))
+            should_flush = len(self._pending) >= self.batch_size
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Upsert all buffered entries in one transaction, then evict if over size."""
+        # One flush at a time: a batch stays readable in _flushing until it is committed
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._flushing, self._pending = self._pending, {}
+                batch = [(key, *entry) for key, entry in self._flushing.items()]
+
+            conn = self._conn()
+            try:
+                with conn:
+                    # Replaced keys do not grow the table
+                    added = len(batch) - self._existing(conn, list(self._flushing)) if self.max_entries is not None else 0
+                    names = ", ".join([self.key_column, self.value_column, "created_at", "expires_at",
+                                       *self.extra_columns])
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self.table} ({names}) "
+                        f"VALUES ({', '.join('?' * (4 + len(self.extra_columns)))})",
+                        batch
+                    )
+            except Exception:
+                # Not written: put the batch back (newer writes win) for the next flush
+                with self._lock:
+                    self._pending = {**self._flushing, **self._pending}
+                    self._flushing = {}
+                raise
+            with self._lock:
+                self._flushing = {}
+            self._evict(conn, added)
+
+    def _evict(self, conn: sqlite3.Connection, added: int = 0):
+        with conn:
+            # Index range scan on expires_at
+            expired = conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)).rowcount
+            if self.max_entries is None:
+                return
+            self._flushes += 1
+            if self._row_count is None or self._flushes % RECOUNT_EVERY_FLUSHES == 0:
+                self._row_count = self._count(conn)
+            else:
+                self._row_count += added - expired
+            overflow = self._row_count - self.max_entries
+            if overflow > 0:
+                # Oldest first via the created_at index; legacy rows (NULL created_at) sort first
+                self._row_count -= conn.execute(
+                    f"DELETE FROM {self.table} WHERE {self.key_column} IN "
+                    f"(SELECT {self.key_column} FROM {self.table} ORDER BY created_at LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+
+    def close(self):
+        """Flush pending writes and close every pooled connection."""
+        self.flush()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+        _OPEN_CACHES.discard(self)
@@ -0,0 +1,211 @@
+"""
+TOOL: tiered_cache.py
+
+PURPOSE:
+Two-tier cache: bounded in-process LRU in front of an on-disk SQLiteCache.
+Shared by BrightDataClient and LLMClient.
+
+API DEFINITION (same as SQLiteCache):
+- class TieredCache:
+    - def get(self, key) -> value | None
+    - def get_many(self, keys) -> {key: value} (hits only)
+    - def put(self, key, value, ttl=None, columns=None)
+    - def put_many(self, items: dict, ttl=None, columns=None)
+    - def flush(self)
+    - def close(self)
+    - def stats(self) -> dict of hit/miss counters
+    - def pending_writes(self) -> keys awaiting write-back
+- def get_shared_cache(name, factory) -> TieredCache (one per name per process)
+
+RESPONSIBILITIES:
+- Serve repeated keys (many leads share a company) from memory
+- Promote disk hits into the LRU (keeping their expiry)
+- Honour TTLs in both tiers (expired memory entries read as misses)
+- Write back to disk asynchronously on a background thread; pending writes
+  are coalesced per key and bounded (writers block while the disk catches up)
+"""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from tools.sqlite_cache import SQLiteCache
+from config.settings import CACHE_WRITE_BACK_MAX_PENDING
+
+
+class LRUCache:
+    """Thread-safe bounded LRU with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = max(1, capacity)
+        self._data = OrderedDict()  # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._data[key]  # Expired
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any, expires_at: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache:
+    def __init__(self, disk: SQLiteCache, memory_capacity: int = 10000,
+                 max_pending_writes: int = CACHE_WRITE_BACK_MAX_PENDING):
+        self.disk = disk
+        self.memory = LRUCache(memory_capacity)
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._stats_lock = threading.Lock()
+
+        # Async write-back to the disk tier: key -> (value, ttl), latest write wins
+        self.max_pending_writes = max(1, max_pending_writes)
+        self._pending: Dict[str, tuple] = {}
+        self._writing = False
+        self._changed = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_back, daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # ===== READS =====
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            from_disk = self.disk.get_many_with_expiry(missing)
+            for key, (value, expires_at) in from_disk.items():
+                self.memory.put(key, value, expires_at)
+                found[key] = value
+            with self._stats_lock:
+                self.disk_hits += len(from_disk)
+                self.disk_misses += len(missing) - len(from_disk)
+
+        return found
+
+    # ===== WRITES =====
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, columns: Optional[Dict[str, Any]] = None):
+        self.put_many({key: value}, ttl, {key: columns} if columns else None)
+
+    def put_many(self, items: Dict[str, Any], ttl: Optional[float] = None,
+                 columns: Optional[Dict[str, Dict[str, Any]]] = None):
+        """columns: extra disk-tier column values per key (see SQLiteCache.extra_columns)"""
+        columns = columns or {}
+        ttl = ttl if ttl is not None else self.disk.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        for key, value in items.items():
+            self.memory.put(key, value, expires_at)
+
+        with self._changed:
+            # Backpressure: a slow disk stalls writers instead of growing the backlog
+            while len(self._pending) >= self.max_pending_writes and not self._closed:
+                self._changed.wait()
+            for key, value in items.items():
+                self._pending[key] = (value, ttl, columns.get(key))
+            self._changed.notify_all()
+
+    def _write_back(self):
+        while True:
+            with self._changed:
+                while not self._pending and not self._closed:
+                    self._changed.wait()
+                if not self._pending:
+                    return  # Closed and drained
+                batch, self._pending = self._pending, {}
+                self._writing = True
+                self._changed.notify_all()
+            try:
+                by_ttl: Dict[Optional[float], tuple] = {}
+                for key, (value, ttl, extra) in batch.items():
+                    items, columns = by_ttl.setdefault(ttl, ({}, {}))
+                    items[key] = value
+                    if extra:
+                        columns[key] = extra
+                for ttl, (items, columns) in by_ttl.items():
+                    self.disk.put_many(items, ttl, columns)
+            finally:
+                with self._changed:
+                    self._writing = False
+                    self._changed.notify_all()
+
+    def pending_writes(self) -> int:
+        with self._changed:
+            return len(self._pending)
+
+    def flush(self):
+        """Wait for pending write-backs, then flush the disk tier."""
+        with self._changed:
+            while self._pending or self._writing:
+                self._changed.wait()
+        self.disk.flush()
+
+    def close(self):
+        with self._changed:
+            if self._closed:
+                return
+            self._closed = True
+            self._changed.notify_all()
+        self._writer.join()
+        self.disk.close()
+
+    # ===== METRICS =====
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory.hits + self.memory.misses
+        hits = self.memory.hits + self.disk_hits
+        return {
+            "memory_hits": self.memory.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.disk_misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_size": len(self.memory),
+        }
+
+
+# ===== PROCESS-WIDE INSTANCES =====
+# Clients that are constructed often (e.g. one LLMClient per adapter) share one
+# cache per backing file instead of each starting its own writer thread.
+
+_shared_caches: Dict[str, TieredCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache(name: str, factory: Callable[[], TieredCache]) -> TieredCache:
+    """Return the process-wide cache registered under `name`, building it on first use."""
+    with _shared_lock:
+        cache = _shared_caches.get(name)
+        if cache is None or cache._closed:
+            cache = factory()
+            _shared_caches[name] = cache
+        return cache